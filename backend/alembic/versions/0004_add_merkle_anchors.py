@@ -0,0 +1,43 @@
+"""add merkle anchors
+
+Revision ID: 0004_add_merkle_anchors
+Revises: 0003_add_docs_extractions
+Create Date: 2025-02-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_add_merkle_anchors"
+down_revision = "0003_add_docs_extractions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "merkle_anchors",
+        sa.Column("root", sa.String(length=66), nullable=False),
+        sa.Column("leaf_count", sa.Integer(), nullable=False),
+        sa.Column("chain", sa.String(length=64), nullable=False),
+        sa.Column("tx_hash", sa.String(length=66), nullable=False),
+        sa.Column("block_number", sa.Integer(), nullable=True),
+        sa.Column("publisher_address", sa.String(length=42), nullable=True),
+        sa.Column("anchored_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("root"),
+    )
+
+    with op.batch_alter_table("batches") as batch_op:
+        batch_op.add_column(sa.Column("anchor_root", sa.String(length=66), nullable=True))
+        batch_op.add_column(sa.Column("merkle_proof", sa.JSON(), nullable=True))
+        batch_op.create_index("ix_batches_anchor_root", ["anchor_root"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("batches") as batch_op:
+        batch_op.drop_index("ix_batches_anchor_root")
+        batch_op.drop_column("merkle_proof")
+        batch_op.drop_column("anchor_root")
+
+    op.drop_table("merkle_anchors")
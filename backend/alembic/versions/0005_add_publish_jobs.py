@@ -0,0 +1,45 @@
+"""add publish jobs
+
+Revision ID: 0005_add_publish_jobs
+Revises: 0004_add_merkle_anchors
+Create Date: 2025-02-08 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_add_publish_jobs"
+down_revision = "0004_add_merkle_anchors"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "publish_jobs",
+        sa.Column("job_id", sa.String(length=36), nullable=False),
+        sa.Column("batch_id", sa.String(length=64), nullable=False),
+        sa.Column("tx_hash", sa.String(length=66), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("SUBMITTED", "MINED", "CONFIRMED", "FAILED", name="publishjobstatus"),
+            nullable=False,
+            server_default="SUBMITTED",
+        ),
+        sa.Column("block_number", sa.Integer(), nullable=True),
+        sa.Column("confirmations", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+    op.create_index("ix_publish_jobs_batch_id", "publish_jobs", ["batch_id"], unique=False)
+    op.create_index("ix_publish_jobs_status", "publish_jobs", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_publish_jobs_status", table_name="publish_jobs")
+    op.drop_index("ix_publish_jobs_batch_id", table_name="publish_jobs")
+    op.drop_table("publish_jobs")
+    op.execute("DROP TYPE IF EXISTS publishjobstatus")
@@ -0,0 +1,64 @@
+"""add published event index
+
+Revision ID: 0006_add_published_events
+Revises: 0005_add_publish_jobs
+Create Date: 2025-02-15 00:00:00.000000
+
+"""
+from alembic import op
+from eth_hash.auto import keccak
+import sqlalchemy as sa
+
+
+revision = "0006_add_published_events"
+down_revision = "0005_add_publish_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("batches") as batch_op:
+        batch_op.add_column(sa.Column("batch_id_hash", sa.String(length=66), nullable=True))
+        batch_op.create_index("ix_batches_batch_id_hash", ["batch_id_hash"], unique=False)
+
+    connection = op.get_bind()
+    batches = sa.table("batches", sa.column("batch_id", sa.String), sa.column("batch_id_hash", sa.String))
+    for (batch_id,) in connection.execute(sa.select(batches.c.batch_id)).fetchall():
+        connection.execute(
+            batches.update()
+            .where(batches.c.batch_id == batch_id)
+            .values(batch_id_hash="0x" + keccak(batch_id.encode("utf-8")).hex())
+        )
+
+    op.create_table(
+        "published_events",
+        sa.Column("batch_id_hash", sa.String(length=66), nullable=False),
+        sa.Column("attestation_hash", sa.String(length=66), nullable=False),
+        sa.Column("publisher", sa.String(length=42), nullable=False),
+        sa.Column("published_at", sa.DateTime(), nullable=False),
+        sa.Column("block_number", sa.Integer(), nullable=False),
+        sa.Column("block_hash", sa.String(length=66), nullable=False),
+        sa.Column("tx_hash", sa.String(length=66), nullable=False),
+        sa.Column("log_index", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("batch_id_hash"),
+    )
+    op.create_index("ix_published_events_block_number", "published_events", ["block_number"], unique=False)
+
+    op.create_table(
+        "indexer_checkpoints",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("block_number", sa.Integer(), nullable=False),
+        sa.Column("block_hash", sa.String(length=66), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("indexer_checkpoints")
+    op.drop_index("ix_published_events_block_number", table_name="published_events")
+    op.drop_table("published_events")
+
+    with op.batch_alter_table("batches") as batch_op:
+        batch_op.drop_index("ix_batches_batch_id_hash")
+        batch_op.drop_column("batch_id_hash")
@@ -0,0 +1,30 @@
+"""move document content to the blob store
+
+Revision ID: 0007_add_document_blob_store
+Revises: 0006_add_published_events
+Create Date: 2025-02-22 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_add_document_blob_store"
+down_revision = "0006_add_published_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing inline content is left in place and still served; new uploads only store the fingerprint.
+    with op.batch_alter_table("documents") as batch_op:
+        batch_op.alter_column("data", existing_type=sa.LargeBinary(), nullable=True)
+        batch_op.add_column(sa.Column("size_bytes", sa.BigInteger(), nullable=True))
+        batch_op.create_index("ix_documents_fingerprint", ["fingerprint"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("documents") as batch_op:
+        batch_op.drop_index("ix_documents_fingerprint")
+        batch_op.drop_column("size_bytes")
+        batch_op.alter_column("data", existing_type=sa.LargeBinary(), nullable=False)
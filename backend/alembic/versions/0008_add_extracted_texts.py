@@ -0,0 +1,31 @@
+"""add extracted text cache
+
+Revision ID: 0008_add_extracted_texts
+Revises: 0007_add_document_blob_store
+Create Date: 2025-03-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_add_extracted_texts"
+down_revision = "0007_add_document_blob_store"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "extracted_texts",
+        sa.Column("fingerprint", sa.String(length=66), nullable=False),
+        sa.Column("parser_version", sa.String(length=32), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("char_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("fingerprint", "parser_version"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("extracted_texts")
@@ -0,0 +1,40 @@
+"""add llm result cache
+
+Revision ID: 0009_add_llm_results
+Revises: 0008_add_extracted_texts
+Create Date: 2025-03-08 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_add_llm_results"
+down_revision = "0008_add_extracted_texts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_results",
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("fingerprint", sa.String(length=66), nullable=False),
+        sa.Column("provider", sa.String(length=32), nullable=False),
+        sa.Column("model", sa.String(length=128), nullable=False),
+        sa.Column("prompt_hash", sa.String(length=64), nullable=False),
+        sa.Column("schema_hash", sa.String(length=64), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("cache_key"),
+    )
+    op.create_index("ix_llm_results_fingerprint", "llm_results", ["fingerprint"], unique=False)
+    op.create_index("ix_llm_results_last_used_at", "llm_results", ["last_used_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_results_last_used_at", table_name="llm_results")
+    op.drop_index("ix_llm_results_fingerprint", table_name="llm_results")
+    op.drop_table("llm_results")
@@ -0,0 +1,68 @@
+"""add extract job queue
+
+Revision ID: 0010_add_extract_jobs
+Revises: 0009_add_llm_results
+Create Date: 2025-03-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_add_extract_jobs"
+down_revision = "0009_add_llm_results"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "extract_jobs",
+        sa.Column("job_id", sa.String(length=36), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("QUEUED", "RUNNING", "COMPLETED", name="extractjobstatus"),
+            nullable=False,
+            server_default="QUEUED",
+        ),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("force_refresh", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+    op.create_index("ix_extract_jobs_status", "extract_jobs", ["status"], unique=False)
+
+    op.create_table(
+        "extract_job_items",
+        sa.Column("item_id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("job_id", sa.String(length=36), nullable=False),
+        sa.Column("batch_id", sa.String(length=64), nullable=False),
+        sa.Column("manufacturer", sa.String(length=255), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="extractjobitemstatus"),
+            nullable=False,
+            server_default="QUEUED",
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("item_id"),
+    )
+    op.create_index("ix_extract_job_items_job_id", "extract_job_items", ["job_id"], unique=False)
+    op.create_index("ix_extract_job_items_manufacturer", "extract_job_items", ["manufacturer"], unique=False)
+    op.create_index("ix_extract_job_items_status", "extract_job_items", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_extract_job_items_status", table_name="extract_job_items")
+    op.drop_index("ix_extract_job_items_manufacturer", table_name="extract_job_items")
+    op.drop_index("ix_extract_job_items_job_id", table_name="extract_job_items")
+    op.drop_table("extract_job_items")
+    op.drop_index("ix_extract_jobs_status", table_name="extract_jobs")
+    op.drop_table("extract_jobs")
+    op.execute("DROP TYPE IF EXISTS extractjobitemstatus")
+    op.execute("DROP TYPE IF EXISTS extractjobstatus")
@@ -0,0 +1,30 @@
+"""persist canonical attestation on extractions
+
+Revision ID: 0011_add_extraction_attestation
+Revises: 0010_add_extract_jobs
+Create Date: 2025-03-22 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_add_extraction_attestation"
+down_revision = "0010_add_extract_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows are backfilled lazily the first time they are read.
+    with op.batch_alter_table("extractions") as batch_op:
+        batch_op.add_column(sa.Column("canonical_json", sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column("attestation_hash", sa.String(length=66), nullable=True))
+        batch_op.add_column(sa.Column("schema_version", sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("extractions") as batch_op:
+        batch_op.drop_column("schema_version")
+        batch_op.drop_column("attestation_hash")
+        batch_op.drop_column("canonical_json")
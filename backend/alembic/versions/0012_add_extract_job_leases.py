@@ -0,0 +1,37 @@
+"""add leases and claim indexes to extract job items
+
+Revision ID: 0012_add_extract_job_leases
+Revises: 0011_add_extraction_attestation
+Create Date: 2025-03-29 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012_add_extract_job_leases"
+down_revision = "0011_add_extraction_attestation"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Items already RUNNING have no lease yet and are treated as expired, so they are re-queued once.
+    with op.batch_alter_table("extract_job_items") as batch_op:
+        batch_op.add_column(sa.Column("worker_id", sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column("claimed_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_extract_job_items_status_item", "extract_job_items", ["status", "item_id"], unique=False)
+    op.create_index(
+        "ix_extract_job_items_status_manufacturer_item",
+        "extract_job_items",
+        ["status", "manufacturer", "item_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_extract_job_items_status_manufacturer_item", table_name="extract_job_items")
+    op.drop_index("ix_extract_job_items_status_item", table_name="extract_job_items")
+    with op.batch_alter_table("extract_job_items") as batch_op:
+        batch_op.drop_column("claimed_at")
+        batch_op.drop_column("worker_id")
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.ai.pdf_text import split_pages
+from app.schemas.extraction import Analyte, AnalyteStatus, ExtractionResult
+
+# Headings that usually start a new panel in a COA; used to split pages that are too long on their own.
+_SECTION_BOUNDARY = re.compile(
+    r"\s(?=(?:Certificate of Analysis|Test Results|Analytical Results|Potency|Heavy Metals|Microbiolog\w*"
+    r"|Pesticides|Residual Solvents|Mycotoxins|Contaminants|Methods?|Notes|Summary)\b)",
+    re.IGNORECASE,
+)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.;:!?])\s+")
+
+_STATUS_RANK = {AnalyteStatus.UNKNOWN: 0, AnalyteStatus.PASS: 1, AnalyteStatus.FAIL: 2}
+
+
+def split_into_chunks(text: str, max_chars: int) -> List[str]:
+    # Packs whole pages into chunks of at most max_chars; a page that is too long by itself is split at
+    # section headings, then sentence ends, then whitespace.
+    chunks: List[str] = []
+    current = ""
+    for page in split_pages(text):
+        for piece in _split_long(page, max_chars):
+            if current and len(current) + 1 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    if len(text) <= max_chars:
+        return [text]
+    for pattern in (_SECTION_BOUNDARY, _SENTENCE_BOUNDARY):
+        parts = [part for part in pattern.split(text) if part]
+        if len(parts) > 1:
+            pieces: List[str] = []
+            for part in _pack(parts, max_chars):
+                pieces.extend(_split_long(part, max_chars))
+            return pieces
+    # No structure left: cut at the last space before the limit.
+    cut = text.rfind(" ", 0, max_chars)
+    cut = cut if cut > 0 else max_chars
+    return [text[:cut]] + _split_long(text[cut:].lstrip(), max_chars)
+
+
+def _pack(parts: Sequence[str], max_chars: int) -> List[str]:
+    packed: List[str] = []
+    current = ""
+    for part in parts:
+        if current and len(current) + 1 + len(part) > max_chars:
+            packed.append(current)
+            current = part
+        else:
+            current = f"{current} {part}" if current else part
+    if current:
+        packed.append(current)
+    return packed
+
+
+def merge_extractions(results: Sequence[Tuple[ExtractionResult, int]]) -> ExtractionResult:
+    # Merges per-chunk results (with their chunk lengths) in document order: scalar fields take the first
+    # value found, lists are de-duplicated, and confidence is the length-weighted mean.
+    total_length = sum(length for _result, length in results) or 1
+    merged = ExtractionResult(
+        lab_name=_first(result.lab_name for result, _length in results),
+        report_date=_first(result.report_date for result, _length in results),
+        product_or_sample_name=_first(result.product_or_sample_name for result, _length in results),
+        lot_or_batch_in_report=_first(result.lot_or_batch_in_report for result, _length in results),
+        potency=_first(result.potency for result, _length in results),
+        analytes=_merge_analytes(analyte for result, _length in results for analyte in result.analytes),
+        contaminants=_merge_analytes(item for result, _length in results for item in result.contaminants),
+        methods=_dedupe_strings(method for result, _length in results for method in result.methods),
+        notes=" ".join(_dedupe_strings(result.notes for result, _length in results if result.notes)) or None,
+        confidence=round(sum(result.confidence * length for result, length in results) / total_length, 4),
+    )
+    return merged
+
+
+def _first(values):
+    for value in values:
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _dedupe_strings(values) -> List[str]:
+    seen: Dict[str, str] = {}
+    for value in values:
+        key = " ".join(value.split()).lower()
+        if key and key not in seen:
+            seen[key] = value
+    return list(seen.values())
+
+
+def _merge_analytes(analytes) -> List[Analyte]:
+    # The same analyte often appears on a summary page and again in its panel; keep the most complete
+    # entry, preferring a decided status (FAIL over PASS over UNKNOWN).
+    merged: Dict[Tuple[str, Optional[str]], Analyte] = {}
+    for analyte in analytes:
+        key = (" ".join((analyte.name or "").split()).lower(), (analyte.unit or "").lower() or None)
+        existing = merged.get(key)
+        if existing is None or _analyte_rank(analyte) > _analyte_rank(existing):
+            merged[key] = analyte
+    return list(merged.values())
+
+
+def _analyte_rank(analyte: Analyte) -> Tuple[int, int]:
+    filled = sum(value is not None for value in (analyte.name, analyte.result, analyte.unit, analyte.limit))
+    return _STATUS_RANK[analyte.status], filled
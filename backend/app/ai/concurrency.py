@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    # AIMD limiter: every successful call raises the limit by 1/limit (about +1 per full window), and a
+    # rate-limit response multiplies it by `decrease_factor`. Must be used from a single event loop.
+    def __init__(self, initial: int, minimum: int, maximum: int, decrease_factor: float = 0.5) -> None:
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.throttled = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with condition:
+                self.in_flight -= 1
+                condition.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.limit + 1.0 / self.limit, float(self.maximum))
+
+    def on_throttled(self) -> None:
+        self.throttled += 1
+        self.limit = max(self.limit * self.decrease_factor, float(self.minimum))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "inFlight": self.in_flight,
+            "throttled": self.throttled,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+        }
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import logging
+import os
+import socket
+import threading
+from typing import Dict, List, Optional, Set
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.ai.service import run_extraction
+from app.core.config import settings
+from app.db import session
+from app.models.batch import Batch
+from app.models.extract_job import ExtractJob, ExtractJobItem, ExtractJobItemStatus, ExtractJobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractJobQueue:
+    # Bulk extraction backed by the extract_job_items table. EXTRACT_WORKERS threads each claim one item
+    # at a time, always from the manufacturer with the fewest items running, so one large onboarding
+    # job cannot starve the rest. A claimed item carries a lease (worker_id, claimed_at) that this
+    # process renews while the item runs; items whose lease has lapsed for EXTRACT_LEASE_SECONDS belong to
+    # a process that died and are re-queued, on start and periodically.
+    def __init__(self) -> None:
+        self.worker_id = f"{socket.gethostname()[:32]}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._held: Set[int] = set()
+        self._lease_thread: Optional[threading.Thread] = None
+        self._recovered = False
+
+    def ensure_started(self) -> None:
+        with self._lock:
+            if not self._recovered:
+                self.recover()
+                self._recovered = True
+            if settings.extract_workers <= 0:
+                return
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            self._stop.clear()
+            if self._lease_thread is None or not self._lease_thread.is_alive():
+                self._lease_thread = threading.Thread(target=self._renew_leases, name="extract-lease", daemon=True)
+                self._lease_thread.start()
+            while len(self._threads) < settings.extract_workers:
+                thread = threading.Thread(
+                    target=self._run, name=f"extract-worker-{len(self._threads)}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in [*self._threads, *([self._lease_thread] if self._lease_thread else [])]:
+            thread.join(timeout=settings.extract_poll_interval + 1)
+        self._threads = []
+        self._lease_thread = None
+        self._stop.clear()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.process_next()
+            except Exception:
+                logger.exception("Extract job worker failed")
+                processed = False
+            if not processed:
+                self._wake.wait(settings.extract_poll_interval)
+                self._wake.clear()
+
+    def _renew_leases(self) -> None:
+        # Renews well inside the lease so a slow extraction is never mistaken for a dead worker.
+        while not self._stop.wait(settings.extract_lease_seconds / 3):
+            try:
+                self.renew()
+                if self.recover():
+                    self._wake.set()
+            except Exception:
+                logger.exception("Extract job lease renewal failed")
+
+    def renew(self) -> int:
+        with self._lock:
+            held = list(self._held)
+        if not held:
+            return 0
+        db = session.SessionLocal()
+        try:
+            count = (
+                db.query(ExtractJobItem)
+                .filter(
+                    ExtractJobItem.item_id.in_(held),
+                    ExtractJobItem.worker_id == self.worker_id,
+                    ExtractJobItem.status == ExtractJobItemStatus.RUNNING,
+                )
+                .update({ExtractJobItem.claimed_at: datetime.now(timezone.utc)}, synchronize_session=False)
+            )
+            db.commit()
+            return count
+        finally:
+            db.close()
+
+    def recover(self) -> int:
+        # Only expired leases are re-queued: items held by a live worker, here or in another process,
+        # keep running.
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.extract_lease_seconds)
+        db = session.SessionLocal()
+        try:
+            count = (
+                db.query(ExtractJobItem)
+                .filter(
+                    ExtractJobItem.status == ExtractJobItemStatus.RUNNING,
+                    or_(ExtractJobItem.claimed_at.is_(None), ExtractJobItem.claimed_at < cutoff),
+                )
+                .update(
+                    {
+                        ExtractJobItem.status: ExtractJobItemStatus.QUEUED,
+                        ExtractJobItem.worker_id: None,
+                        ExtractJobItem.claimed_at: None,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return count
+        finally:
+            db.close()
+
+    def process_next(self) -> bool:
+        db = session.SessionLocal()
+        try:
+            item = self._claim(db)
+            if item is None:
+                return False
+            item_id = item.item_id
+            try:
+                self._execute(db, item)
+            finally:
+                with self._lock:
+                    self._held.discard(item_id)
+            return True
+        finally:
+            db.close()
+
+    def _next_item_id(self, db: Session) -> Optional[int]:
+        # Same choice as ordering manufacturers by (items running, oldest queued item), using index
+        # lookups: the running set is at most one item per worker, while the queue can be very long.
+        running: Dict[str, int] = dict(
+            db.query(ExtractJobItem.manufacturer, func.count(ExtractJobItem.item_id))
+            .filter(ExtractJobItem.status == ExtractJobItemStatus.RUNNING)
+            .group_by(ExtractJobItem.manufacturer)
+            .all()
+        )
+        queued = db.query(ExtractJobItem.item_id).filter(ExtractJobItem.status == ExtractJobItemStatus.QUEUED)
+        idle = queued.filter(ExtractJobItem.manufacturer.notin_(list(running))) if running else queued
+        item_id = idle.order_by(ExtractJobItem.item_id).limit(1).scalar()
+        if item_id is not None:
+            return item_id
+        candidates = []
+        for manufacturer, count in running.items():
+            oldest = (
+                queued.filter(ExtractJobItem.manufacturer == manufacturer)
+                .order_by(ExtractJobItem.item_id)
+                .limit(1)
+                .scalar()
+            )
+            if oldest is not None:
+                candidates.append((count, oldest))
+        return min(candidates)[1] if candidates else None
+
+    def _claim(self, db: Session) -> Optional[ExtractJobItem]:
+        while True:
+            item_id = self._next_item_id(db)
+            if item_id is None:
+                return None
+
+            # Conditional update so two workers (or processes) never claim the same item.
+            now = datetime.now(timezone.utc)
+            claimed = (
+                db.query(ExtractJobItem)
+                .filter(ExtractJobItem.item_id == item_id, ExtractJobItem.status == ExtractJobItemStatus.QUEUED)
+                .update(
+                    {
+                        ExtractJobItem.status: ExtractJobItemStatus.RUNNING,
+                        ExtractJobItem.started_at: now,
+                        ExtractJobItem.attempts: ExtractJobItem.attempts + 1,
+                        ExtractJobItem.worker_id: self.worker_id,
+                        ExtractJobItem.claimed_at: now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if claimed:
+                with self._lock:
+                    self._held.add(item_id)
+                item = db.get(ExtractJobItem, item_id)
+                job = db.get(ExtractJob, item.job_id)
+                if job is not None and job.status == ExtractJobStatus.QUEUED:
+                    job.status = ExtractJobStatus.RUNNING
+                    job.started_at = job.started_at or now
+                    db.commit()
+                return item
+
+    def _execute(self, db: Session, item: ExtractJobItem) -> None:
+        job = db.get(ExtractJob, item.job_id)
+        error: Optional[str] = None
+        try:
+            batch = db.get(Batch, item.batch_id)
+            if batch is None:
+                error = f"Batch '{item.batch_id}' not found"
+            else:
+                run_extraction(db, batch, force_refresh=bool(job and job.force_refresh))
+        except HTTPException as exc:
+            db.rollback()
+            detail = exc.detail
+            error = detail["error"]["message"] if isinstance(detail, dict) and "error" in detail else str(detail)
+        except Exception as exc:
+            db.rollback()
+            logger.exception("Extraction failed for batch %s", item.batch_id)
+            error = str(exc) or exc.__class__.__name__
+
+        # The lease may have lapsed and the item been handed to another worker; its result wins.
+        finished = (
+            db.query(ExtractJobItem)
+            .filter(
+                ExtractJobItem.item_id == item.item_id,
+                ExtractJobItem.worker_id == self.worker_id,
+                ExtractJobItem.status == ExtractJobItemStatus.RUNNING,
+            )
+            .update(
+                {
+                    ExtractJobItem.status: ExtractJobItemStatus.FAILED if error else ExtractJobItemStatus.SUCCEEDED,
+                    ExtractJobItem.error: error,
+                    ExtractJobItem.finished_at: datetime.now(timezone.utc),
+                    ExtractJobItem.claimed_at: None,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if not finished:
+            logger.warning("Lost the lease on extract job item %s before it finished", item.item_id)
+        if job is not None:
+            self._maybe_complete(db, job.job_id)
+
+    def _maybe_complete(self, db: Session, job_id: str) -> None:
+        pending = (
+            db.query(func.count(ExtractJobItem.item_id))
+            .filter(
+                ExtractJobItem.job_id == job_id,
+                ExtractJobItem.status.in_((ExtractJobItemStatus.QUEUED, ExtractJobItemStatus.RUNNING)),
+            )
+            .scalar()
+        )
+        if pending:
+            return
+        job = db.get(ExtractJob, job_id)
+        if job.status != ExtractJobStatus.COMPLETED:
+            job.status = ExtractJobStatus.COMPLETED
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+
+
+@lru_cache(maxsize=1)
+def get_extract_job_queue() -> ExtractJobQueue:
+    return ExtractJobQueue()
@@ -1,28 +1,66 @@
 from __future__ import annotations
 
+import asyncio
+from functools import lru_cache
+from hashlib import sha256
 import json
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
-import httpx
-
+from app.ai.chunking import merge_extractions, split_into_chunks
+from app.ai.llm_client import get_llm_client
+from app.ai.pdf_text import flatten_pages
 from app.core.config import settings
 from app.core.errors import raise_api_error
+from app.core.metrics import timed_stage
 from app.schemas.extraction import ExtractionResult, ModelInfo
 
 
+if TYPE_CHECKING:
+    import httpx
+
 _PROMPT_PATH = Path(__file__).resolve().parent / "prompts" / "lab_report_extraction.txt"
 
 
+@lru_cache(maxsize=1)
 def _load_prompt() -> str:
     return _PROMPT_PATH.read_text(encoding="utf-8")
 
 
+@lru_cache(maxsize=1)
+def _response_format() -> Dict[str, Any]:
+    schema = ExtractionResult.model_json_schema()
+    return {"type": "json_schema", "json_schema": {"name": "ExtractionResult", "schema": schema}}
+
+
+@lru_cache(maxsize=1)
+def prompt_hash() -> str:
+    return sha256(_load_prompt().encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def schema_hash() -> str:
+    schema = _response_format()["json_schema"]["schema"]
+    return sha256(json.dumps(schema, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def cache_identity() -> Tuple[str, str, str, str]:
+    # Everything besides the document that determines the LLM output.
+    return settings.llm_provider.lower(), settings.llm_model, prompt_hash(), schema_hash()
+
+
 def get_model_info() -> ModelInfo:
     if settings.llm_provider == "mock":
         return ModelInfo(model_name="mock", version="0")
     return ModelInfo(model_name=settings.llm_model or "openai-compatible", version="v1")
 
 
+def chunk_signature() -> str:
+    # Chunked and single-call extraction can produce different results, so the mode is part of cache keys.
+    return f"chunks:{settings.llm_chunk_chars}" if settings.llm_chunk_chars > 0 else "single"
+
+
+@timed_stage("llm_extract")
 def extract_lab_report(text: str) -> ExtractionResult:
     provider = settings.llm_provider.lower()
     if provider == "mock":
@@ -45,24 +83,46 @@ def extract_lab_report(text: str) -> ExtractionResult:
     if not settings.llm_api_key or not settings.llm_base_url or not settings.llm_model:
         raise_api_error(400, "INVALID_LLM_CONFIG", "LLM_BASE_URL, LLM_API_KEY, and LLM_MODEL are required")
 
-    schema = ExtractionResult.model_json_schema()
-    prompt = _load_prompt()
+    import httpx
+
+    headers = {"Authorization": f"Bearer {settings.llm_api_key}"}
+    url = settings.llm_base_url.rstrip("/") + "/chat/completions"
+    client = get_llm_client()
+
+    chunks: List[str] = []
+    if settings.llm_chunk_chars > 0 and len(text) > settings.llm_chunk_chars:
+        chunks = split_into_chunks(text, settings.llm_chunk_chars)
+
+    try:
+        if len(chunks) > 1:
+            # Map: every chunk is extracted concurrently; reduce: merge the partial results.
+            responses = client.run(_post_all(client, url, headers, chunks))
+            return merge_extractions(
+                [(_parse_response(response), len(chunk)) for response, chunk in zip(responses, chunks)]
+            )
+        response = client.post_json(url, _build_payload(flatten_pages(text)), headers)
+    except httpx.HTTPError as exc:
+        raise_api_error(502, "LLM_ERROR", "LLM request failed", str(exc))
+    return _parse_response(response)
+
+
+async def _post_all(client, url: str, headers: Dict[str, str], chunks: List[str]) -> List[httpx.Response]:
+    return await asyncio.gather(*(client.apost_json(url, _build_payload(chunk), headers) for chunk in chunks))
 
-    payload = {
+
+def _build_payload(text: str) -> Dict[str, Any]:
+    return {
         "model": settings.llm_model,
         "messages": [
-            {"role": "system", "content": prompt},
+            {"role": "system", "content": _load_prompt()},
             {"role": "user", "content": text},
         ],
-        "response_format": {"type": "json_schema", "json_schema": {"name": "ExtractionResult", "schema": schema}},
+        "response_format": _response_format(),
         "temperature": 0,
     }
 
-    headers = {"Authorization": f"Bearer {settings.llm_api_key}"}
-    url = settings.llm_base_url.rstrip("/") + "/chat/completions"
 
-    with httpx.Client(timeout=60) as client:
-        response = client.post(url, headers=headers, json=payload)
+def _parse_response(response: httpx.Response) -> ExtractionResult:
     if response.status_code >= 400:
         raise_api_error(502, "LLM_ERROR", "LLM request failed", response.text)
 
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+import logging
+import random
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, Optional, TypeVar
+
+from app.ai.concurrency import AdaptiveConcurrencyLimiter
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+T = TypeVar("T")
+
+
+class LLMClient:
+    # One pooled httpx.AsyncClient for the whole process, driven by a private event loop on a daemon
+    # thread. Sync callers use post_json(); the loop keeps TLS connections alive between requests.
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self._transport = transport
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial=settings.llm_concurrency_initial,
+            minimum=settings.llm_concurrency_min,
+            maximum=settings.llm_concurrency_max,
+        )
+        self.requests = 0
+        self.retries = 0
+
+    def post_json(self, url: str, payload: Dict[str, Any], headers: Dict[str, str]) -> httpx.Response:
+        return self.run(self.apost_json(url, payload, headers))
+
+    def run(self, coroutine: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop()).result()
+
+    async def apost_json(self, url: str, payload: Dict[str, Any], headers: Dict[str, str]) -> httpx.Response:
+        import httpx
+
+        client = self._get_client()
+        attempt = 0
+        while True:
+            retry_after: Optional[float] = None
+            async with self.limiter.slot():
+                self.requests += 1
+                try:
+                    response = await client.post(url, json=payload, headers=headers)
+                except httpx.TransportError:
+                    if attempt >= settings.llm_max_retries:
+                        raise
+                    response = None
+                if response is not None:
+                    if response.status_code == 429:
+                        self.limiter.on_throttled()
+                    elif response.status_code < 400:
+                        self.limiter.on_success()
+                    if response.status_code not in _RETRY_STATUSES or attempt >= settings.llm_max_retries:
+                        return response
+                    retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                    # A provider asking for a longer pause than we are willing to wait is a final answer.
+                    if retry_after is not None and retry_after > settings.llm_backoff_max:
+                        return response
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(_backoff_delay(attempt, retry_after))
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="llm-client", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=settings.llm_timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.llm_max_connections,
+                    max_keepalive_connections=settings.llm_max_connections,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result()
+            self._client = None
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "retries": self.retries, "concurrency": self.limiter.stats()}
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _backoff_delay(attempt: int, retry_after: Optional[float]) -> float:
+    # Full jitter, never sooner than the provider's Retry-After.
+    delay = random.uniform(0, min(settings.llm_backoff_max, settings.llm_backoff_base * 2 ** (attempt - 1)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> LLMClient:
+    return LLMClient()
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.ai import pdf_worker
+from app.ai.pdf_text import join_page_texts
+from app.core.config import settings
+from app.core.errors import raise_api_error
+
+logger = logging.getLogger(__name__)
+
+Call = Tuple[Callable[..., Any], Tuple[Any, ...]]
+
+
+class _ParseTimeout(Exception):
+    pass
+
+
+class _WorkerCrashed(Exception):
+    pass
+
+
+@dataclass
+class _Task:
+    function: Callable[..., Any]
+    args: Tuple[Any, ...]
+    # Document bytes are written straight to the worker's pipe from the caller's buffer (e.g. a
+    # memoryview over an mmap) and passed to the function as its first argument.
+    data: Any = None
+    future: Optional[Future] = None
+
+
+class PdfParsePool:
+    # Parses PDFs in separate processes so a slow or malicious document cannot hold the GIL of the API
+    # worker or take it down. Each worker process is fed by its own thread, which times a task from the
+    # moment the worker receives it; a timed-out or crashed worker is killed and replaced on its own, so
+    # parses running on the other workers carry on. Workers run with RLIMIT_AS set to
+    # PDF_PARSE_MEMORY_LIMIT. PDF_PARSE_WORKERS=0 parses inline instead (useful for debugging).
+    def __init__(self) -> None:
+        self._tasks: Optional["queue.Queue[Optional[_Task]]"] = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.completed = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.rejected = 0
+        self.parse_seconds_total = 0.0
+        self.parse_seconds_max = 0.0
+
+    def parse_path(self, path: str) -> str:
+        # Long local documents are split into page ranges parsed by several workers at once.
+        max_pages = settings.pdf_max_pages or None
+        pages_per_job = settings.pdf_pages_per_job
+        if settings.pdf_parse_workers > 1 and pages_per_job > 0:
+            page_count = self.run(pdf_worker.page_count, path)
+            if max_pages:
+                page_count = min(page_count, max_pages)
+            if page_count > pages_per_job:
+                ranges = [(start, min(start + pages_per_job, page_count)) for start in range(0, page_count, pages_per_job)]
+                started = time.perf_counter()
+                results = self.run_many(
+                    [(pdf_worker.parse, (path, start, stop, settings.pdf_max_chars)) for start, stop in ranges]
+                )
+                self._record(time.perf_counter() - started)
+                return join_page_texts((text for text, _elapsed in results), settings.pdf_max_chars)
+        text, elapsed = self.run(pdf_worker.parse, path, 0, max_pages, settings.pdf_max_chars)
+        self._record(elapsed)
+        return text
+
+    def parse_bytes(self, data: Any) -> str:
+        # Accepts bytes or any buffer (memoryview, mmap); it is not copied in this process.
+        task = _Task(pdf_worker.parse, (0, settings.pdf_max_pages or None, settings.pdf_max_chars), data)
+        ((text, elapsed),) = self._run_tasks([task])
+        self._record(elapsed)
+        return text
+
+    def _record(self, elapsed: float) -> None:
+        with self._lock:
+            self.parse_seconds_total += elapsed
+            self.parse_seconds_max = max(self.parse_seconds_max, elapsed)
+
+    def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        (result,) = self.run_many([(function, args)])
+        return result
+
+    def run_many(self, calls: Sequence[Call]) -> List[Any]:
+        return self._run_tasks([_Task(function, args) for function, args in calls])
+
+    def _run_tasks(self, tasks: List[_Task]) -> List[Any]:
+        if settings.pdf_parse_workers <= 0:
+            return [_call(task) for task in tasks]
+
+        with self._lock:
+            # A single large document may exceed the queue bound on its own when the pool is idle.
+            if self.queued and self.queued + len(tasks) > settings.pdf_parse_max_queue:
+                self.rejected += 1
+                raise_api_error(503, "PARSE_QUEUE_FULL", "Too many documents are being parsed, retry later")
+            tasks_queue = self._get_queue()
+            self.queued += len(tasks)
+        for task in tasks:
+            task.future = Future()
+            task.future.add_done_callback(self._on_done)
+            tasks_queue.put(task)
+
+        try:
+            results = [task.future.result() for task in tasks if task.future is not None]
+        except Exception as exc:
+            # Ranges of the same document that have not reached a worker yet are dropped.
+            for task in tasks:
+                if task.future is not None:
+                    task.future.cancel()
+            self._raise_failure(exc)
+        with self._lock:
+            self.completed += len(tasks)
+        return results
+
+    def _raise_failure(self, exc: Exception) -> None:
+        with self._lock:
+            if isinstance(exc, _ParseTimeout):
+                self.timeouts += 1
+            else:
+                self.failures += 1
+        if isinstance(exc, _ParseTimeout):
+            raise_api_error(504, "PDF_PARSE_TIMEOUT", f"Parsing took longer than {settings.pdf_parse_timeout}s")
+        if isinstance(exc, _WorkerCrashed):
+            raise_api_error(422, "PDF_PARSE_FAILED", "The PDF parser crashed on this document")
+        raise_api_error(422, "PDF_PARSE_FAILED", "The document could not be parsed as a PDF", str(exc))
+
+    def _on_done(self, _future: Future) -> None:
+        with self._lock:
+            self.queued = max(self.queued - 1, 0)
+
+    def _get_queue(self) -> "queue.Queue[Optional[_Task]]":
+        if self._tasks is None:
+            self._tasks = queue.Queue()
+            for index in range(settings.pdf_parse_workers):
+                threading.Thread(
+                    target=self._serve, args=(self._tasks,), name=f"pdf-parse-{index}", daemon=True
+                ).start()
+        return self._tasks
+
+    def _serve(self, tasks: "queue.Queue[Optional[_Task]]") -> None:
+        # Feeds one worker process. The process is started on first use and replaced after it is killed.
+        worker: Optional[_Worker] = None
+        try:
+            while True:
+                task = tasks.get()
+                if task is None:
+                    return
+                if task.future is None or not task.future.set_running_or_notify_cancel():
+                    continue
+                if worker is None:
+                    worker = _Worker()
+                try:
+                    task.future.set_result(worker.call(task, settings.pdf_parse_timeout))
+                except (_ParseTimeout, _WorkerCrashed) as exc:
+                    worker.kill()
+                    worker = None
+                    with self._lock:
+                        self.restarts += 1
+                    logger.warning("Replacing PDF parse worker: %s", type(exc).__name__)
+                    task.future.set_exception(exc)
+                except Exception as exc:
+                    task.future.set_exception(exc)
+        finally:
+            if worker is not None:
+                worker.kill()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            tasks, self._tasks = self._tasks, None
+        if tasks is None:
+            return
+        while True:
+            try:
+                task = tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None and task.future is not None:
+                task.future.cancel()
+        for _ in range(settings.pdf_parse_workers):
+            tasks.put(None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": settings.pdf_parse_workers,
+                "queueDepth": self.queued,
+                "completed": self.completed,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "restarts": self.restarts,
+                "rejected": self.rejected,
+                "parseSecondsTotal": round(self.parse_seconds_total, 4),
+                "parseSecondsMax": round(self.parse_seconds_max, 4),
+            }
+
+
+class _Worker:
+    # One spawned parse process and the pipe used to hand it tasks.
+    def __init__(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=pdf_worker.serve, args=(child, settings.pdf_parse_memory_limit), daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    def call(self, task: _Task, timeout: float) -> Any:
+        try:
+            self.conn.send((task.function, task.args, task.data is not None))
+            if task.data is not None:
+                self.conn.send_bytes(task.data)
+            # The deadline starts when the worker has the task, not while it waited in the queue.
+            if not self.conn.poll(timeout):
+                raise _ParseTimeout()
+            ok, value = self.conn.recv()
+        except (EOFError, OSError, ValueError) as exc:
+            raise _WorkerCrashed() from exc
+        if not ok:
+            raise value
+        return value
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+def _call(task: _Task) -> Any:
+    args = task.args if task.data is None else (task.data, *task.args)
+    return task.function(*args)
+
+
+@lru_cache(maxsize=1)
+def get_parse_pool() -> PdfParsePool:
+    return PdfParsePool()
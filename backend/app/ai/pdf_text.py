@@ -1,21 +1,147 @@
 import re
-from io import BytesIO
+from io import BytesIO, StringIO
+from typing import Iterable, Iterator, List, Optional, Union
+
+# Bump whenever parsing or normalisation changes so cached text is re-extracted.
+PARSER_VERSION = "3"
+
+# Separates pages in extracted text so long documents can be chunked at page boundaries.
+PAGE_BREAK = "\f"
+
+# A filesystem path, or the document bytes (a memoryview lets mapped blobs be parsed without a copy).
+PdfSource = Union[str, bytes, memoryview]
 
 
 def _normalize_text(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+def extract_text_from_pdf(
+    source: PdfSource,
+    start: int = 0,
+    stop: Optional[int] = None,
+    max_chars: int = 0,
+) -> str:
+    return join_page_texts(iter_page_texts(source, start, stop), max_chars)
+
+
+def join_page_texts(pages: Iterable[str], max_chars: int = 0) -> str:
+    # Pages are normalised individually, so flatten_pages() of the result equals normalising the whole
+    # document at once. Only the text that fits under the character cap is kept, and iteration stops as
+    # soon as the cap is reached.
+    out = StringIO()
+    length = 0
+    for text in pages:
+        if not text:
+            continue
+        if length:
+            out.write(PAGE_BREAK)
+            length += 1
+        if max_chars:
+            text = text[: max(max_chars - length, 0)]
+        out.write(text)
+        length += len(text)
+        if max_chars and length >= max_chars:
+            break
+    return out.getvalue()
+
+
+def flatten_pages(text: str) -> str:
+    return text.replace(PAGE_BREAK, " ")
+
+
+def split_pages(text: str) -> List[str]:
+    return [page for page in text.split(PAGE_BREAK) if page]
+
+
+def iter_page_texts(source: PdfSource, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    # Yields normalised text one page at a time. PyMuPDF is tried first; pages it cannot read fall back
+    # to pdfminer individually, and the whole range goes to pdfminer only if PyMuPDF cannot open the file.
     try:
-        import fitz  # type: ignore
+        doc = _open_fitz(source)
+    except Exception:
+        yield from _iter_pdfminer_pages(source, start, stop)
+        return
 
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
-        parts = [page.get_text("text") for page in doc]
+    fallback: Optional[_PdfminerPages] = None
+    try:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for index in range(start, stop):
+            try:
+                text = doc.load_page(index).get_text("text")
+            except Exception:
+                if fallback is None:
+                    fallback = _PdfminerPages(source)
+                text = fallback.page_text(index)
+            yield _normalize_text(text)
+    finally:
         doc.close()
-        return _normalize_text("\n".join(parts))
+        if fallback is not None:
+            fallback.close()
+
+
+def count_pages(source: PdfSource) -> int:
+    try:
+        doc = _open_fitz(source)
     except Exception:
-        from pdfminer.high_level import extract_text
+        return 0
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+def _open_fitz(source: PdfSource):
+    import fitz  # type: ignore
+
+    if isinstance(source, str):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def _pdfminer_input(source: PdfSource):
+    return source if isinstance(source, str) else BytesIO(source)
+
+
+def _layout_text(page) -> str:
+    from pdfminer.layout import LTTextContainer
+
+    return "\n".join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+
+
+def _iter_pdfminer_pages(source: PdfSource, start: int, stop: Optional[int]) -> Iterator[str]:
+    from pdfminer.high_level import extract_pages
+
+    page_numbers = range(start, stop) if stop is not None else None
+    for index, page in enumerate(extract_pages(_pdfminer_input(source), page_numbers=page_numbers)):
+        if page_numbers is None and index < start:
+            continue
+        yield _normalize_text(_layout_text(page))
+
+
+class _PdfminerPages:
+    # The pdfminer fallback for pages PyMuPDF cannot read. The document is opened once, on the first such
+    # page, and walked forward; pages must be requested in ascending order.
+    def __init__(self, source: PdfSource) -> None:
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+
+        self._file = open(source, "rb") if isinstance(source, str) else BytesIO(source)
+        self._pages = enumerate(PDFPage.create_pages(PDFDocument(PDFParser(self._file))))
+        resources = PDFResourceManager()
+        self._device = PDFPageAggregator(resources, laparams=LAParams())
+        self._interpreter = PDFPageInterpreter(resources, self._device)
+
+    def page_text(self, index: int) -> str:
+        for position, page in self._pages:
+            if position == index:
+                self._interpreter.process_page(page)
+                return _layout_text(self._device.get_result())
+        return ""
 
-        text = extract_text(BytesIO(file_bytes))
-        return _normalize_text(text)
+    def close(self) -> None:
+        self._file.close()
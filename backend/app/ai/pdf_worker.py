@@ -0,0 +1,50 @@
+# Runs inside the PDF parse pool processes; keep imports light since workers are spawned.
+import os
+import time
+from typing import Any, Optional, Tuple
+
+from app.ai.pdf_text import PdfSource, count_pages, extract_text_from_pdf
+
+
+def init_worker(memory_limit_bytes: int) -> None:
+    if memory_limit_bytes <= 0:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+
+
+def serve(conn: Any, memory_limit_bytes: int) -> None:
+    # Worker loop: (function, args, has_data) messages, with document bytes following on the pipe.
+    init_worker(memory_limit_bytes)
+    while True:
+        try:
+            function, args, has_data = conn.recv()
+            if has_data:
+                args = (conn.recv_bytes(), *args)
+        except EOFError:
+            return
+        try:
+            result = (True, function(*args))
+        except Exception as exc:
+            result = (False, exc)
+        try:
+            conn.send(result)
+        except Exception as exc:
+            # The result or exception could not be pickled; report it as a plain error.
+            conn.send((False, RuntimeError(f"{type(exc).__name__}: {exc}")))
+
+
+def parse(source: PdfSource, start: int = 0, stop: Optional[int] = None, max_chars: int = 0) -> Tuple[str, float]:
+    started = time.perf_counter()
+    return extract_text_from_pdf(source, start, stop, max_chars), time.perf_counter() - started
+
+
+def page_count(source: PdfSource) -> int:
+    return count_pages(source)
+
+
+def worker_pid() -> int:
+    return os.getpid()
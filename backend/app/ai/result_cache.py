@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from hashlib import sha256
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.ai.llm import cache_identity, chunk_signature, extract_lab_report
+from app.ai.text_cache import current_parser_version
+from app.core.cache import LRUCache, register_cache
+from app.core.config import settings
+from app.models.llm_result import LLMResult
+from app.schemas.extraction import ExtractionResult
+
+# The table size is tracked in memory between inserts and recounted this often, so rows added or
+# trimmed by other workers are picked up without a COUNT(*) on every insert.
+_RECOUNT_EVERY = 100
+
+
+class ExtractionResultCache:
+    # LLM output is memoized per (fingerprint, provider, model, prompt hash, schema hash): changing any
+    # of them produces a new key, so stale results are never served. Rows live in llm_results with an
+    # in-memory LRU in front; the table is trimmed to LLM_CACHE_MAX_ENTRIES by last use.
+    def __init__(self, maxsize: int, max_entries: int, ttl_seconds: float) -> None:
+        self._cache: LRUCache[dict] = LRUCache(maxsize=maxsize, ttl_seconds=ttl_seconds or None)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_hits = 0
+        self.llm_calls = 0
+        self.refreshes = 0
+        self.db_evictions = 0
+        # Extraction runs on request threads and extract workers at once; counters and the running
+        # row count update under a lock.
+        self._lock = threading.Lock()
+        self._row_count: Optional[int] = None
+        self._inserts = 0
+
+    def get_or_extract(
+        self,
+        db: Session,
+        fingerprint: str,
+        load_text: Callable[[], str],
+        force_refresh: bool = False,
+    ) -> ExtractionResult:
+        provider, model, prompt_hash, schema_hash = cache_identity()
+        key = self.cache_key(fingerprint, provider, model, prompt_hash, schema_hash)
+        if not settings.llm_cache_enabled:
+            return extract_lab_report(load_text())
+
+        if force_refresh:
+            with self._lock:
+                self.refreshes += 1
+        else:
+            cached = self._lookup(db, key)
+            if cached is not None:
+                return ExtractionResult.model_validate(cached)
+
+        result = extract_lab_report(load_text())
+        with self._lock:
+            self.llm_calls += 1
+        payload = result.model_dump(by_alias=True, mode="json")
+        self._persist(db, key, fingerprint, provider, model, prompt_hash, schema_hash, payload)
+        self._cache.set(key, payload)
+        return result
+
+    @staticmethod
+    def cache_key(fingerprint: str, provider: str, model: str, prompt_hash: str, schema_hash: str) -> str:
+        parts = [fingerprint, current_parser_version(), chunk_signature(), provider, model, prompt_hash, schema_hash]
+        return sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _lookup(self, db: Session, key: str) -> Optional[dict]:
+        payload = self._cache.get(key)
+        if payload is not None:
+            return payload
+
+        row = db.get(LLMResult, key)
+        if row is None:
+            return None
+        now = datetime.now(timezone.utc)
+        if self.ttl_seconds and _as_utc(row.created_at) + timedelta(seconds=self.ttl_seconds) <= now:
+            db.delete(row)
+            with self._lock:
+                if self._row_count is not None:
+                    self._row_count -= 1
+            return None
+        row.hit_count += 1
+        row.last_used_at = now
+        with self._lock:
+            self.db_hits += 1
+        self._cache.set(key, row.result)
+        return row.result
+
+    def _persist(
+        self,
+        db: Session,
+        key: str,
+        fingerprint: str,
+        provider: str,
+        model: str,
+        prompt_hash: str,
+        schema_hash: str,
+        payload: dict,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        row = db.get(LLMResult, key)
+        if row is not None:
+            row.result = payload
+            row.created_at = now
+            row.last_used_at = now
+            return
+        try:
+            with db.begin_nested():
+                db.add(
+                    LLMResult(
+                        cache_key=key,
+                        fingerprint=fingerprint,
+                        provider=provider,
+                        model=model,
+                        prompt_hash=prompt_hash,
+                        schema_hash=schema_hash,
+                        result=payload,
+                        hit_count=0,
+                        created_at=now,
+                        last_used_at=now,
+                    )
+                )
+        except IntegrityError:
+            return
+        self._evict(db)
+
+    def _evict(self, db: Session) -> None:
+        with self._lock:
+            self._inserts += 1
+            if self._row_count is None or self._inserts % _RECOUNT_EVERY == 0:
+                self._row_count = db.query(LLMResult).count()
+            else:
+                self._row_count += 1
+            excess = self._row_count - self.max_entries
+            if excess <= 0:
+                return
+            self._row_count -= excess
+        stale = db.query(LLMResult.cache_key).order_by(LLMResult.last_used_at.asc()).limit(excess).all()
+        for (cache_key,) in stale:
+            self._cache.pop(cache_key)
+        db.query(LLMResult).filter(LLMResult.cache_key.in_([cache_key for (cache_key,) in stale])).delete(
+            synchronize_session=False
+        )
+        with self._lock:
+            self.db_evictions += len(stale)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        with self._lock:
+            self.db_hits = self.llm_calls = self.refreshes = self.db_evictions = 0
+            self._row_count = None
+            self._inserts = 0
+
+    def stats(self) -> Dict[str, Any]:
+        memory = self._cache.stats()
+        with self._lock:
+            db_hits, llm_calls = self.db_hits, self.llm_calls
+            refreshes, db_evictions = self.refreshes, self.db_evictions
+        served = memory["hits"] + db_hits
+        lookups = served + llm_calls - refreshes
+        return {
+            **memory,
+            "dbHits": db_hits,
+            "llmCalls": llm_calls,
+            "forcedRefreshes": refreshes,
+            "dbEvictions": db_evictions,
+            "overallHitRate": round(served / lookups, 4) if lookups > 0 else 0.0,
+        }
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=1)
+def get_result_cache() -> ExtractionResultCache:
+    cache = ExtractionResultCache(
+        maxsize=settings.llm_cache_size,
+        max_entries=settings.llm_cache_max_entries,
+        ttl_seconds=settings.llm_cache_ttl,
+    )
+    register_cache("llmResults", cache)
+    return cache
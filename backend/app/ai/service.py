@@ -5,8 +5,10 @@ from typing import Tuple
 
 from sqlalchemy.orm import Session
 
-from app.ai.llm import extract_lab_report, get_model_info
-from app.ai.pdf_text import extract_text_from_pdf
+from app.ai.llm import get_model_info
+from app.ai.result_cache import get_result_cache
+from app.ai.text_cache import get_text_cache
+from app.chain.hashing import refresh_attestation
 from app.core.errors import raise_api_error
 from app.models.batch import Batch, BatchStatus
 from app.models.document import Document
@@ -14,7 +16,9 @@ from app.models.extraction import Extraction
 from app.schemas.extraction import ExtractionResponse, ExtractionResult
 
 
-def run_extraction(db: Session, batch: Batch) -> Tuple[ExtractionResult, dict, datetime, Document]:
+def run_extraction(
+    db: Session, batch: Batch, force_refresh: bool = False
+) -> Tuple[ExtractionResult, dict, datetime, Document]:
     document = (
         db.query(Document)
         .filter(Document.batch_id == batch.batch_id)
@@ -24,28 +28,33 @@ def run_extraction(db: Session, batch: Batch) -> Tuple[ExtractionResult, dict, d
     if not document:
         raise_api_error(400, "NO_DOCUMENT", f"No document found for batch '{batch.batch_id}'")
 
-    text = extract_text_from_pdf(document.data)
-    extraction = extract_lab_report(text)
+    # Text is only parsed (or read from the text cache) when the LLM result is not already cached.
+    extraction = get_result_cache().get_or_extract(
+        db,
+        document.fingerprint,
+        lambda: get_text_cache().get_text(db, document),
+        force_refresh=force_refresh,
+    )
     model_info = get_model_info().model_dump(by_alias=True)
     extracted_at = datetime.now(timezone.utc)
 
     existing = db.get(Extraction, batch.batch_id)
-    payload = extraction.model_dump(by_alias=True)
+    payload = extraction.model_dump(by_alias=True, mode="json")
     if existing:
         existing.extracted_fields = payload
         existing.model_info = model_info
         existing.extracted_at = extracted_at
         existing.document_fingerprint = document.fingerprint
     else:
-        db.add(
-            Extraction(
-                batch_id=batch.batch_id,
-                extracted_fields=payload,
-                model_info=model_info,
-                extracted_at=extracted_at,
-                document_fingerprint=document.fingerprint,
-            )
+        existing = Extraction(
+            batch_id=batch.batch_id,
+            extracted_fields=payload,
+            model_info=model_info,
+            extracted_at=extracted_at,
+            document_fingerprint=document.fingerprint,
         )
+        db.add(existing)
+    refresh_attestation(batch, existing, ExtractionResult.model_validate(payload))
 
     batch.status = BatchStatus.READY
     db.commit()
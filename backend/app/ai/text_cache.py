@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import lru_cache
+import threading
+from typing import Any, Dict, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.ai.parse_pool import get_parse_pool
+from app.ai.pdf_text import PARSER_VERSION
+from app.core.cache import LRUCache, register_cache
+from app.core.config import settings
+from app.core.metrics import timed_stage
+from app.models.document import Document
+from app.models.extracted_text import ExtractedText
+from app.storage.deps import get_blob_store
+from app.storage.documents import open_document_buffer
+
+
+class ExtractedTextCache:
+    # Parsed text is keyed by document fingerprint and parser version: the bytes behind a fingerprint
+    # never change, so an entry is only superseded when PARSER_VERSION is bumped. The in-memory LRU sits
+    # in front of the extracted_texts table, which survives restarts and is shared between workers.
+    def __init__(self, maxsize: int) -> None:
+        self._cache: LRUCache[str] = LRUCache(maxsize=maxsize)
+        # Extraction runs on request threads and extract workers at once; counters update under a lock.
+        self._lock = threading.Lock()
+        self.parses = 0
+        self.db_hits = 0
+
+    def get_text(self, db: Session, document: Document) -> str:
+        key: Tuple[str, str] = (document.fingerprint, current_parser_version())
+        text = self._cache.get(key)
+        if text is not None:
+            return text
+
+        stored = db.get(ExtractedText, key)
+        if stored is not None:
+            with self._lock:
+                self.db_hits += 1
+            self._cache.set(key, stored.text)
+            return stored.text
+
+        text = _parse_document(document)
+        with self._lock:
+            self.parses += 1
+        self._persist(db, document.fingerprint, text)
+        self._cache.set(key, text)
+        return text
+
+    def _persist(self, db: Session, fingerprint: str, text: str) -> None:
+        record = ExtractedText(
+            fingerprint=fingerprint,
+            parser_version=current_parser_version(),
+            text=text,
+            char_count=len(text),
+            created_at=datetime.now(timezone.utc),
+        )
+        # Another request may have parsed the same document concurrently; either copy is fine.
+        try:
+            with db.begin_nested():
+                db.add(record)
+        except IntegrityError:
+            pass
+
+    def clear(self) -> None:
+        self._cache.clear()
+        with self._lock:
+            self.parses = self.db_hits = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            db_hits, parses = self.db_hits, self.parses
+        return {
+            **self._cache.stats(),
+            "dbHits": db_hits,
+            "parses": parses,
+            "parserVersion": current_parser_version(),
+        }
+
+
+def current_parser_version() -> str:
+    # Page and character caps change the extracted text, so they are part of the cache key.
+    version = PARSER_VERSION
+    if settings.pdf_max_pages:
+        version += f"-p{settings.pdf_max_pages}"
+    if settings.pdf_max_chars:
+        version += f"-c{settings.pdf_max_chars}"
+    return version
+
+
+@timed_stage("pdf_parse")
+def _parse_document(document: Document) -> str:
+    pool = get_parse_pool()
+    # Workers read local blobs straight from disk; other content has to be shipped to them.
+    path = get_blob_store().local_path(document.fingerprint) if document.data is None else None
+    if path is not None:
+        return pool.parse_path(path)
+    with open_document_buffer(document) as buffer:
+        return pool.parse_bytes(buffer)
+
+
+@lru_cache(maxsize=1)
+def get_text_cache() -> ExtractedTextCache:
+    cache = ExtractedTextCache(maxsize=settings.text_cache_size)
+    register_cache("extractedText", cache)
+    return cache
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
+from app.ai.llm_client import get_llm_client
+from app.ai.parse_pool import get_parse_pool
 from app.ai.service import run_extraction, to_response
 from app.api.deps import get_db
 from app.core.errors import raise_api_error
@@ -16,10 +18,24 @@ router = APIRouter()
     response_model=ExtractionResponse,
     dependencies=[Depends(require_api_key)],
 )
-def extract_data(batchId: str, db: Session = Depends(get_db)) -> ExtractionResponse:
+def extract_data(
+    batchId: str,
+    forceRefresh: bool = Query(False),
+    db: Session = Depends(get_db),
+) -> ExtractionResponse:
     batch = db.get(BatchModel, batchId)
     if not batch:
         raise_api_error(status.HTTP_404_NOT_FOUND, "BATCH_NOT_FOUND", f"Batch '{batchId}' not found")
 
-    extraction, model_info, extracted_at, _document = run_extraction(db, batch)
+    extraction, model_info, extracted_at, _document = run_extraction(db, batch, force_refresh=forceRefresh)
     return to_response(batch, extraction, model_info, extracted_at)
+
+
+@router.get("/ai/parse-pool", dependencies=[Depends(require_api_key)])
+def get_parse_pool_stats() -> dict:
+    return get_parse_pool().stats()
+
+
+@router.get("/ai/llm-client", dependencies=[Depends(require_api_key)])
+def get_llm_client_stats() -> dict:
+    return get_llm_client().stats()
@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Body, Depends, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.chain.cache import AttestationCache, get_attestation_cache
+from app.chain.calls import sync_chain_client
+from app.chain.deps import get_chain_client
+from app.chain.hashing import stored_attestation, to_hex
+from app.chain.merkle import build_merkle_tree
+from app.core.config import settings
+from app.core.errors import raise_api_error
+from app.core.security import require_api_key
+from app.models.anchor import MerkleAnchor
+from app.models.batch import Batch as BatchModel, BatchStatus
+from app.models.extraction import Extraction as ExtractionModel
+from app.schemas.anchor import AnchorCreate
+
+router = APIRouter()
+
+
+@router.post("/anchors", status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_api_key)])
+def create_anchor(
+    payload: Optional[AnchorCreate] = Body(default=None),
+    db: Session = Depends(get_db),
+    chain_client=Depends(get_chain_client),
+    cache: AttestationCache = Depends(get_attestation_cache),
+) -> JSONResponse:
+    chain_client = sync_chain_client(chain_client)
+    query = (
+        db.query(BatchModel, ExtractionModel)
+        .join(ExtractionModel, ExtractionModel.batch_id == BatchModel.batch_id)
+        .filter(BatchModel.status == BatchStatus.READY)
+    )
+    if payload and payload.batch_ids:
+        query = query.filter(BatchModel.batch_id.in_(payload.batch_ids))
+    rows = query.order_by(BatchModel.batch_id).limit(settings.anchor_max_batches).all()
+    if not rows:
+        raise_api_error(status.HTTP_400_BAD_REQUEST, "NO_READY_BATCHES", "No READY batches available to anchor")
+
+    leaves = []
+    for batch, extraction in rows:
+        leaves.append(stored_attestation(batch, extraction)[1])
+    tree = build_merkle_tree(leaves)
+
+    tx_hash = chain_client.publish_root(tree.root)
+    publisher_address = chain_client.publisher_for(tx_hash)
+    receipt = chain_client.get_receipt(tx_hash)
+    cache.note_block(receipt.block_number)
+    cache.invalidate_root(tree.root)
+    if not receipt.success:
+        # Nothing is anchored, so the batches stay READY.
+        raise_api_error(
+            status.HTTP_502_BAD_GATEWAY,
+            "ANCHOR_REVERTED",
+            "The anchor transaction was mined but reverted",
+            {"txHash": receipt.tx_hash},
+        )
+
+    root_hex = to_hex(tree.root)
+    anchored_at = datetime.now(timezone.utc)
+    db.add(
+        MerkleAnchor(
+            root=root_hex,
+            leaf_count=len(leaves),
+            chain=settings.chain_name,
+            tx_hash=receipt.tx_hash,
+            block_number=receipt.block_number,
+            publisher_address=publisher_address,
+            anchored_at=anchored_at,
+        )
+    )
+    for index, (batch, _extraction) in enumerate(rows):
+        batch.status = BatchStatus.PUBLISHED
+        batch.tx_hash = receipt.tx_hash
+        batch.chain = settings.chain_name
+        batch.publisher_address = publisher_address
+        batch.published_at = anchored_at
+        batch.anchor_root = root_hex
+        batch.merkle_proof = [to_hex(node) for node in tree.proof(index)]
+    db.commit()
+
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={
+            "root": root_hex,
+            "txHash": receipt.tx_hash,
+            "blockNumber": receipt.block_number,
+            "batchCount": len(leaves),
+            "anchoredAt": anchored_at.isoformat(),
+        },
+    )
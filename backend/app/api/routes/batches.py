@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db
 from app.core.errors import raise_api_error
 from app.core.security import require_api_key
 from app.models.batch import Batch as BatchModel, BatchStatus
@@ -16,8 +16,8 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(require_api_key)],
 )
-def create_batch(payload: BatchCreate, db: Session = Depends(get_db)) -> BatchModel:
-    existing = db.get(BatchModel, payload.batch_id)
+async def create_batch(payload: BatchCreate, db: AsyncSession = Depends(get_async_db)) -> BatchModel:
+    existing = await db.get(BatchModel, payload.batch_id)
     if existing:
         raise_api_error(
             status.HTTP_409_CONFLICT,
@@ -35,14 +35,14 @@ def create_batch(payload: BatchCreate, db: Session = Depends(get_db)) -> BatchMo
         status=BatchStatus.DRAFT,
     )
     db.add(batch)
-    db.commit()
-    db.refresh(batch)
+    await db.commit()
+    await db.refresh(batch)
     return batch
 
 
 @router.get("/batches/{batchId}", response_model=Batch, dependencies=[Depends(require_api_key)])
-def get_batch(batchId: str, db: Session = Depends(get_db)) -> BatchModel:
-    batch = db.get(BatchModel, batchId)
+async def get_batch(batchId: str, db: AsyncSession = Depends(get_async_db)) -> BatchModel:
+    batch = await db.get(BatchModel, batchId)
     if not batch:
         raise_api_error(status.HTTP_404_NOT_FOUND, "BATCH_NOT_FOUND", f"Batch '{batchId}' not found")
     return batch
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+
+from app.ai.result_cache import get_result_cache
+from app.ai.text_cache import get_text_cache
+from app.chain.cache import get_attestation_cache
+from app.core.cache import cache_stats
+from app.core.security import require_api_key
+
+router = APIRouter()
+
+
+@router.get("/cache/stats", dependencies=[Depends(require_api_key)])
+def get_cache_stats() -> dict:
+    get_attestation_cache()
+    get_text_cache()
+    get_result_cache()
+    return cache_stats()
@@ -1,60 +1,72 @@
 import json
+import logging
 from datetime import datetime, timezone
+from typing import Literal
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db
+from app.chain.cache import AttestationCache, get_attestation_cache
+from app.chain.calls import call_chain, sync_chain_client
 from app.chain.deps import get_chain_client
-from app.chain.hashing import build_attestation_json, hash_attestation, hash_batch_id
+from app.chain.hashing import hash_batch_id, stored_attestation, to_hex
+from app.chain.rpc_pool import get_rpc_pool
+from app.chain.tracker import get_receipt_tracker
 from app.core.config import settings
 from app.core.errors import raise_api_error
 from app.core.security import require_api_key
-from app.models.batch import Batch as BatchModel, BatchStatus
-from app.models.extraction import Extraction as ExtractionModel
-from app.schemas.extraction import ExtractionResult
+from app.db.queries import acommit_backfill, aget_batch_with_extraction
+from app.models.batch import BatchStatus
+from app.models.publish_job import ACTIVE_PUBLISH_JOB_STATUSES, PublishJob as PublishJobModel, PublishJobStatus
+from app.models.published_event import PublishedEvent as PublishedEventModel
+from app.schemas.publish_job import PublishJob
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
 @router.get("/batches/{batchId}/attestation", dependencies=[Depends(require_api_key)])
-def get_attestation(batchId: str, db: Session = Depends(get_db)) -> JSONResponse:
-    batch = db.get(BatchModel, batchId)
+async def get_attestation(batchId: str, db: AsyncSession = Depends(get_async_db)) -> Response:
+    batch, extraction = await aget_batch_with_extraction(db, batchId)
     if not batch:
         raise_api_error(status.HTTP_404_NOT_FOUND, "BATCH_NOT_FOUND", f"Batch '{batchId}' not found")
-
-    extraction = db.get(ExtractionModel, batchId)
     if not extraction:
         raise_api_error(status.HTTP_404_NOT_FOUND, "NOT_FOUND", "Resource not found")
 
-    extraction_result = ExtractionResult.model_validate(extraction.extracted_fields)
-    canonical_json = build_attestation_json(batch, extraction_result, extraction.document_fingerprint)
-    canonical_hash = hash_attestation(canonical_json)
-
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={
-            "batchId": batch.batch_id,
-            "canonicalJson": json.loads(canonical_json),
-            "canonicalJsonHash": f"0x{canonical_hash.hex()}",
-            "createdAt": extraction.extracted_at.replace(tzinfo=timezone.utc).isoformat(),
-            "published": batch.status == BatchStatus.PUBLISHED,
-            "chain": batch.chain or settings.chain_name,
-            "txHash": batch.tx_hash,
-            "publisherAddress": batch.publisher_address,
-            "publishedAt": batch.published_at.replace(tzinfo=timezone.utc).isoformat() if batch.published_at else None,
-        },
-    )
+    canonical_json, canonical_hash = stored_attestation(batch, extraction)
+    content = {
+        "batchId": batch.batch_id,
+        "canonicalJsonHash": f"0x{canonical_hash.hex()}",
+        "createdAt": extraction.extracted_at.replace(tzinfo=timezone.utc).isoformat(),
+        "published": batch.status == BatchStatus.PUBLISHED,
+        "chain": batch.chain or settings.chain_name,
+        "txHash": batch.tx_hash,
+        "publisherAddress": batch.publisher_address,
+        "publishedAt": batch.published_at.replace(tzinfo=timezone.utc).isoformat() if batch.published_at else None,
+        "anchorRoot": batch.anchor_root,
+        "merkleProof": batch.merkle_proof,
+    }
+    await acommit_backfill(db)
+    # The stored canonical JSON is already serialised; splice it in rather than parsing it again.
+    body = json.dumps(content, separators=(",", ":"))
+    body = body[:-1] + ',"canonicalJson":' + canonical_json + "}"
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/batches/{batchId}/publish", dependencies=[Depends(require_api_key)])
-def publish_attestation(
+async def publish_attestation(
     batchId: str,
-    db: Session = Depends(get_db),
+    mode: Literal["sync", "async"] = Query(default="sync"),
+    db: AsyncSession = Depends(get_async_db),
     chain_client=Depends(get_chain_client),
+    cache: AttestationCache = Depends(get_attestation_cache),
 ) -> JSONResponse:
-    batch = db.get(BatchModel, batchId)
+    batch, extraction = await aget_batch_with_extraction(db, batchId)
     if not batch:
         raise_api_error(status.HTTP_404_NOT_FOUND, "BATCH_NOT_FOUND", f"Batch '{batchId}' not found")
     if batch.status != BatchStatus.READY:
@@ -64,24 +76,59 @@ def publish_attestation(
             "Attestation data not available. Extract data first.",
         )
 
+    if mode == "async":
+        active_job = await db.scalar(
+            select(PublishJobModel)
+            .where(PublishJobModel.batch_id == batchId, PublishJobModel.status.in_(ACTIVE_PUBLISH_JOB_STATUSES))
+            .limit(1)
+        )
+        if active_job:
+            return _publish_job_accepted(active_job)
+
     batch_id_hash = hash_batch_id(batch.batch_id)
-    extraction = db.get(ExtractionModel, batchId)
     if not extraction:
         raise_api_error(status.HTTP_404_NOT_FOUND, "NOT_FOUND", "Resource not found")
 
-    extraction_result = ExtractionResult.model_validate(extraction.extracted_fields)
-    canonical_json = build_attestation_json(batch, extraction_result, extraction.document_fingerprint)
-    attestation_hash = hash_attestation(canonical_json)
+    _canonical_json, attestation_hash = stored_attestation(batch, extraction)
 
-    tx_hash = chain_client.publish(batch_id_hash, attestation_hash)
-    receipt = chain_client.get_receipt(tx_hash)
+    if settings.publish_preflight:
+        # One (usually cached) read instead of a transaction that would revert with ALREADY_PUBLISHED.
+        onchain_hash = await cache.aget_attestation(chain_client, batch_id_hash)
+        if onchain_hash is not None:
+            return await _already_published(db, batch, batch_id_hash, onchain_hash, attestation_hash, chain_client)
 
-    batch.status = BatchStatus.PUBLISHED
+    tx_hash = await call_chain(chain_client.publish, batch_id_hash, attestation_hash)
+    cache.invalidate(batch_id_hash)
     batch.tx_hash = tx_hash
     batch.chain = settings.chain_name
-    batch.publisher_address = chain_client.publisher_address
+    batch.publisher_address = chain_client.publisher_for(tx_hash)
+
+    if mode == "async":
+        now = datetime.now(timezone.utc)
+        job = PublishJobModel(
+            job_id=str(uuid4()),
+            batch_id=batch.batch_id,
+            tx_hash=tx_hash,
+            status=PublishJobStatus.SUBMITTED,
+            confirmations=0,
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(job)
+        await db.commit()
+        get_receipt_tracker().ensure_started(sync_chain_client(chain_client))
+        return _publish_job_accepted(job)
+
+    receipt = await call_chain(chain_client.get_receipt, tx_hash)
+    cache.note_block(receipt.block_number)
+    cache.invalidate(batch_id_hash)
+    if not receipt.success:
+        return await _reverted_publish(db, batch, batch_id_hash, attestation_hash, receipt.tx_hash, chain_client, cache)
+
+    batch.status = BatchStatus.PUBLISHED
+    batch.tx_hash = receipt.tx_hash
     batch.published_at = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -92,3 +139,114 @@ def publish_attestation(
             "publishedAt": batch.published_at.isoformat(),
         },
     )
+
+
+@router.get("/publish-jobs/{jobId}", response_model=PublishJob, dependencies=[Depends(require_api_key)])
+async def get_publish_job(jobId: str, db: AsyncSession = Depends(get_async_db)) -> PublishJob:
+    job = await db.get(PublishJobModel, jobId)
+    if not job:
+        raise_api_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Publish job '{jobId}' not found")
+    return _to_publish_job(job)
+
+
+@router.get("/chain/rpc-endpoints", dependencies=[Depends(require_api_key)])
+def get_rpc_endpoint_stats() -> dict:
+    return get_rpc_pool().stats()
+
+
+@router.get("/chain/publishers", dependencies=[Depends(require_api_key)])
+def get_publisher_stats(chain_client=Depends(get_chain_client)) -> dict:
+    return {"publishers": sync_chain_client(chain_client).publisher_stats()}
+
+
+async def _reverted_publish(
+    db: AsyncSession,
+    batch,
+    batch_id_hash: bytes,
+    attestation_hash: bytes,
+    tx_hash: str,
+    chain_client,
+    cache: AttestationCache,
+) -> JSONResponse:
+    # A mined but reverted publish leaves the batch READY. The usual cause is that the batch was anchored
+    # in the meantime (gas limits are cached, so no estimate catches it); that case resolves like preflight.
+    batch.tx_hash = None
+    batch.chain = None
+    batch.publisher_address = None
+    await db.commit()
+    onchain_hash = await cache.aget_attestation(chain_client, batch_id_hash)
+    if onchain_hash is not None:
+        return await _already_published(db, batch, batch_id_hash, onchain_hash, attestation_hash, chain_client)
+    raise_api_error(
+        status.HTTP_502_BAD_GATEWAY,
+        "PUBLISH_REVERTED",
+        "The publish transaction was mined but reverted",
+        {"txHash": tx_hash},
+    )
+
+
+async def _already_published(
+    db: AsyncSession, batch, batch_id_hash: bytes, onchain_hash: bytes, attestation_hash: bytes, chain_client
+) -> JSONResponse:
+    if onchain_hash != attestation_hash:
+        raise_api_error(
+            status.HTTP_409_CONFLICT,
+            "ALREADY_PUBLISHED",
+            "A different attestation hash is already anchored for this batch",
+            {"onchainHash": to_hex(onchain_hash)},
+        )
+    # The original transaction comes from the event index, or from the chain's Published logs when it has
+    # not been indexed (the indexer is optional). If neither has it, the batch is still marked published.
+    tx_hash = block_number = publisher = None
+    published_at = datetime.now(timezone.utc)
+    event = await db.get(PublishedEventModel, to_hex(batch_id_hash))
+    if event is not None:
+        tx_hash, block_number, publisher = event.tx_hash, event.block_number, event.publisher
+        published_at = event.published_at.replace(tzinfo=timezone.utc)
+    else:
+        try:
+            log = await call_chain(sync_chain_client(chain_client).find_published_event, batch_id_hash)
+        except Exception:
+            logger.warning("Could not look up the Published log for %s", batch.batch_id, exc_info=True)
+            log = None
+        if log is not None:
+            tx_hash, block_number, publisher = log.tx_hash, log.block_number, log.publisher
+            published_at = datetime.fromtimestamp(log.timestamp, timezone.utc)
+    batch.status = BatchStatus.PUBLISHED
+    batch.tx_hash = tx_hash
+    batch.chain = settings.chain_name
+    batch.publisher_address = publisher
+    batch.published_at = published_at
+    await db.commit()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "batchId": batch.batch_id,
+            "txHash": tx_hash,
+            "blockNumber": block_number,
+            "publishedAt": published_at.isoformat(),
+        },
+    )
+
+
+def _to_publish_job(job: PublishJobModel) -> PublishJob:
+    return PublishJob(
+        job_id=job.job_id,
+        batch_id=job.batch_id,
+        tx_hash=job.tx_hash,
+        status=job.status,
+        block_number=job.block_number,
+        confirmations=job.confirmations,
+        required_confirmations=settings.publish_confirmations,
+        error=job.error,
+        created_at=job.created_at.replace(tzinfo=timezone.utc),
+        updated_at=job.updated_at.replace(tzinfo=timezone.utc),
+    )
+
+
+def _publish_job_accepted(job: PublishJobModel) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=_to_publish_job(job).model_dump(mode="json", by_alias=True),
+        headers={"Location": f"/publish-jobs/{job.job_id}"},
+    )
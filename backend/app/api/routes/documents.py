@@ -1,19 +1,29 @@
+import re
 from datetime import datetime, timezone
-from hashlib import sha256
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, UploadFile, status
+from fastapi import APIRouter, Depends, File, Header, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.core.config import settings
 from app.core.errors import raise_api_error
 from app.core.security import require_api_key
+from app.core.uploads import fingerprint_upload
 from app.models.batch import Batch as BatchModel
 from app.models.document import Document as DocumentModel
 from app.schemas.document import Document
+from app.storage.base import BlobStore
+from app.storage.deps import get_blob_store
+from app.storage.documents import document_size, sweep_orphan_blobs
 
 router = APIRouter()
 
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
 
 @router.post(
     "/batches/{batchId}/documents",
@@ -25,23 +35,118 @@ def upload_document(
     batchId: str,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
+    blob_store: BlobStore = Depends(get_blob_store),
 ) -> DocumentModel:
     batch = db.get(BatchModel, batchId)
     if not batch:
         raise_api_error(status.HTTP_404_NOT_FOUND, "BATCH_NOT_FOUND", f"Batch '{batchId}' not found")
 
-    content = file.file.read()
-    fingerprint = "0x" + sha256(content).hexdigest()
+    upload = fingerprint_upload(file.file)
+    # Identical files share one blob; only the document row is new.
+    blob_store.put_file(upload.fingerprint, file.file)
+
     document = DocumentModel(
         document_id=str(uuid4()),
         batch_id=batch.batch_id,
         filename=file.filename or "document.pdf",
         content_type=file.content_type or "application/pdf",
         uploaded_at=datetime.now(timezone.utc),
-        data=content,
-        fingerprint=fingerprint,
+        fingerprint=upload.fingerprint,
+        size_bytes=upload.size,
     )
     db.add(document)
+    # A blob left behind by a failed commit is not deleted here: a concurrent upload of the same file may
+    # be about to reference it. POST /blobs/sweep removes it once it is past the grace period.
     db.commit()
     db.refresh(document)
     return document
+
+
+@router.post("/blobs/sweep", dependencies=[Depends(require_api_key)])
+def sweep_blobs(
+    db: Session = Depends(get_db),
+    blob_store: BlobStore = Depends(get_blob_store),
+) -> dict:
+    return {"deleted": sweep_orphan_blobs(db, blob_store, settings.blob_sweep_grace_seconds)}
+
+
+@router.get(
+    "/documents/{documentId}/content",
+    dependencies=[Depends(require_api_key)],
+)
+def download_document(
+    documentId: str,
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
+    db: Session = Depends(get_db),
+    blob_store: BlobStore = Depends(get_blob_store),
+) -> Response:
+    document = db.get(DocumentModel, documentId)
+    if not document:
+        raise_api_error(status.HTTP_404_NOT_FOUND, "DOCUMENT_NOT_FOUND", f"Document '{documentId}' not found")
+
+    # Content is addressed by its hash, so the fingerprint is a strong ETag.
+    etag = f'"{document.fingerprint}"'
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": "private, max-age=31536000, immutable"}
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    size = document_size(document)
+    byte_range = _parse_range(range_header, size) if range_header else None
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(max(end - start + 1, 0))
+    headers["Content-Disposition"] = _content_disposition(document.filename)
+    status_code = status.HTTP_200_OK
+    if byte_range:
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return StreamingResponse(
+        _iter_content(document, blob_store, start, end),
+        status_code=status_code,
+        media_type=document.content_type,
+        headers=headers,
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, and "*" matches any current representation.
+    values = [value.strip() for value in if_none_match.split(",")]
+    return "*" in values or etag in [value[2:] if value.startswith("W/") else value for value in values]
+
+
+def _content_disposition(filename: str) -> str:
+    # The filename is user input: an ASCII fallback with quotes and controls replaced, plus the exact
+    # name percent-encoded as RFC 5987 `filename*`.
+    fallback = "".join(char if 32 <= ord(char) < 127 and char not in '"\\' else "_" for char in filename)
+    return f"inline; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def _parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+    # Only single ranges are supported; anything else is served as the full body.
+    match = _RANGE_PATTERN.match(value.strip())
+    if not match or (not match.group(1) and not match.group(2)):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or start > end:
+        raise_api_error(
+            status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            "RANGE_NOT_SATISFIABLE",
+            f"Range '{value}' is not satisfiable for {size} bytes",
+        )
+    return start, end
+
+
+def _iter_content(document: DocumentModel, blob_store: BlobStore, start: int, end: int) -> Iterator[bytes]:
+    if end < start:
+        return
+    if document.data is not None:
+        yield document.data[start : end + 1]
+        return
+    yield from blob_store.iter_range(document.fingerprint, start, end, settings.upload_chunk_size)
@@ -0,0 +1,152 @@
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.ai.jobs import get_extract_job_queue
+from app.api.deps import get_db
+from app.core.config import settings
+from app.core.errors import raise_api_error
+from app.core.security import require_api_key
+from app.models.batch import Batch as BatchModel
+from app.models.extract_job import (
+    ExtractJob as ExtractJobModel,
+    ExtractJobItem,
+    ExtractJobItemStatus,
+    ExtractJobStatus,
+)
+from app.schemas.extract_job import ExtractJob, ExtractJobCreate, ExtractJobFailure, ExtractJobProgress
+
+router = APIRouter()
+
+_MAX_REPORTED_FAILURES = 100
+
+
+@router.post(
+    "/extract-jobs",
+    response_model=ExtractJob,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_api_key)],
+)
+def create_extract_job(payload: ExtractJobCreate, db: Session = Depends(get_db)) -> JSONResponse:
+    batch_ids = list(dict.fromkeys(payload.batch_ids))
+    if len(batch_ids) > settings.extract_job_max_ids:
+        raise_api_error(
+            status.HTTP_400_BAD_REQUEST,
+            "TOO_MANY_BATCH_IDS",
+            f"At most {settings.extract_job_max_ids} batch IDs can be submitted per job",
+        )
+
+    manufacturers = {}
+    for start in range(0, len(batch_ids), settings.verify_batch_size):
+        chunk = batch_ids[start : start + settings.verify_batch_size]
+        manufacturers.update(
+            db.query(BatchModel.batch_id, BatchModel.manufacturer).filter(BatchModel.batch_id.in_(chunk)).all()
+        )
+
+    now = datetime.now(timezone.utc)
+    job = ExtractJobModel(
+        job_id=str(uuid4()),
+        status=ExtractJobStatus.QUEUED,
+        total=len(batch_ids),
+        force_refresh=payload.force_refresh,
+        created_at=now,
+    )
+    db.add(job)
+    # Unknown batches are recorded as failed items up front so they show up in the job report.
+    db.add_all(
+        [
+            ExtractJobItem(
+                job_id=job.job_id,
+                batch_id=batch_id,
+                manufacturer=manufacturers.get(batch_id, ""),
+                status=ExtractJobItemStatus.QUEUED if batch_id in manufacturers else ExtractJobItemStatus.FAILED,
+                attempts=0,
+                error=None if batch_id in manufacturers else f"Batch '{batch_id}' not found",
+                finished_at=None if batch_id in manufacturers else now,
+            )
+            for batch_id in batch_ids
+        ]
+    )
+    if not manufacturers:
+        job.status = ExtractJobStatus.COMPLETED
+        job.finished_at = now
+    db.commit()
+
+    queue = get_extract_job_queue()
+    queue.ensure_started()
+    queue.notify()
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=_to_extract_job(db, job).model_dump(mode="json", by_alias=True),
+        headers={"Location": f"/extract-jobs/{job.job_id}"},
+    )
+
+
+@router.get(
+    "/extract-jobs/{jobId}",
+    response_model=ExtractJob,
+    dependencies=[Depends(require_api_key)],
+)
+def get_extract_job(jobId: str, db: Session = Depends(get_db)) -> ExtractJob:
+    job = db.get(ExtractJobModel, jobId)
+    if not job:
+        raise_api_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Extract job '{jobId}' not found")
+    return _to_extract_job(db, job)
+
+
+def _to_extract_job(db: Session, job: ExtractJobModel) -> ExtractJob:
+    counts = dict(
+        db.query(ExtractJobItem.status, func.count(ExtractJobItem.item_id))
+        .filter(ExtractJobItem.job_id == job.job_id)
+        .group_by(ExtractJobItem.status)
+        .all()
+    )
+    succeeded = counts.get(ExtractJobItemStatus.SUCCEEDED, 0)
+    failed = counts.get(ExtractJobItemStatus.FAILED, 0)
+    failures = (
+        db.query(ExtractJobItem)
+        .filter(ExtractJobItem.job_id == job.job_id, ExtractJobItem.status == ExtractJobItemStatus.FAILED)
+        .order_by(ExtractJobItem.item_id)
+        .limit(_MAX_REPORTED_FAILURES)
+        .all()
+    )
+
+    return ExtractJob(
+        job_id=job.job_id,
+        status=job.status,
+        total=job.total,
+        force_refresh=job.force_refresh,
+        progress=ExtractJobProgress(
+            queued=counts.get(ExtractJobItemStatus.QUEUED, 0),
+            running=counts.get(ExtractJobItemStatus.RUNNING, 0),
+            succeeded=succeeded,
+            failed=failed,
+            percent_complete=round(100.0 * (succeeded + failed) / job.total, 2) if job.total else 100.0,
+        ),
+        items_per_second=_throughput(job, succeeded + failed),
+        failures=[
+            ExtractJobFailure(batch_id=item.batch_id, error=item.error, attempts=item.attempts) for item in failures
+        ],
+        created_at=_utc(job.created_at),
+        started_at=_utc(job.started_at),
+        finished_at=_utc(job.finished_at),
+    )
+
+
+def _throughput(job: ExtractJobModel, done: int) -> Optional[float]:
+    if job.started_at is None or not done:
+        return None
+    end = _utc(job.finished_at) or datetime.now(timezone.utc)
+    elapsed = (end - _utc(job.started_at)).total_seconds()
+    return round(done / elapsed, 3) if elapsed > 0 else None
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
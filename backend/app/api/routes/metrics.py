@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.ai.result_cache import get_result_cache
+from app.ai.text_cache import get_text_cache
+from app.chain.cache import get_attestation_cache
+from app.core.metrics import CONTENT_TYPE, render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    # Caches register themselves on first use; touch them so their counters are always exported.
+    get_attestation_cache()
+    get_text_cache()
+    get_result_cache()
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
@@ -1,54 +1,114 @@
+import json
+import logging
+from collections.abc import Iterator
+
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from web3 import Web3
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db, get_db
+from app.chain.cache import AttestationCache, get_attestation_cache
+from app.chain.calls import sync_chain_client
 from app.chain.deps import get_chain_client
-from app.chain.hashing import build_attestation_json, hash_attestation, hash_batch_id
-from app.core.errors import raise_api_error
+from app.chain.hashing import stored_attestation
+from app.chain.verification import abuild_verification_result, build_verification_results
+from app.core.config import settings
+from app.core.errors import error_response, raise_api_error
+from app.db.queries import acommit_backfill, aget_batch_with_extraction, commit_backfill
 from app.models.batch import Batch as BatchModel
 from app.models.extraction import Extraction as ExtractionModel
-from app.schemas.extraction import ExtractionResult
-from app.schemas.verify import VerificationResult
+from app.schemas.verify import BulkVerifyRequest, VerificationResult
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+@router.post("/batches/verify")
+def verify_batches(
+    payload: BulkVerifyRequest,
+    db: Session = Depends(get_db),
+    chain_client=Depends(get_chain_client),
+    cache: AttestationCache = Depends(get_attestation_cache),
+) -> StreamingResponse:
+    batch_ids = list(dict.fromkeys(payload.batch_ids))
+    if len(batch_ids) > settings.bulk_verify_max_ids:
+        raise_api_error(
+            status.HTTP_400_BAD_REQUEST,
+            "TOO_MANY_BATCH_IDS",
+            f"At most {settings.bulk_verify_max_ids} batch IDs can be verified per request",
+        )
+
+    chain_client = sync_chain_client(chain_client)
+
+    def stream() -> Iterator[str]:
+        # The injected session stays open until the response has been sent.
+        for start in range(0, len(batch_ids), settings.verify_batch_size):
+            chunk = batch_ids[start : start + settings.verify_batch_size]
+            try:
+                lines = _verify_chunk(db, chunk, chain_client, cache)
+            except Exception:
+                # The status line is already sent, so a failure is reported in-band instead of as a
+                # truncated 200: one final record naming the batches that were not verified.
+                logger.exception("Bulk verify failed")
+                db.rollback()
+                yield json.dumps(
+                    error_response(
+                        "VERIFY_FAILED",
+                        "Verification stopped before all batches were checked",
+                        {"unverifiedBatchIds": batch_ids[start:]},
+                    )
+                ) + "\n"
+                return
+            for line in lines:
+                yield json.dumps(line) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _verify_chunk(db: Session, batch_ids: list, chain_client, cache: AttestationCache) -> list:
+    rows = (
+        db.query(BatchModel, ExtractionModel)
+        .outerjoin(ExtractionModel, ExtractionModel.batch_id == BatchModel.batch_id)
+        .filter(BatchModel.batch_id.in_(batch_ids))
+        .all()
+    )
+    found = {batch.batch_id: (batch, extraction) for batch, extraction in rows}
+
+    verifiable = [
+        (batch, stored_attestation(batch, extraction)[1])
+        for batch, extraction in found.values()
+        if extraction is not None
+    ]
+    results = {result["batchId"]: result for result in build_verification_results(db, verifiable, chain_client, cache)}
+
+    lines = []
+    for batch_id in batch_ids:
+        if batch_id in results:
+            lines.append(VerificationResult.model_validate(results[batch_id]).model_dump(by_alias=True))
+        elif batch_id in found:
+            lines.append({"batchId": batch_id, **error_response("NOT_FOUND", "Resource not found")})
+        else:
+            lines.append({"batchId": batch_id, **error_response("BATCH_NOT_FOUND", f"Batch '{batch_id}' not found")})
+    commit_backfill(db)
+    return lines
+
+
 @router.get("/batches/{batchId}/verify", response_model=VerificationResult)
-def verify_batch(
+async def verify_batch(
     batchId: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     chain_client=Depends(get_chain_client),
+    cache: AttestationCache = Depends(get_attestation_cache),
 ) -> dict:
-    batch = db.get(BatchModel, batchId)
+    batch, extraction = await aget_batch_with_extraction(db, batchId)
     if not batch:
         raise_api_error(status.HTTP_404_NOT_FOUND, "BATCH_NOT_FOUND", f"Batch '{batchId}' not found")
-
-    extraction = db.get(ExtractionModel, batchId)
     if not extraction:
         raise_api_error(status.HTTP_404_NOT_FOUND, "NOT_FOUND", "Resource not found")
 
-    extraction_result = ExtractionResult.model_validate(extraction.extracted_fields)
-    batch_id_hash = hash_batch_id(batch.batch_id)
-    canonical_json = build_attestation_json(batch, extraction_result, extraction.document_fingerprint)
-    offchain_hash = hash_attestation(canonical_json)
-    onchain_hash = chain_client.get(batch_id_hash)
-
-    offchain_hex = Web3.to_hex(offchain_hash)
-    onchain_hex = Web3.to_hex(onchain_hash) if onchain_hash else None
-
-    verified = onchain_hash is not None and offchain_hash == onchain_hash
-    mismatch_reason = None
-    if onchain_hash is None:
-        mismatch_reason = "No on-chain attestation found for this batch"
-    elif offchain_hash != onchain_hash:
-        mismatch_reason = "Hash mismatch: off-chain and on-chain hashes do not match"
-
-    return {
-        "verified": verified,
-        "batchId": batch.batch_id,
-        "offchainHash": offchain_hex,
-        "onchainHash": onchain_hex,
-        "txHash": batch.tx_hash,
-        "mismatchReason": mismatch_reason,
-    }
+    _canonical_json, offchain_hash = stored_attestation(batch, extraction)
+    result = await abuild_verification_result(db, batch, offchain_hash, chain_client, cache)
+    await acommit_backfill(db)
+    return result
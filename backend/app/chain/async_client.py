@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional, Sequence
+
+from app.chain.calls import call_chain
+from app.chain.client import (
+    _KNOWN_TX_ERRORS,
+    _MINIMAL_ABI,
+    _NONCE_ERRORS,
+    BatchHashRegistryClient,
+    ChainReceipt,
+    MockBatchHashRegistryClient,
+    _error_matches,
+)
+from app.chain.fees import Fees
+from app.chain.publishers import Publisher
+from app.chain.rpc_pool import async_failover_provider, get_rpc_pool
+from app.core.config import settings
+from app.core.metrics import instrument_async_rpc_provider, timed_stage
+
+
+class AsyncBatchHashRegistryClient:
+    # AsyncWeb3 implementation of the request-path surface (publish / get / get_receipt). Account,
+    # nonce tracking and the blocking surface used by background workers are shared with `sync`, so
+    # both clients hand out nonces from the same sequence.
+    def __init__(self, sync: BatchHashRegistryClient) -> None:
+        from web3 import AsyncWeb3
+
+        self.sync = sync
+        self.w3 = AsyncWeb3(async_failover_provider(get_rpc_pool()))
+        instrument_async_rpc_provider(self.w3.provider)
+        self.contract = self.w3.eth.contract(
+            address=self.w3.to_checksum_address(settings.contract_address),
+            abi=_MINIMAL_ABI,
+        )
+        self.chain_id = settings.chain_id
+        self._session = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def publisher_address(self) -> str:
+        return self.sync.publisher_address
+
+    def publisher_for(self, tx_hash: str) -> str:
+        return self.sync.publisher_for(tx_hash)
+
+    async def _ensure_session(self) -> None:
+        # One pooled aiohttp session per event loop; web3 would otherwise manage its own per thread.
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is loop and not self._session.closed:
+            return
+        import aiohttp
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=settings.chain_max_connections),
+            timeout=aiohttp.ClientTimeout(total=settings.chain_rpc_timeout),
+        )
+        self._session_loop = loop
+        await self.w3.provider.cache_async_session(self._session)
+
+    async def aclose(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def publish(self, batch_id_hash: bytes, attestation_hash: bytes) -> str:
+        return await self._send(self.contract.functions.publish(batch_id_hash, attestation_hash))
+
+    async def publish_root(self, root: bytes) -> str:
+        return await self._send(self.contract.functions.publishRoot(root))
+
+    async def _send(self, function) -> str:
+        await self._ensure_session()
+        with self.sync._get_publishers().lease() as publisher:
+            nonces = publisher.nonces
+            for attempt in range(2):
+                if not nonces.initialized:
+                    nonces.seed(await self.w3.eth.get_transaction_count(publisher.address, "pending"))
+                nonce = nonces.reserve()
+                try:
+                    fees = self.sync.fees
+                    gas = await fees.agas_limit(
+                        function.fn_name, lambda: function.estimate_gas({"from": publisher.address})
+                    )
+                    tx = await function.build_transaction(
+                        {
+                            "from": publisher.address,
+                            "nonce": nonce,
+                            "gas": gas,
+                            "chainId": self.chain_id,
+                            **await fees.afees(self._fetch_fees),
+                        }
+                    )
+                    tx_hash = await self._broadcast(tx, publisher)
+                except Exception as exc:
+                    nonces.release(nonce)
+                    if attempt == 0 and _error_matches(exc, _NONCE_ERRORS):
+                        await call_chain(self.sync.resync_nonces, publisher)
+                        continue
+                    raise
+                nonces.track(nonce, tx_hash, tx)
+                return tx_hash
+        raise RuntimeError("NONCE_RESYNC_FAILED")
+
+    async def _fetch_fees(self) -> Fees:
+        if not settings.chain_eip1559:
+            return {"gasPrice": await self.w3.eth.gas_price}
+        block = await self.w3.eth.get_block("latest")
+        self.sync.fees.note_block(block["number"])
+        tip = await self.w3.eth.max_priority_fee
+        return {"maxFeePerGas": 2 * block["baseFeePerGas"] + tip, "maxPriorityFeePerGas": tip}
+
+    async def _broadcast(self, tx: dict, publisher: Publisher) -> str:
+        signed = self.w3.eth.account.sign_transaction(tx, publisher.account.key)
+        raw_tx = getattr(signed, "rawTransaction", None) or signed.raw_transaction
+        try:
+            tx_hash = await self.w3.eth.send_raw_transaction(raw_tx)
+        except Exception as exc:
+            if not _error_matches(exc, _KNOWN_TX_ERRORS):
+                raise
+            tx_hash = signed.hash
+        return self.w3.to_hex(tx_hash)
+
+    @timed_stage("receipt_wait")
+    async def get_receipt(self, tx_hash: str) -> ChainReceipt:
+        from web3.exceptions import TimeExhausted
+
+        await self._ensure_session()
+        nonces = self.sync._nonces_for(tx_hash)
+        for _ in range(settings.tx_max_replacements + 1):
+            current = nonces.resolve(tx_hash) if nonces else tx_hash
+            try:
+                receipt = await self.w3.eth.wait_for_transaction_receipt(current, timeout=settings.tx_stuck_seconds)
+            except TimeExhausted:
+                await call_chain(self.sync.replace_if_stuck, tx_hash)
+                continue
+            mined_hash = self.w3.to_hex(receipt["transactionHash"])
+            if nonces:
+                nonces.confirm(mined_hash)
+            self.sync.fees.note_block(receipt["blockNumber"])
+            return ChainReceipt(
+                tx_hash=mined_hash,
+                block_number=receipt["blockNumber"],
+                success=receipt.get("status", 1) == 1,
+            )
+        raise RuntimeError("TX_NOT_MINED")
+
+    async def get(self, batch_id_hash: bytes) -> Optional[bytes]:
+        await self._ensure_session()
+        result = await self.contract.functions.get(batch_id_hash).call()
+        return None if result == b"\x00" * 32 else result
+
+    async def get_many(self, batch_id_hashes: Sequence[bytes]) -> List[Optional[bytes]]:
+        from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+
+        await self._ensure_session()
+        if self.sync.supports_get_many:
+            chunks = [
+                list(batch_id_hashes[start : start + settings.verify_batch_size])
+                for start in range(0, len(batch_id_hashes), settings.verify_batch_size)
+            ]
+            # Chunks are independent view calls, so they go out concurrently.
+            try:
+                responses = await asyncio.gather(*(self.contract.functions.getMany(chunk).call() for chunk in chunks))
+            except (BadFunctionCallOutput, ContractLogicError):
+                self.sync.supports_get_many = False
+            else:
+                return [None if value == b"\x00" * 32 else value for hashes in responses for value in hashes]
+        return list(await asyncio.gather(*(self.get(batch_id_hash) for batch_id_hash in batch_id_hashes)))
+
+    async def get_root(self, root: bytes) -> Optional[int]:
+        await self._ensure_session()
+        anchored_at = await self.contract.functions.getRoot(root).call()
+        return anchored_at or None
+
+
+class AsyncMockBatchHashRegistryClient:
+    # Coroutine wrapper around the in-memory mock, for tests and CHAIN_MODE=mock with the async client.
+    def __init__(self, sync: Optional[MockBatchHashRegistryClient] = None) -> None:
+        self.sync = sync or MockBatchHashRegistryClient()
+
+    @property
+    def publisher_address(self) -> str:
+        return self.sync.publisher_address
+
+    def publisher_for(self, tx_hash: str) -> str:
+        return self.sync.publisher_for(tx_hash)
+
+    async def aclose(self) -> None:
+        return None
+
+    async def publish(self, batch_id_hash: bytes, attestation_hash: bytes) -> str:
+        return self.sync.publish(batch_id_hash, attestation_hash)
+
+    async def publish_root(self, root: bytes) -> str:
+        return self.sync.publish_root(root)
+
+    async def get_receipt(self, tx_hash: str) -> ChainReceipt:
+        return self.sync.get_receipt(tx_hash)
+
+    async def get(self, batch_id_hash: bytes) -> Optional[bytes]:
+        return self.sync.get(batch_id_hash)
+
+    async def get_many(self, batch_id_hashes: Sequence[bytes]) -> List[Optional[bytes]]:
+        return self.sync.get_many(batch_id_hashes)
+
+    async def get_root(self, root: bytes) -> Optional[int]:
+        return self.sync.get_root(root)
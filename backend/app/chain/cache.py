@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from functools import lru_cache
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.chain.calls import call_chain
+from app.core.cache import LRUCache, register_cache
+from app.core.config import settings
+
+
+class AttestationCache:
+    # The registry is write-once, so a stored hash never changes and can be kept for a long time.
+    # Misses are only trusted until the TTL runs out or a newer block is observed.
+    def __init__(self, maxsize: int, positive_ttl: float, negative_ttl: float) -> None:
+        self._cache: LRUCache[Tuple[Any, int]] = LRUCache(maxsize=maxsize)
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._head = 0
+        self._lock = threading.Lock()
+
+    def get_attestation(self, chain_client, batch_id_hash: bytes) -> Optional[bytes]:
+        return self._lookup(("get", batch_id_hash), chain_client.get, batch_id_hash)
+
+    def get_many_attestations(self, chain_client, batch_id_hashes: Sequence[bytes]) -> List[Optional[bytes]]:
+        results: Dict[bytes, Optional[bytes]] = {}
+        missing: List[bytes] = []
+        for batch_id_hash in batch_id_hashes:
+            entry = self._cache.get(("get", batch_id_hash), is_valid=self._is_fresh)
+            if entry is None:
+                missing.append(batch_id_hash)
+            else:
+                results[batch_id_hash] = entry[0]
+        if missing:
+            head = self._head
+            for batch_id_hash, value in zip(missing, chain_client.get_many(missing)):
+                self.store(("get", batch_id_hash), value, head)
+                results[batch_id_hash] = value
+        return [results[batch_id_hash] for batch_id_hash in batch_id_hashes]
+
+    def get_root(self, chain_client, root: bytes) -> Optional[int]:
+        return self._lookup(("root", root), chain_client.get_root, root)
+
+    def _lookup(self, key, fetch, argument):
+        entry = self._cache.get(key, is_valid=self._is_fresh)
+        if entry is not None:
+            return entry[0]
+        head = self._head
+        value = fetch(argument)
+        self.store(key, value, head)
+        return value
+
+    async def aget_attestation(self, chain_client, batch_id_hash: bytes) -> Optional[bytes]:
+        return await self._alookup(("get", batch_id_hash), chain_client.get, batch_id_hash)
+
+    async def aget_root(self, chain_client, root: bytes) -> Optional[int]:
+        return await self._alookup(("root", root), chain_client.get_root, root)
+
+    async def _alookup(self, key, fetch, argument):
+        # Hits are answered on the event loop; misses await an async client or use a worker thread.
+        entry = self._cache.get(key, is_valid=self._is_fresh)
+        if entry is not None:
+            return entry[0]
+        head = self._head
+        value = await call_chain(fetch, argument)
+        self.store(key, value, head)
+        return value
+
+    def _is_fresh(self, entry: Tuple[Any, int]) -> bool:
+        value, observed_block = entry
+        return value is not None or observed_block >= self._head
+
+    def store(self, key, value, observed_block: Optional[int] = None) -> None:
+        ttl = self.positive_ttl if value is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        block = self._head if observed_block is None else observed_block
+        self._cache.set(key, (value, block), ttl_seconds=ttl)
+
+    def invalidate(self, batch_id_hash: bytes) -> None:
+        self._cache.pop(("get", batch_id_hash))
+
+    def invalidate_root(self, root: bytes) -> None:
+        self._cache.pop(("root", root))
+
+    def note_block(self, block_number: int) -> None:
+        with self._lock:
+            if block_number > self._head:
+                self._head = block_number
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._head = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "headBlock": self._head}
+
+
+@lru_cache(maxsize=1)
+def get_attestation_cache() -> AttestationCache:
+    cache = AttestationCache(
+        maxsize=settings.verify_cache_size,
+        positive_ttl=settings.verify_cache_positive_ttl,
+        negative_ttl=settings.verify_cache_negative_ttl,
+    )
+    register_cache("attestations", cache)
+    return cache
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import inspect
+from typing import Any, Callable
+
+from starlette.concurrency import run_in_threadpool
+
+
+async def call_chain(method: Callable, *args: Any) -> Any:
+    # Chain clients are either async (awaited on the loop) or blocking (moved to the threadpool).
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await run_in_threadpool(method, *args)
+
+
+def sync_chain_client(chain_client):
+    # Background workers and sync routes need the blocking surface; async clients carry it as `sync`.
+    return getattr(chain_client, "sync", chain_client)
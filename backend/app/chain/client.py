@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import threading
 import time
-from typing import Optional
-
-from web3 import Web3
+from typing import Dict, List, Optional, Sequence
 
+from app.chain.fees import Fees, bumped_fees, new_fee_oracle
+from app.chain.hashing import keccak_text, to_hex
+from app.chain.nonce import NonceManager
+from app.chain.publishers import Publisher, PublisherPool, configured_private_keys
+from app.chain.rpc_pool import configured_rpc_urls, failover_provider, get_rpc_pool
 from app.core.config import settings
+from app.core.metrics import instrument_rpc_provider, timed_stage
 
 
 _MINIMAL_ABI = [
@@ -27,6 +32,38 @@ _MINIMAL_ABI = [
         "stateMutability": "view",
         "type": "function",
     },
+    {
+        "inputs": [{"internalType": "bytes32[]", "name": "batchIdHashes", "type": "bytes32[]"}],
+        "name": "getMany",
+        "outputs": [{"internalType": "bytes32[]", "name": "hashes", "type": "bytes32[]"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [{"internalType": "bytes32", "name": "root", "type": "bytes32"}],
+        "name": "publishRoot",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "internalType": "bytes32", "name": "batchIdHash", "type": "bytes32"},
+            {"indexed": False, "internalType": "bytes32", "name": "attestationHash", "type": "bytes32"},
+            {"indexed": False, "internalType": "address", "name": "publisher", "type": "address"},
+            {"indexed": False, "internalType": "uint256", "name": "timestamp", "type": "uint256"},
+        ],
+        "name": "Published",
+        "type": "event",
+    },
+    {
+        "inputs": [{"internalType": "bytes32", "name": "root", "type": "bytes32"}],
+        "name": "getRoot",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
 ]
 
 
@@ -34,56 +71,286 @@ _MINIMAL_ABI = [
 class ChainReceipt:
     tx_hash: str
     block_number: int
+    success: bool = True
+
+
+@dataclass
+class PublishedEvent:
+    batch_id_hash: bytes
+    attestation_hash: bytes
+    publisher: str
+    timestamp: int
+    block_number: int
+    block_hash: str
+    tx_hash: str
+    log_index: int
+
+
+_NONCE_ERRORS = ("nonce too low", "nonce too high", "invalid nonce", "replacement transaction underpriced")
+_KNOWN_TX_ERRORS = ("already known", "known transaction", "already imported")
+
+
+def _error_matches(exc: Exception, fragments: tuple) -> bool:
+    message = str(exc).lower()
+    return any(fragment in message for fragment in fragments)
 
 
 class BatchHashRegistryClient:
     def __init__(self) -> None:
-        if not settings.chain_rpc_url or not settings.contract_address:
+        if not configured_rpc_urls() or not settings.contract_address:
             raise RuntimeError("CHAIN_RPC_URL and CONTRACT_ADDRESS must be set")
         if not settings.chain_id:
             raise RuntimeError("CHAIN_ID must be set")
 
-        self.w3 = Web3(Web3.HTTPProvider(settings.chain_rpc_url))
+        # web3 is imported on first use so processes that never talk to the chain do not pay for it.
+        from web3 import Web3
+
+        self.w3 = Web3(failover_provider(get_rpc_pool()))
+        instrument_rpc_provider(self.w3.provider)
         self.contract = self.w3.eth.contract(
             address=self.w3.to_checksum_address(settings.contract_address),
             abi=_MINIMAL_ABI,
         )
         self.chain_id = settings.chain_id
-        self._account = None
+        self.fees = new_fee_oracle()
+        # Cleared the first time the registry rejects getMany; shared with the async client.
+        self.supports_get_many = True
+        self._publishers: Optional[PublisherPool] = None
+        self._lock = threading.Lock()
 
     @property
     def publisher_address(self) -> str:
-        account = self._get_account()
-        return account.address
+        return self._get_publishers().primary.address
+
+    def publisher_for(self, tx_hash: str) -> str:
+        # The key that sent `tx_hash` (or a replacement of it), while it is still pending.
+        publisher = self._get_publishers().for_tx(tx_hash)
+        return publisher.address if publisher else self.publisher_address
+
+    def publisher_stats(self) -> List[dict]:
+        return self._get_publishers().stats()
 
-    def _get_account(self):
-        if self._account is None:
-            if not settings.publisher_private_key:
-                raise RuntimeError("PUBLISHER_PRIVATE_KEY must be set")
-            self._account = self.w3.eth.account.from_key(settings.publisher_private_key)
-        return self._account
+    def _get_publishers(self) -> PublisherPool:
+        with self._lock:
+            if self._publishers is None:
+                publishers = []
+                for key in configured_private_keys():
+                    account = self.w3.eth.account.from_key(key)
+                    publishers.append(Publisher(account, NonceManager(self._nonce_fetcher(account.address))))
+                self._publishers = PublisherPool(publishers)
+            return self._publishers
+
+    def _nonce_fetcher(self, address: str):
+        return lambda block: self.w3.eth.get_transaction_count(address, block)
+
+    def _nonces_for(self, tx_hash: str) -> Optional[NonceManager]:
+        publisher = self._get_publishers().for_tx(tx_hash)
+        return publisher.nonces if publisher else None
 
     def publish(self, batch_id_hash: bytes, attestation_hash: bytes) -> str:
-        account = self._get_account()
-        nonce = self.w3.eth.get_transaction_count(account.address)
-        gas_price = self.w3.eth.gas_price
-        tx = self.contract.functions.publish(batch_id_hash, attestation_hash).build_transaction(
-            {
-                "from": account.address,
-                "nonce": nonce,
-                "gasPrice": gas_price,
-                "chainId": self.chain_id,
-            }
-        )
-        tx.setdefault("gas", self.w3.eth.estimate_gas(tx))
-        signed = self.w3.eth.account.sign_transaction(tx, account.key)
+        return self._send(self.contract.functions.publish(batch_id_hash, attestation_hash))
+
+    def publish_root(self, root: bytes) -> str:
+        return self._send(self.contract.functions.publishRoot(root))
+
+    def _send(self, function) -> str:
+        with self._get_publishers().lease() as publisher:
+            nonces = publisher.nonces
+            for attempt in range(2):
+                nonce = nonces.reserve()
+                try:
+                    # With nonce, fees and gas all known locally, building the transaction needs no RPC.
+                    gas = self.fees.gas_limit(
+                        function.fn_name, lambda: function.estimate_gas({"from": publisher.address})
+                    )
+                    tx = function.build_transaction(
+                        {
+                            "from": publisher.address,
+                            "nonce": nonce,
+                            "gas": gas,
+                            "chainId": self.chain_id,
+                            **self.fees.fees(self._fetch_fees),
+                        }
+                    )
+                    tx_hash = self._broadcast(tx, publisher)
+                except Exception as exc:
+                    nonces.release(nonce)
+                    if attempt == 0 and _error_matches(exc, _NONCE_ERRORS):
+                        # Another writer used this key or the node restarted; realign and retry once.
+                        self._resync(publisher)
+                        continue
+                    raise
+                nonces.track(nonce, tx_hash, tx)
+                return tx_hash
+        raise RuntimeError("NONCE_RESYNC_FAILED")
+
+    def _fetch_fees(self) -> Fees:
+        if not settings.chain_eip1559:
+            return {"gasPrice": self.w3.eth.gas_price}
+        block = self.w3.eth.get_block("latest")
+        self.fees.note_block(block["number"])
+        tip = self.w3.eth.max_priority_fee
+        return {"maxFeePerGas": 2 * block["baseFeePerGas"] + tip, "maxPriorityFeePerGas": tip}
+
+    def _broadcast(self, tx: dict, publisher: Publisher) -> str:
+        signed = self.w3.eth.account.sign_transaction(tx, publisher.account.key)
         raw_tx = getattr(signed, "rawTransaction", None) or signed.raw_transaction
-        tx_hash = self.w3.eth.send_raw_transaction(raw_tx)
+        try:
+            tx_hash = self.w3.eth.send_raw_transaction(raw_tx)
+        except Exception as exc:
+            if not _error_matches(exc, _KNOWN_TX_ERRORS):
+                raise
+            tx_hash = signed.hash
         return self.w3.to_hex(tx_hash)
 
+    def resync_nonces(self, publisher: Optional[Publisher] = None) -> List[str]:
+        publishers = [publisher] if publisher else self._get_publishers().publishers
+        rebroadcast = []
+        for current in publishers:
+            rebroadcast.extend(self._resync(current))
+        return rebroadcast
+
+    def _resync(self, publisher: Publisher) -> List[str]:
+        return [self._broadcast(pending.tx, publisher) for pending in publisher.nonces.resync()]
+
+    def replace_stuck_transactions(self, older_than_seconds: Optional[float] = None) -> List[str]:
+        threshold = settings.tx_stuck_seconds if older_than_seconds is None else older_than_seconds
+        replaced = []
+        for publisher in self._get_publishers().publishers:
+            # Keys without stuck transactions are left alone; each key's sequence is independent.
+            if publisher.nonces.stuck(threshold):
+                replaced.extend(self._replace_stuck(publisher, threshold))
+        return replaced
+
+    def replace_if_stuck(self, tx_hash: str) -> List[str]:
+        # Replaces only the transaction a caller is waiting on (if it is still stuck), so concurrent
+        # receipt waits on one key do not each replace all of its transactions.
+        publisher = self._get_publishers().for_tx(tx_hash)
+        if publisher is None:
+            return []
+        return self._replace_stuck(publisher, settings.tx_stuck_seconds, publisher.nonces.nonce_of(tx_hash))
+
+    def _replace_stuck(self, publisher: Publisher, threshold: float, only_nonce: Optional[int] = None) -> List[str]:
+        with publisher.replacing:
+            return self._replace_stuck_locked(publisher, threshold, only_nonce)
+
+    def _replace_stuck_locked(self, publisher: Publisher, threshold: float, only_nonce: Optional[int]) -> List[str]:
+        from web3.exceptions import TransactionNotFound
+
+        nonces = publisher.nonces
+        self._resync(publisher)
+        replaced = []
+        for pending in nonces.stuck(threshold):
+            if only_nonce is not None and pending.nonce != only_nonce:
+                continue
+            try:
+                self.w3.eth.get_transaction_receipt(pending.tx_hash)
+            except TransactionNotFound:
+                pass
+            else:
+                nonces.confirm(pending.tx_hash)
+                continue
+            self.fees.invalidate_fees()
+            tx = {**pending.tx, **bumped_fees(pending.tx, self.fees.fees(self._fetch_fees))}
+            tx_hash = self._broadcast(tx, publisher)
+            nonces.replace(pending.nonce, tx_hash, tx)
+            replaced.append(tx_hash)
+        return replaced
+
+    @timed_stage("receipt_wait")
     def get_receipt(self, tx_hash: str) -> ChainReceipt:
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-        return ChainReceipt(tx_hash=self.w3.to_hex(receipt["transactionHash"]), block_number=receipt["blockNumber"])
+        from web3.exceptions import TimeExhausted
+
+        nonces = self._nonces_for(tx_hash)
+        for _ in range(settings.tx_max_replacements + 1):
+            current = nonces.resolve(tx_hash) if nonces else tx_hash
+            try:
+                receipt = self.w3.eth.wait_for_transaction_receipt(current, timeout=settings.tx_stuck_seconds)
+            except TimeExhausted:
+                self.replace_if_stuck(tx_hash)
+                continue
+            mined_hash = self.w3.to_hex(receipt["transactionHash"])
+            if nonces:
+                nonces.confirm(mined_hash)
+            self.fees.note_block(receipt["blockNumber"])
+            return ChainReceipt(
+                tx_hash=mined_hash,
+                block_number=receipt["blockNumber"],
+                success=receipt.get("status", 1) == 1,
+            )
+        raise RuntimeError("TX_NOT_MINED")
+
+    def get_receipts(self, tx_hashes: Sequence[str]) -> Dict[str, Optional[ChainReceipt]]:
+        owners = {tx_hash: self._nonces_for(tx_hash) for tx_hash in tx_hashes}
+        resolved = {tx_hash: nonces.resolve(tx_hash) if nonces else tx_hash for tx_hash, nonces in owners.items()}
+        receipts: Dict[str, Optional[ChainReceipt]] = {}
+        hashes = list(resolved)
+        for start in range(0, len(hashes), settings.receipt_batch_size):
+            chunk = hashes[start : start + settings.receipt_batch_size]
+            responses = self.w3.provider.make_batch_request(
+                [("eth_getTransactionReceipt", [resolved[tx_hash]]) for tx_hash in chunk]
+            )
+            if not isinstance(responses, list):
+                raise RuntimeError(f"Receipt batch request failed: {responses.get('error')}")
+            for tx_hash, response in zip(chunk, responses):
+                raw = response.get("result")
+                if not raw:
+                    receipts[tx_hash] = None
+                    continue
+                mined_hash = raw["transactionHash"]
+                if owners[tx_hash]:
+                    owners[tx_hash].confirm(mined_hash)
+                receipts[tx_hash] = ChainReceipt(
+                    tx_hash=mined_hash,
+                    block_number=int(raw["blockNumber"], 16),
+                    success=int(raw.get("status", "0x1"), 16) == 1,
+                )
+        return receipts
+
+    def get_block_number(self) -> int:
+        block_number = self.w3.eth.block_number
+        self.fees.note_block(block_number)
+        return block_number
+
+    def get_block_hash(self, block_number: int) -> Optional[str]:
+        try:
+            block = self.w3.eth.get_block(block_number)
+        except Exception:
+            return None
+        return self.w3.to_hex(block["hash"])
+
+    def get_published_events(self, from_block: int, to_block: int) -> List[PublishedEvent]:
+        return self._published_events({"fromBlock": from_block, "toBlock": to_block})
+
+    def find_published_event(self, batch_id_hash: bytes) -> Optional[PublishedEvent]:
+        # batchIdHash is an indexed topic, so the node filters the logs; the latest publish wins.
+        events = self._published_events(
+            {"fromBlock": settings.indexer_start_block, "toBlock": "latest"}, to_hex(batch_id_hash)
+        )
+        return events[-1] if events else None
+
+    def _published_events(self, block_range: dict, batch_id_topic: Optional[str] = None) -> List[PublishedEvent]:
+        event = self.contract.events.Published()
+        topics = [self.w3.to_hex(self.w3.keccak(text="Published(bytes32,bytes32,address,uint256)"))]
+        if batch_id_topic:
+            topics.append(batch_id_topic)
+        logs = self.w3.eth.get_logs({"address": self.contract.address, **block_range, "topics": topics})
+        events = []
+        for log in logs:
+            decoded = event.process_log(log)
+            events.append(
+                PublishedEvent(
+                    batch_id_hash=decoded["args"]["batchIdHash"],
+                    attestation_hash=decoded["args"]["attestationHash"],
+                    publisher=decoded["args"]["publisher"],
+                    timestamp=decoded["args"]["timestamp"],
+                    block_number=log["blockNumber"],
+                    block_hash=self.w3.to_hex(log["blockHash"]),
+                    tx_hash=self.w3.to_hex(log["transactionHash"]),
+                    log_index=log["logIndex"],
+                )
+            )
+        return events
 
     def get(self, batch_id_hash: bytes) -> Optional[bytes]:
         result = self.contract.functions.get(batch_id_hash).call()
@@ -91,17 +358,47 @@ class BatchHashRegistryClient:
             return None
         return result
 
+    def get_many(self, batch_id_hashes: Sequence[bytes]) -> List[Optional[bytes]]:
+        from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+
+        if not self.supports_get_many:
+            return [self.get(batch_id_hash) for batch_id_hash in batch_id_hashes]
+        results: List[Optional[bytes]] = []
+        try:
+            for start in range(0, len(batch_id_hashes), settings.verify_batch_size):
+                chunk = list(batch_id_hashes[start : start + settings.verify_batch_size])
+                hashes = self.contract.functions.getMany(chunk).call()
+                results.extend(None if value == b"\x00" * 32 else value for value in hashes)
+        except (BadFunctionCallOutput, ContractLogicError):
+            # Registries deployed before getMany existed revert on it; read one hash at a time instead.
+            self.supports_get_many = False
+            return [self.get(batch_id_hash) for batch_id_hash in batch_id_hashes]
+        return results
+
+    def get_root(self, root: bytes) -> Optional[int]:
+        anchored_at = self.contract.functions.getRoot(root).call()
+        return anchored_at or None
+
 
 class MockBatchHashRegistryClient:
     def __init__(self) -> None:
         self._store: dict[bytes, bytes] = {}
         self._receipts: dict[str, ChainReceipt] = {}
         self._tx_by_batch: dict[bytes, str] = {}
+        self._roots: dict[bytes, int] = {}
+        self._events: list[PublishedEvent] = []
+        self._block_number = 0
 
     @property
     def publisher_address(self) -> str:
         return "0x0000000000000000000000000000000000000000"
 
+    def publisher_for(self, tx_hash: str) -> str:
+        return self.publisher_address
+
+    def publisher_stats(self) -> List[dict]:
+        return [{"address": self.publisher_address, "healthy": True, "inFlight": 0, "stuck": 0}]
+
     def publish(self, batch_id_hash: bytes, attestation_hash: bytes) -> str:
         if batch_id_hash == b"\x00" * 32 or attestation_hash == b"\x00" * 32:
             raise RuntimeError("Invalid hash values")
@@ -110,21 +407,76 @@ class MockBatchHashRegistryClient:
                 existing_tx = self._tx_by_batch.get(batch_id_hash)
                 if existing_tx:
                     return existing_tx
-                tx_hash = Web3.to_hex(
-                    Web3.keccak(text=f"{batch_id_hash.hex()}:{attestation_hash.hex()}:repeat")
-                )
-                self._receipts[tx_hash] = ChainReceipt(tx_hash=tx_hash, block_number=1)
+                tx_hash = to_hex(keccak_text(f"{batch_id_hash.hex()}:{attestation_hash.hex()}:repeat"))
+                self._receipts[tx_hash] = ChainReceipt(tx_hash=tx_hash, block_number=self.mine_blocks())
                 self._tx_by_batch[batch_id_hash] = tx_hash
                 return tx_hash
             raise RuntimeError("ALREADY_PUBLISHED")
         self._store[batch_id_hash] = attestation_hash
-        tx_hash = Web3.to_hex(Web3.keccak(text=f"{batch_id_hash.hex()}:{attestation_hash.hex()}:{time.time()}"))
-        self._receipts[tx_hash] = ChainReceipt(tx_hash=tx_hash, block_number=1)
+        tx_hash = to_hex(keccak_text(f"{batch_id_hash.hex()}:{attestation_hash.hex()}:{time.time()}"))
+        block_number = self.mine_blocks()
+        self._receipts[tx_hash] = ChainReceipt(tx_hash=tx_hash, block_number=block_number)
         self._tx_by_batch[batch_id_hash] = tx_hash
+        self._events.append(
+            PublishedEvent(
+                batch_id_hash=batch_id_hash,
+                attestation_hash=attestation_hash,
+                publisher=self.publisher_address,
+                timestamp=int(time.time()),
+                block_number=block_number,
+                block_hash=self.get_block_hash(block_number),
+                tx_hash=tx_hash,
+                log_index=0,
+            )
+        )
         return tx_hash
 
     def get_receipt(self, tx_hash: str) -> ChainReceipt:
         return self._receipts.get(tx_hash, ChainReceipt(tx_hash=tx_hash, block_number=1))
 
+    def get_receipts(self, tx_hashes: Sequence[str]) -> Dict[str, Optional[ChainReceipt]]:
+        return {tx_hash: self._receipts.get(tx_hash) for tx_hash in tx_hashes}
+
+    def get_block_number(self) -> int:
+        return self._block_number
+
+    def get_block_hash(self, block_number: int) -> Optional[str]:
+        if block_number > self._block_number:
+            return None
+        return to_hex(keccak_text(f"block:{block_number}"))
+
+    def get_published_events(self, from_block: int, to_block: int) -> List[PublishedEvent]:
+        return [event for event in self._events if from_block <= event.block_number <= to_block]
+
+    def find_published_event(self, batch_id_hash: bytes) -> Optional[PublishedEvent]:
+        events = [event for event in self._events if event.batch_id_hash == batch_id_hash]
+        return events[-1] if events else None
+
+    def mine_blocks(self, count: int = 1) -> int:
+        self._block_number += count
+        return self._block_number
+
+    def replace_stuck_transactions(self, older_than_seconds: Optional[float] = None) -> List[str]:
+        return []
+
+    def replace_if_stuck(self, tx_hash: str) -> List[str]:
+        return []
+
     def get(self, batch_id_hash: bytes) -> Optional[bytes]:
         return self._store.get(batch_id_hash)
+
+    def get_many(self, batch_id_hashes: Sequence[bytes]) -> List[Optional[bytes]]:
+        return [self._store.get(batch_id_hash) for batch_id_hash in batch_id_hashes]
+
+    def publish_root(self, root: bytes) -> str:
+        if root == b"\x00" * 32:
+            raise RuntimeError("Invalid hash values")
+        if root in self._roots:
+            raise RuntimeError("ALREADY_PUBLISHED")
+        self._roots[root] = int(time.time())
+        tx_hash = to_hex(keccak_text(f"{root.hex()}:root"))
+        self._receipts[tx_hash] = ChainReceipt(tx_hash=tx_hash, block_number=self.mine_blocks())
+        return tx_hash
+
+    def get_root(self, root: bytes) -> Optional[int]:
+        return self._roots.get(root)
@@ -5,7 +5,19 @@ from app.core.config import settings
 
 
 @lru_cache(maxsize=1)
-def get_chain_client() -> BatchHashRegistryClient:
+def get_sync_chain_client() -> BatchHashRegistryClient:
     if settings.chain_mode.lower() == "mock":
         return MockBatchHashRegistryClient()
     return BatchHashRegistryClient()
+
+
+@lru_cache(maxsize=1)
+def get_chain_client():
+    client = get_sync_chain_client()
+    if not settings.chain_async_client:
+        return client
+    from app.chain.async_client import AsyncBatchHashRegistryClient, AsyncMockBatchHashRegistryClient
+
+    if isinstance(client, MockBatchHashRegistryClient):
+        return AsyncMockBatchHashRegistryClient(client)
+    return AsyncBatchHashRegistryClient(client)
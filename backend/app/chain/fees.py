@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.core.cache import LRUCache, register_cache
+from app.core.config import settings
+
+Fees = Dict[str, int]
+
+
+class FeeOracle:
+    # Fee parameters are cached until a newer block is observed (or FEE_CACHE_SECONDS pass), and gas
+    # limits per contract function for FEE_GAS_LIMIT_TTL: a publish writes the same two storage slots
+    # every time, so its estimate barely moves.
+    def __init__(self) -> None:
+        self._cache: LRUCache[Tuple[Any, int]] = LRUCache(maxsize=64)
+        self._head = 0
+        self._lock = threading.Lock()
+
+    def fees(self, fetch: Callable[[], Fees]) -> Fees:
+        entry = self._cache.get("fees", is_valid=self._is_fresh)
+        if entry is not None:
+            return entry[0]
+        head = self._head
+        value = fetch()
+        self._cache.set("fees", (value, head), ttl_seconds=settings.fee_cache_seconds)
+        return value
+
+    async def afees(self, fetch: Callable[[], Awaitable[Fees]]) -> Fees:
+        entry = self._cache.get("fees", is_valid=self._is_fresh)
+        if entry is not None:
+            return entry[0]
+        head = self._head
+        value = await fetch()
+        self._cache.set("fees", (value, head), ttl_seconds=settings.fee_cache_seconds)
+        return value
+
+    def gas_limit(self, function_name: str, estimate: Callable[[], int]) -> int:
+        entry = self._cache.get(("gas", function_name))
+        if entry is not None:
+            return entry[0]
+        return self._store_gas(function_name, estimate())
+
+    async def agas_limit(self, function_name: str, estimate: Callable[[], Awaitable[int]]) -> int:
+        entry = self._cache.get(("gas", function_name))
+        if entry is not None:
+            return entry[0]
+        return self._store_gas(function_name, await estimate())
+
+    def _store_gas(self, function_name: str, estimate: int) -> int:
+        limit = int(estimate * settings.gas_limit_multiplier)
+        self._cache.set(("gas", function_name), (limit, self._head), ttl_seconds=settings.fee_gas_limit_ttl)
+        return limit
+
+    def _is_fresh(self, entry: Tuple[Any, int]) -> bool:
+        return entry[1] >= self._head
+
+    def note_block(self, block_number: int) -> None:
+        with self._lock:
+            if block_number > self._head:
+                self._head = block_number
+
+    def invalidate_fees(self) -> None:
+        self._cache.pop("fees")
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._head = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "headBlock": self._head}
+
+
+def bumped_fees(tx: dict, current: Fees) -> Fees:
+    # A replacement must raise every fee field by TX_REPLACEMENT_BUMP, and should pay at least the
+    # current market rate.
+    bumped = {}
+    for field in ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas"):
+        if field in tx:
+            bumped[field] = max(int(tx[field] * settings.tx_replacement_bump) + 1, current.get(field, 0))
+    return bumped
+
+
+def new_fee_oracle() -> FeeOracle:
+    oracle = FeeOracle()
+    register_cache("chain_fees", oracle)
+    return oracle
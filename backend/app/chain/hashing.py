@@ -1,7 +1,11 @@
-from web3 import Web3
+from typing import Optional, Tuple
 
-from app.attestation.canonical import build_canonical_attestation, canonical_attestation_json
+from eth_hash.auto import keccak as _keccak
+
+from app.attestation.canonical import SCHEMA_VERSION, build_canonical_attestation, canonical_attestation_json
+from app.core.metrics import timed_stage
 from app.models.batch import Batch
+from app.models.extraction import Extraction
 from app.schemas.extraction import ExtractionResult
 
 
@@ -10,9 +14,43 @@ def build_attestation_json(batch: Batch, extraction: ExtractionResult, document_
     return canonical_attestation_json(attestation)
 
 
+# eth_hash is the keccak backend web3 itself uses; importing it directly keeps web3 off the hot path.
+def keccak_bytes(data: bytes) -> bytes:
+    return _keccak(data)
+
+
+def keccak_text(text: str) -> bytes:
+    return _keccak(text.encode("utf-8"))
+
+
+def to_hex(value: bytes) -> str:
+    return "0x" + bytes(value).hex()
+
+
+def hex_to_bytes(value: str) -> bytes:
+    return bytes.fromhex(value[2:] if value[:2] in ("0x", "0X") else value)
+
+
 def hash_batch_id(batch_id: str) -> bytes:
-    return Web3.keccak(text=batch_id)
+    return keccak_text(batch_id)
 
 
 def hash_attestation(canonical_json: str) -> bytes:
-    return Web3.keccak(text=canonical_json)
+    return keccak_text(canonical_json)
+
+
+@timed_stage("canonical_hash")
+def refresh_attestation(batch: Batch, extraction: Extraction, result: Optional[ExtractionResult] = None) -> None:
+    result = result or ExtractionResult.model_validate(extraction.extracted_fields)
+    canonical_json = build_attestation_json(batch, result, extraction.document_fingerprint)
+    extraction.canonical_json = canonical_json
+    extraction.attestation_hash = to_hex(hash_attestation(canonical_json))
+    extraction.schema_version = SCHEMA_VERSION
+
+
+def stored_attestation(batch: Batch, extraction: Extraction) -> Tuple[str, bytes]:
+    # Returns the persisted canonical JSON and hash, recomputing them for legacy rows or after a
+    # SCHEMA_VERSION change. Callers commit the session to keep a backfilled value.
+    if extraction.schema_version != SCHEMA_VERSION or not extraction.canonical_json or not extraction.attestation_hash:
+        refresh_attestation(batch, extraction)
+    return extraction.canonical_json, hex_to_bytes(extraction.attestation_hash)
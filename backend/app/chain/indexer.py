@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import lru_cache
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.chain.cache import get_attestation_cache
+from app.chain.hashing import hex_to_bytes, to_hex
+from app.core.config import settings
+from app.db import session
+from app.models.batch import Batch, BatchStatus
+from app.models.published_event import IndexerCheckpoint, PublishedEvent as PublishedEventModel
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "published_events"
+
+
+class PublishedEventIndexer:
+    # Follows BatchHashRegistry Published events from a checkpointed block into published_events so
+    # /verify can be answered locally. If the checkpoint block hash no longer matches the chain, the
+    # index is rolled back INDEXER_REORG_DEPTH blocks and replayed.
+    def __init__(self) -> None:
+        self._chain_client = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def ensure_started(self, chain_client) -> None:
+        with self._lock:
+            self._chain_client = chain_client
+            if settings.indexer_poll_interval <= 0:
+                return
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="published-event-indexer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=settings.indexer_poll_interval + 1)
+            self._thread = None
+        self._stop.clear()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Published event indexer poll failed")
+            self._stop.wait(settings.indexer_poll_interval)
+
+    def poll_once(self, chain_client=None) -> int:
+        chain_client = chain_client or self._chain_client
+        if chain_client is None:
+            return 0
+
+        db = session.SessionLocal()
+        try:
+            head = chain_client.get_block_number()
+            get_attestation_cache().note_block(head)
+            checkpoint = self._load_checkpoint(db)
+            if checkpoint.block_hash and chain_client.get_block_hash(checkpoint.block_number) != checkpoint.block_hash:
+                self._rollback(db, checkpoint, chain_client)
+
+            indexed = 0
+            while checkpoint.block_number < head and not self._stop.is_set():
+                from_block = checkpoint.block_number + 1
+                to_block = min(head, from_block + settings.indexer_batch_blocks - 1)
+                events = chain_client.get_published_events(from_block, to_block)
+                self._store_events(db, events)
+                checkpoint.block_number = to_block
+                checkpoint.block_hash = chain_client.get_block_hash(to_block)
+                checkpoint.updated_at = datetime.now(timezone.utc)
+                db.commit()
+                indexed += len(events)
+            return indexed
+        finally:
+            db.close()
+
+    def _load_checkpoint(self, db: Session) -> IndexerCheckpoint:
+        checkpoint = db.get(IndexerCheckpoint, CHECKPOINT_NAME)
+        if checkpoint is None:
+            checkpoint = IndexerCheckpoint(
+                name=CHECKPOINT_NAME,
+                block_number=settings.indexer_start_block - 1,
+                block_hash=None,
+                updated_at=datetime.now(timezone.utc),
+            )
+            db.add(checkpoint)
+        return checkpoint
+
+    def _rollback(self, db: Session, checkpoint: IndexerCheckpoint, chain_client) -> None:
+        target = max(checkpoint.block_number - settings.indexer_reorg_depth, settings.indexer_start_block - 1)
+        logger.warning("Reorg detected at block %s, rolling back to %s", checkpoint.block_number, target)
+        orphaned = db.query(PublishedEventModel).filter(PublishedEventModel.block_number > target).all()
+        cache = get_attestation_cache()
+        for event in orphaned:
+            cache.invalidate(hex_to_bytes(event.batch_id_hash))
+            db.delete(event)
+        # Batches whose only evidence was an orphaned transaction go back to READY; if the transaction
+        # is mined again on the new branch, re-indexing marks them PUBLISHED once more.
+        orphaned_txs = {(event.batch_id_hash, event.tx_hash) for event in orphaned}
+        if orphaned_txs:
+            batches = (
+                db.query(Batch)
+                .filter(
+                    Batch.batch_id_hash.in_([batch_id_hash for batch_id_hash, _tx_hash in orphaned_txs]),
+                    Batch.status == BatchStatus.PUBLISHED,
+                    Batch.anchor_root.is_(None),
+                )
+                .all()
+            )
+            for batch in batches:
+                if (batch.batch_id_hash, batch.tx_hash) in orphaned_txs:
+                    batch.status = BatchStatus.READY
+                    batch.tx_hash = None
+                    batch.publisher_address = None
+                    batch.published_at = None
+                    batch.chain = None
+        checkpoint.block_number = target
+        checkpoint.block_hash = chain_client.get_block_hash(target) if target >= 0 else None
+        checkpoint.updated_at = datetime.now(timezone.utc)
+        db.commit()
+
+    def _store_events(self, db: Session, events: Sequence) -> None:
+        if not events:
+            return
+        records: List[PublishedEventModel] = []
+        for event in events:
+            record = PublishedEventModel(
+                batch_id_hash=to_hex(event.batch_id_hash),
+                attestation_hash=to_hex(event.attestation_hash),
+                publisher=event.publisher,
+                published_at=datetime.fromtimestamp(event.timestamp, tz=timezone.utc),
+                block_number=event.block_number,
+                block_hash=event.block_hash,
+                tx_hash=event.tx_hash,
+                log_index=event.log_index,
+            )
+            records.append(db.merge(record))
+
+        # Fill in publication details for batches that were published by other tools.
+        by_hash: Dict[str, PublishedEventModel] = {record.batch_id_hash: record for record in records}
+        batches = db.query(Batch).filter(Batch.batch_id_hash.in_(list(by_hash))).all()
+        for batch in batches:
+            record = by_hash[batch.batch_id_hash]
+            batch.publisher_address = batch.publisher_address or record.publisher
+            batch.published_at = batch.published_at or record.published_at
+            batch.tx_hash = batch.tx_hash or record.tx_hash
+            batch.chain = batch.chain or settings.chain_name
+            if batch.status == BatchStatus.READY:
+                batch.status = BatchStatus.PUBLISHED
+
+
+def indexed_attestations(db: Session, batch_id_hashes: Sequence[bytes]) -> Dict[bytes, bytes]:
+    if not batch_id_hashes:
+        return {}
+    rows = (
+        db.query(PublishedEventModel.batch_id_hash, PublishedEventModel.attestation_hash)
+        .filter(PublishedEventModel.batch_id_hash.in_([to_hex(value) for value in batch_id_hashes]))
+        .all()
+    )
+    return {hex_to_bytes(batch_id_hash): hex_to_bytes(attestation) for batch_id_hash, attestation in rows}
+
+
+@lru_cache(maxsize=1)
+def get_published_event_indexer() -> PublishedEventIndexer:
+    return PublishedEventIndexer()
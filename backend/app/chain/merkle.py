@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+from app.chain.hashing import keccak_bytes
+
+
+def hash_pair(left: bytes, right: bytes) -> bytes:
+    # Sorted pairs keep proofs position-free and match BatchHashRegistry.verifyInclusion.
+    if right < left:
+        left, right = right, left
+    return keccak_bytes(left + right)
+
+
+@dataclass
+class MerkleTree:
+    leaves: List[bytes]
+    levels: List[List[bytes]] = field(default_factory=list)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def proof(self, index: int) -> List[bytes]:
+        if index < 0 or index >= len(self.leaves):
+            raise IndexError("leaf index out of range")
+        proof: List[bytes] = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append(level[sibling])
+            index //= 2
+        return proof
+
+
+def build_merkle_tree(leaves: Sequence[bytes]) -> MerkleTree:
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+
+    levels: List[List[bytes]] = [list(leaves)]
+    while len(levels[-1]) > 1:
+        current = levels[-1]
+        parents = [hash_pair(current[i], current[i + 1]) for i in range(0, len(current) - 1, 2)]
+        if len(current) % 2:
+            # Odd nodes are carried up unchanged rather than duplicated.
+            parents.append(current[-1])
+        levels.append(parents)
+    return MerkleTree(leaves=list(leaves), levels=levels)
+
+
+def verify_merkle_proof(leaf: bytes, proof: Sequence[bytes], root: bytes) -> bool:
+    node = leaf
+    for sibling in proof:
+        node = hash_pair(node, sibling)
+    return node == root
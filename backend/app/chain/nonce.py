@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+
+@dataclass
+class PendingTransaction:
+    nonce: int
+    tx_hash: str
+    tx: dict
+    sent_at: float = field(default_factory=time.monotonic)
+    replaced_hashes: List[str] = field(default_factory=list)
+
+
+class NonceManager:
+    # Nonces for one account are handed out locally; the chain is only consulted on first use and
+    # on resync, so many publishes can sign and broadcast in parallel.
+    def __init__(self, fetch_nonce: Callable[[str], int]) -> None:
+        # fetch_nonce(block_identifier) -> transaction count for the account at "latest"/"pending".
+        self._fetch_nonce = fetch_nonce
+        self._lock = threading.Lock()
+        self._next: Optional[int] = None
+        # Nonces handed out but not yet tracked or released, and released ones below `_next` that
+        # must be reused before counting on, or the account's sequence stalls on the gap.
+        self._reserved: Set[int] = set()
+        self._gaps: Set[int] = set()
+        self._pending: Dict[int, PendingTransaction] = {}
+        self._hash_to_nonce: Dict[str, int] = {}
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    @property
+    def initialized(self) -> bool:
+        return self._next is not None
+
+    def seed(self, next_nonce: int) -> None:
+        # Lets async callers fetch the starting nonce themselves instead of blocking in reserve().
+        with self._lock:
+            if self._next is None:
+                self._next = next_nonce
+
+    def reserve(self) -> int:
+        with self._lock:
+            if self._next is None:
+                self._next = self._fetch_nonce("pending")
+            if self._gaps:
+                nonce = min(self._gaps)
+                self._gaps.discard(nonce)
+            else:
+                nonce = self._next
+                self._next += 1
+            self._reserved.add(nonce)
+            return nonce
+
+    def release(self, nonce: int) -> None:
+        # Called when a reserved nonce was never broadcast.
+        with self._lock:
+            self._reserved.discard(nonce)
+            if nonce in self._pending:
+                return
+            if self._next is not None and nonce == self._next - 1:
+                self._next = nonce
+                # Gaps directly below are no longer gaps, just the end of the sequence.
+                while self._next - 1 in self._gaps:
+                    self._next -= 1
+                    self._gaps.discard(self._next)
+            else:
+                # A later nonce is already out, so this one is reused by the next reserve().
+                self._gaps.add(nonce)
+
+    def track(self, nonce: int, tx_hash: str, tx: dict) -> None:
+        with self._lock:
+            self._reserved.discard(nonce)
+            self._pending[nonce] = PendingTransaction(nonce=nonce, tx_hash=tx_hash, tx=tx)
+            self._hash_to_nonce[tx_hash] = nonce
+
+    def replace(self, nonce: int, tx_hash: str, tx: dict) -> None:
+        with self._lock:
+            pending = self._pending.get(nonce)
+            if pending is None:
+                return
+            pending.replaced_hashes.append(pending.tx_hash)
+            pending.tx_hash = tx_hash
+            pending.tx = tx
+            pending.sent_at = time.monotonic()
+            self._hash_to_nonce[tx_hash] = nonce
+
+    def knows(self, tx_hash: str) -> bool:
+        with self._lock:
+            return tx_hash in self._hash_to_nonce
+
+    def pending(self) -> List[PendingTransaction]:
+        with self._lock:
+            return list(self._pending.values())
+
+    def nonce_of(self, tx_hash: str) -> Optional[int]:
+        with self._lock:
+            return self._hash_to_nonce.get(tx_hash)
+
+    def resolve(self, tx_hash: str) -> str:
+        # Replacements change the hash; callers keep the original and resolve it here.
+        with self._lock:
+            nonce = self._hash_to_nonce.get(tx_hash)
+            pending = self._pending.get(nonce) if nonce is not None else None
+            return pending.tx_hash if pending else tx_hash
+
+    def confirm(self, tx_hash: str) -> None:
+        with self._lock:
+            nonce = self._hash_to_nonce.get(tx_hash)
+            if nonce is None:
+                return
+            # Mining nonce N implies every lower nonce for this account is final as well.
+            for pending_nonce in [n for n in self._pending if n <= nonce]:
+                self._forget(pending_nonce)
+
+    def stuck(self, older_than_seconds: float) -> List[PendingTransaction]:
+        cutoff = time.monotonic() - older_than_seconds
+        with self._lock:
+            return [pending for pending in self._pending.values() if pending.sent_at <= cutoff]
+
+    def resync(self) -> List[PendingTransaction]:
+        # Returns tracked transactions the node no longer knows about so they can be rebroadcast.
+        mined = self._fetch_nonce("latest")
+        chain_pending = self._fetch_nonce("pending")
+        with self._lock:
+            for nonce in [n for n in self._pending if n < mined]:
+                self._forget(nonce)
+            dropped = sorted(
+                (pending for pending in self._pending.values() if pending.nonce >= chain_pending),
+                key=lambda pending: pending.nonce,
+            )
+            # Count on from the chain, past anything still tracked (dropped ones are rebroadcast by
+            # the caller) or reserved by a publish in progress. This may rewind below `_next`.
+            floor = max(chain_pending, mined)
+            next_nonce = max([floor, *(n + 1 for n in self._pending), *(n + 1 for n in self._reserved)])
+            # Anything in between that nobody holds was lost and must be filled.
+            self._gaps = {
+                n for n in range(floor, next_nonce) if n not in self._pending and n not in self._reserved
+            }
+            self._next = next_nonce
+            return dropped
+
+    def _forget(self, nonce: int) -> None:
+        pending = self._pending.pop(nonce)
+        self._hash_to_nonce.pop(pending.tx_hash, None)
+        for replaced in pending.replaced_hashes:
+            self._hash_to_nonce.pop(replaced, None)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import itertools
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.chain.nonce import NonceManager
+from app.core.config import settings
+
+
+@dataclass
+class Publisher:
+    account: Any
+    nonces: NonceManager
+    # Publishes that picked this key but have not been tracked (or released) yet.
+    sending: int = 0
+    # Held while replacing this key's stuck transactions, so concurrent waiters do not bump twice.
+    replacing: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def address(self) -> str:
+        return self.account.address
+
+    def load(self) -> int:
+        return self.nonces.in_flight + self.sending
+
+    def stuck(self) -> int:
+        return len(self.nonces.stuck(settings.tx_stuck_seconds))
+
+    def stats(self) -> Dict[str, Any]:
+        pending = self.nonces.pending()
+        now = time.monotonic()
+        stuck = self.stuck()
+        return {
+            "address": self.address,
+            "healthy": stuck == 0,
+            "inFlight": len(pending),
+            "stuck": stuck,
+            "replacements": sum(len(transaction.replaced_hashes) for transaction in pending),
+            "oldestPendingSeconds": round(now - min(t.sent_at for t in pending), 1) if pending else None,
+            "lowestPendingNonce": min(t.nonce for t in pending) if pending else None,
+        }
+
+
+class PublisherPool:
+    # Several publisher accounts, each with its own nonce sequence, so one account's unmined
+    # transactions do not hold up the others. New transactions go to the least-loaded healthy key.
+    def __init__(self, publishers: List[Publisher]) -> None:
+        if not publishers:
+            raise RuntimeError("PUBLISHER_PRIVATE_KEY must be set")
+        self.publishers = publishers
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+
+    @property
+    def primary(self) -> Publisher:
+        return self.publishers[0]
+
+    @contextmanager
+    def lease(self) -> Iterator[Publisher]:
+        with self._lock:
+            # Keys with stuck transactions go last; ties rotate so idle keys share the work.
+            turn = next(self._turn)
+            count = len(self.publishers)
+            _, publisher = min(
+                enumerate(self.publishers),
+                key=lambda item: (item[1].stuck() > 0, item[1].load(), (item[0] - turn) % count),
+            )
+            publisher.sending += 1
+        try:
+            yield publisher
+        finally:
+            with self._lock:
+                publisher.sending -= 1
+
+    def for_tx(self, tx_hash: str) -> Optional[Publisher]:
+        for publisher in self.publishers:
+            if publisher.nonces.knows(tx_hash):
+                return publisher
+        return None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [publisher.stats() for publisher in self.publishers]
+
+
+def configured_private_keys() -> List[str]:
+    keys = [key.strip() for key in settings.publisher_private_keys.split(",") if key.strip()]
+    if not keys and settings.publisher_private_key:
+        keys = [settings.publisher_private_key]
+    return list(dict.fromkeys(keys))
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+
+# Raw transactions only go to endpoints configured as writers; "pending" nonce reads go there too,
+# since only those nodes have our transactions in their mempool.
+WRITE_METHODS = {"eth_sendRawTransaction"}
+HEDGED_METHODS = {"eth_call"}
+# Answers that never change for a chain; web3's validation middleware asks for the chain id around
+# every estimate and call, so it is answered locally after the first time.
+CONSTANT_METHODS = {"eth_chainId"}
+
+
+def _split_urls(value: str) -> List[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+def configured_rpc_urls() -> List[str]:
+    return _split_urls(settings.chain_rpc_urls) or _split_urls(settings.chain_rpc_url)
+
+
+def redact_url(url: str) -> str:
+    # Hosted RPC URLs often carry an API key in the path, query or user info; only the scheme, host and
+    # port are shown.
+    parts = urlsplit(url)
+    netloc = parts.hostname or ""
+    if parts.port:
+        netloc += f":{parts.port}"
+    redacted = f"{parts.scheme}://{netloc}"
+    return redacted + "/***" if parts.path.strip("/") or parts.query or parts.username else redacted
+
+
+class RpcEndpoint:
+    def __init__(self, url: str, writable: bool) -> None:
+        from web3 import HTTPProvider
+
+        self.url = url
+        self.writable = writable
+        # web3's own retries would hide a slow or failing node from the pool; failover replaces them.
+        self.provider = HTTPProvider(
+            url, request_kwargs={"timeout": settings.chain_rpc_timeout}, exception_retry_configuration=None
+        )
+        self._async_provider = None
+        self.latency_ewma: Optional[float] = None
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    @property
+    def async_provider(self):
+        if self._async_provider is None:
+            from web3 import AsyncHTTPProvider
+
+            self._async_provider = AsyncHTTPProvider(self.url, exception_retry_configuration=None)
+        return self._async_provider
+
+    def healthy(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.monotonic()) >= self.unhealthy_until
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.consecutive_failures = 0
+            self.unhealthy_until = 0.0
+            self._observe(latency)
+
+    def record_hedge_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def record_failure(self, latency: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+            self.consecutive_failures += 1
+            self._observe(latency)
+            # After the cooldown the endpoint gets one trial request; another failure benches it again.
+            if self.consecutive_failures >= settings.rpc_failure_threshold:
+                self.unhealthy_until = time.monotonic() + settings.rpc_cooldown_seconds
+
+    def _observe(self, latency: float) -> None:
+        alpha = settings.rpc_latency_alpha
+        self.latency_ewma = latency if self.latency_ewma is None else alpha * latency + (1 - alpha) * self.latency_ewma
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "url": redact_url(self.url),
+                "writable": self.writable,
+                "healthy": self.healthy(),
+                "latencyMs": round(self.latency_ewma * 1000, 2) if self.latency_ewma is not None else None,
+                "requests": self.requests,
+                "errors": self.errors,
+                "errorRate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+                "consecutiveFailures": self.consecutive_failures,
+                "hedgeWins": self.hedge_wins,
+            }
+
+
+class RpcEndpointPool:
+    # Tracks latency (EWMA) and failures per RPC endpoint. Reads go to the fastest healthy endpoint and
+    # fail over down the list; benched endpoints are only used when nothing healthy is left.
+    def __init__(self, urls: Sequence[str], write_urls: Sequence[str] = ()) -> None:
+        writers = set(write_urls) or set(urls)
+        ordered = list(dict.fromkeys([*urls, *write_urls]))
+        self.endpoints = [RpcEndpoint(url, writable=url in writers) for url in ordered]
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def record_hedge(self) -> None:
+        # Hedges are launched from request threads and the event loop at the same time.
+        with self._lock:
+            self.hedges += 1
+
+    def read_order(self) -> List[RpcEndpoint]:
+        return self._order(list(self.endpoints))
+
+    def write_order(self) -> List[RpcEndpoint]:
+        return self._order([endpoint for endpoint in self.endpoints if endpoint.writable])
+
+    def endpoints_for(self, method: str, params: Any) -> List[RpcEndpoint]:
+        if method in WRITE_METHODS:
+            return self.write_order()
+        if method == "eth_getTransactionCount" and params and params[-1] == "pending":
+            return self.write_order()
+        return self.read_order()
+
+    @staticmethod
+    def _order(endpoints: List[RpcEndpoint]) -> List[RpcEndpoint]:
+        now = time.monotonic()
+        healthy = [endpoint for endpoint in endpoints if endpoint.healthy(now)]
+        benched = [endpoint for endpoint in endpoints if not endpoint.healthy(now)]
+        # Endpoints without a measurement yet sort first so every node gets probed.
+        healthy.sort(key=lambda endpoint: endpoint.latency_ewma if endpoint.latency_ewma is not None else -1.0)
+        benched.sort(key=lambda endpoint: endpoint.unhealthy_until)
+        return healthy + benched
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hedges = self.hedges
+        return {
+            "hedgeAfterSeconds": settings.rpc_hedge_after,
+            "hedges": hedges,
+            "endpoints": [endpoint.stats() for endpoint in self.endpoints],
+        }
+
+
+def _timed(endpoint: RpcEndpoint, call: Callable[[Any], Any]) -> Any:
+    started = time.monotonic()
+    try:
+        response = call(endpoint.provider)
+    except Exception:
+        endpoint.record_failure(time.monotonic() - started)
+        raise
+    endpoint.record_success(time.monotonic() - started)
+    return response
+
+
+def _make_failover_provider_class():
+    from web3.providers.base import JSONBaseProvider
+
+    class FailoverHTTPProvider(JSONBaseProvider):
+        # A web3 provider over an RpcEndpointPool. Transport errors move on to the next endpoint;
+        # JSON-RPC error responses (reverts, nonce errors) are answers and are returned as they are.
+        def __init__(self, pool: RpcEndpointPool) -> None:
+            super().__init__()
+            self.pool = pool
+            self._constants: Dict[str, Any] = {}
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(2, len(pool.endpoints) * 4), thread_name_prefix="rpc-hedge"
+            )
+
+        def make_request(self, method, params):
+            if method in self._constants:
+                return self._constants[method]
+            endpoints = self.pool.endpoints_for(method, params)
+            if method in HEDGED_METHODS and settings.rpc_hedge_after > 0 and len(endpoints) > 1:
+                return self._hedged(endpoints, lambda provider: provider.make_request(method, params))
+            response = self._failover(endpoints, lambda provider: provider.make_request(method, params))
+            if method in CONSTANT_METHODS and "result" in response:
+                self._constants[method] = response
+            return response
+
+        def make_batch_request(self, requests):
+            return self._failover(self.pool.read_order(), lambda provider: provider.make_batch_request(requests))
+
+        def _failover(self, endpoints: List[RpcEndpoint], call: Callable[[Any], Any]) -> Any:
+            if not endpoints:
+                raise RuntimeError("No RPC endpoints configured")
+            last_error: Optional[Exception] = None
+            for endpoint in endpoints:
+                try:
+                    return _timed(endpoint, call)
+                except Exception as exc:
+                    last_error = exc
+            raise last_error
+
+        def _hedged(self, endpoints: List[RpcEndpoint], call: Callable[[Any], Any]) -> Any:
+            # Ask the best endpoint; if it has not answered within RPC_HEDGE_AFTER seconds (or failed),
+            # ask the next one as well. The first successful answer wins.
+            remaining = iter(endpoints)
+            running: Dict[Future, RpcEndpoint] = {}
+            last_error: Optional[Exception] = None
+
+            def launch() -> bool:
+                endpoint = next(remaining, None)
+                if endpoint is None:
+                    return False
+                running[self._executor.submit(_timed, endpoint, call)] = endpoint
+                return True
+
+            launch()
+            while running:
+                done, _ = wait(list(running), timeout=settings.rpc_hedge_after, return_when=FIRST_COMPLETED)
+                if not done:
+                    if launch():
+                        self.pool.record_hedge()
+                    continue
+                for future in done:
+                    endpoint = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        if endpoint is not endpoints[0]:
+                            endpoint.record_hedge_win()
+                        return future.result()
+                    last_error = error
+                    launch()
+            raise last_error
+
+    return FailoverHTTPProvider
+
+
+def _make_async_failover_provider_class():
+    from web3.providers.async_base import AsyncJSONBaseProvider
+
+    class AsyncFailoverHTTPProvider(AsyncJSONBaseProvider):
+        # Async counterpart of FailoverHTTPProvider; hedged requests are concurrent tasks.
+        def __init__(self, pool: RpcEndpointPool) -> None:
+            super().__init__()
+            self.pool = pool
+            self._constants: Dict[str, Any] = {}
+
+        async def cache_async_session(self, session) -> None:
+            for endpoint in self.pool.endpoints:
+                await endpoint.async_provider.cache_async_session(session)
+
+        async def make_request(self, method, params):
+            if method in self._constants:
+                return self._constants[method]
+            endpoints = self.pool.endpoints_for(method, params)
+            if method in HEDGED_METHODS and settings.rpc_hedge_after > 0 and len(endpoints) > 1:
+                return await self._hedged(endpoints, method, params)
+            last_error: Optional[Exception] = None
+            for endpoint in endpoints:
+                try:
+                    response = await self._timed(endpoint, method, params)
+                except Exception as exc:
+                    last_error = exc
+                    continue
+                if method in CONSTANT_METHODS and "result" in response:
+                    self._constants[method] = response
+                return response
+            raise last_error or RuntimeError("No RPC endpoints configured")
+
+        async def _timed(self, endpoint: RpcEndpoint, method, params):
+            started = time.monotonic()
+            try:
+                response = await endpoint.async_provider.make_request(method, params)
+            except Exception:
+                endpoint.record_failure(time.monotonic() - started)
+                raise
+            endpoint.record_success(time.monotonic() - started)
+            return response
+
+        async def _hedged(self, endpoints: List[RpcEndpoint], method, params):
+            remaining = iter(endpoints)
+            running: Dict[asyncio.Task, RpcEndpoint] = {}
+            last_error: Optional[Exception] = None
+
+            def launch() -> bool:
+                endpoint = next(remaining, None)
+                if endpoint is None:
+                    return False
+                running[asyncio.ensure_future(self._timed(endpoint, method, params))] = endpoint
+                return True
+
+            launch()
+            try:
+                while running:
+                    done, _ = await asyncio.wait(
+                        list(running), timeout=settings.rpc_hedge_after, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        if launch():
+                            self.pool.record_hedge()
+                        continue
+                    for task in done:
+                        endpoint = running.pop(task)
+                        if task.exception() is None:
+                            if endpoint is not endpoints[0]:
+                                endpoint.record_hedge_win()
+                            return task.result()
+                        last_error = task.exception()
+                        launch()
+                raise last_error
+            finally:
+                for task in running:
+                    task.cancel()
+
+    return AsyncFailoverHTTPProvider
+
+
+def failover_provider(pool: RpcEndpointPool):
+    return _make_failover_provider_class()(pool)
+
+
+def async_failover_provider(pool: RpcEndpointPool):
+    return _make_async_failover_provider_class()(pool)
+
+
+@lru_cache(maxsize=1)
+def get_rpc_pool() -> RpcEndpointPool:
+    return RpcEndpointPool(configured_rpc_urls(), _split_urls(settings.chain_write_rpc_urls))
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import logging
+import threading
+from typing import Callable, Optional
+
+from app.chain.cache import get_attestation_cache
+from app.chain.hashing import hash_batch_id
+from app.core.config import settings
+from app.db import session
+from app.models.batch import Batch, BatchStatus
+from app.models.publish_job import ACTIVE_PUBLISH_JOB_STATUSES, PublishJob, PublishJobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ReceiptTracker:
+    # Polls receipts for every active publish job in a handful of batched RPC calls per tick, so
+    # publish requests can return as soon as the transaction is broadcast.
+    def __init__(self) -> None:
+        self._chain_client = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def ensure_started(self, chain_client) -> None:
+        with self._lock:
+            self._chain_client = chain_client
+            if settings.publish_tracker_interval <= 0:
+                return
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="receipt-tracker", daemon=True)
+            self._thread.start()
+
+    def recover(self, chain_client_factory: Callable[[], object]) -> int:
+        # Resumes tracking jobs a previous process left SUBMITTED or MINED. The chain client is only
+        # built when there is something to track.
+        db = session.SessionLocal()
+        try:
+            active = db.query(PublishJob).filter(PublishJob.status.in_(ACTIVE_PUBLISH_JOB_STATUSES)).count()
+        finally:
+            db.close()
+        if active:
+            self.ensure_started(chain_client_factory())
+        return active
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=settings.publish_tracker_interval + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Receipt tracker poll failed")
+            self._stop.wait(settings.publish_tracker_interval)
+
+    def poll_once(self, chain_client=None) -> int:
+        chain_client = chain_client or self._chain_client
+        if chain_client is None:
+            return 0
+
+        db = session.SessionLocal()
+        try:
+            jobs = db.query(PublishJob).filter(PublishJob.status.in_(ACTIVE_PUBLISH_JOB_STATUSES)).all()
+            if not jobs:
+                return 0
+
+            now = datetime.now(timezone.utc)
+            stuck_before = now - timedelta(seconds=settings.tx_stuck_seconds)
+            if any(job.status == PublishJobStatus.SUBMITTED and _aware(job.created_at) < stuck_before for job in jobs):
+                chain_client.replace_stuck_transactions()
+
+            head = chain_client.get_block_number()
+            get_attestation_cache().note_block(head)
+            receipts = chain_client.get_receipts([job.tx_hash for job in jobs])
+            for job in jobs:
+                self._apply_receipt(db, job, receipts.get(job.tx_hash), head, now)
+            db.commit()
+            return len(jobs)
+        finally:
+            db.close()
+
+    def _apply_receipt(self, db, job: PublishJob, receipt, head: int, now: datetime) -> None:
+        job.updated_at = now
+        if receipt is None:
+            # Not mined yet, or a reorg dropped the block we had seen it in.
+            job.status = PublishJobStatus.SUBMITTED
+            job.block_number = None
+            job.confirmations = 0
+            return
+        if not receipt.success:
+            job.status = PublishJobStatus.FAILED
+            job.tx_hash = receipt.tx_hash
+            job.block_number = receipt.block_number
+            job.error = "Transaction reverted"
+            # The batch stays READY; drop the reverted transaction so it is not reported as its anchor.
+            batch = db.get(Batch, job.batch_id)
+            if batch is not None and batch.status != BatchStatus.PUBLISHED:
+                batch.tx_hash = None
+                batch.publisher_address = None
+                batch.chain = None
+            return
+
+        job.tx_hash = receipt.tx_hash
+        job.block_number = receipt.block_number
+        job.confirmations = max(head - receipt.block_number + 1, 0)
+        if job.confirmations < settings.publish_confirmations:
+            job.status = PublishJobStatus.MINED
+            return
+
+        job.status = PublishJobStatus.CONFIRMED
+        get_attestation_cache().invalidate(hash_batch_id(job.batch_id))
+        batch = db.get(Batch, job.batch_id)
+        if batch is not None:
+            batch.status = BatchStatus.PUBLISHED
+            batch.tx_hash = receipt.tx_hash
+            batch.published_at = now
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=1)
+def get_receipt_tracker() -> ReceiptTracker:
+    return ReceiptTracker()
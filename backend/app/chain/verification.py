@@ -0,0 +1,123 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.chain.cache import AttestationCache
+from app.chain.hashing import hash_batch_id, hex_to_bytes, to_hex
+from app.chain.indexer import indexed_attestations
+from app.chain.merkle import verify_merkle_proof
+from app.core.config import settings
+from app.models.batch import Batch
+
+
+async def abuild_verification_result(
+    db: AsyncSession,
+    batch: Batch,
+    offchain_hash: bytes,
+    chain_client,
+    cache: AttestationCache,
+) -> dict:
+    if batch.anchor_root:
+        root = hex_to_bytes(batch.anchor_root)
+        return _anchored_result(batch, offchain_hash, await cache.aget_root(chain_client, root))
+
+    batch_id_hash = hash_batch_id(batch.batch_id)
+    found, missing = await db.run_sync(_indexed_hashes, [batch_id_hash])
+    if missing:
+        found[batch_id_hash] = await cache.aget_attestation(chain_client, batch_id_hash)
+    return _compare_hashes(batch, offchain_hash, found[batch_id_hash])
+
+
+def build_verification_results(
+    db: Session,
+    rows: Sequence[Tuple[Batch, bytes]],
+    chain_client,
+    cache: AttestationCache,
+) -> List[dict]:
+    direct = [(batch, offchain_hash) for batch, offchain_hash in rows if not batch.anchor_root]
+    onchain_hashes = lookup_onchain_hashes(
+        db, [hash_batch_id(batch.batch_id) for batch, _offchain_hash in direct], chain_client, cache
+    )
+    direct_results = {
+        batch.batch_id: _compare_hashes(batch, offchain_hash, onchain_hash)
+        for (batch, offchain_hash), onchain_hash in zip(direct, onchain_hashes)
+    }
+
+    results = []
+    for batch, offchain_hash in rows:
+        if batch.anchor_root:
+            results.append(_verify_anchored(batch, offchain_hash, chain_client, cache))
+        else:
+            results.append(direct_results[batch.batch_id])
+    return results
+
+
+def lookup_onchain_hashes(
+    db: Session,
+    batch_id_hashes: Sequence[bytes],
+    chain_client,
+    cache: AttestationCache,
+) -> List[Optional[bytes]]:
+    found, missing = _indexed_hashes(db, batch_id_hashes)
+    if len(missing) == 1:
+        found[missing[0]] = cache.get_attestation(chain_client, missing[0])
+    elif missing:
+        found.update(zip(missing, cache.get_many_attestations(chain_client, missing)))
+    return [found[batch_id_hash] for batch_id_hash in batch_id_hashes]
+
+
+def _indexed_hashes(
+    db: Session, batch_id_hashes: Sequence[bytes]
+) -> Tuple[Dict[bytes, Optional[bytes]], List[bytes]]:
+    # Attestations answered by the event index, and the batch id hashes that still need a contract read.
+    # Shared by the sync and async verify paths (the async one calls it through run_sync).
+    if settings.verify_source != "index":
+        return {}, list(batch_id_hashes)
+    found = indexed_attestations(db, batch_id_hashes)
+    if not settings.verify_index_fallback:
+        return {batch_id_hash: found.get(batch_id_hash) for batch_id_hash in batch_id_hashes}, []
+    return found, [batch_id_hash for batch_id_hash in batch_id_hashes if batch_id_hash not in found]
+
+
+def _compare_hashes(batch: Batch, offchain_hash: bytes, onchain_hash: Optional[bytes]) -> dict:
+    mismatch_reason: Optional[str] = None
+    if onchain_hash is None:
+        mismatch_reason = "No on-chain attestation found for this batch"
+    elif offchain_hash != onchain_hash:
+        mismatch_reason = "Hash mismatch: off-chain and on-chain hashes do not match"
+
+    return {
+        "verified": mismatch_reason is None,
+        "batchId": batch.batch_id,
+        "offchainHash": to_hex(offchain_hash),
+        "onchainHash": to_hex(onchain_hash) if onchain_hash else None,
+        "txHash": batch.tx_hash,
+        "mismatchReason": mismatch_reason,
+    }
+
+
+def _verify_anchored(batch: Batch, offchain_hash: bytes, chain_client, cache: AttestationCache) -> dict:
+    root = hex_to_bytes(batch.anchor_root)
+    return _anchored_result(batch, offchain_hash, cache.get_root(chain_client, root))
+
+
+def _anchored_result(batch: Batch, offchain_hash: bytes, anchored_at: Optional[int]) -> dict:
+    root = hex_to_bytes(batch.anchor_root)
+    proof = [hex_to_bytes(node) for node in batch.merkle_proof or []]
+
+    mismatch_reason: Optional[str] = None
+    if not anchored_at:
+        mismatch_reason = "No on-chain anchor found for this batch's Merkle root"
+    elif not verify_merkle_proof(offchain_hash, proof, root):
+        mismatch_reason = "Merkle proof mismatch: off-chain hash is not included in the anchored root"
+
+    return {
+        "verified": mismatch_reason is None,
+        "batchId": batch.batch_id,
+        "offchainHash": to_hex(offchain_hash),
+        "onchainHash": None,
+        "anchorRoot": batch.anchor_root,
+        "txHash": batch.tx_hash,
+        "mismatchReason": mismatch_reason,
+    }
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,16 +7,99 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///./app.db"
     admin_api_key: str = ""
     env: str = "dev"
+    db_create_all: Optional[bool] = None
+    # Async request-path engine; derived from DATABASE_URL (aiosqlite / asyncpg) unless set.
+    async_database_url: Optional[str] = None
+    db_async_pool_size: int = 20
+    db_async_max_overflow: int = 20
+    # Move objects alive after startup out of the garbage collector's reach (see README, Database access).
+    gc_freeze_on_startup: bool = True
     chain_rpc_url: str = ""
     contract_address: str = ""
     publisher_private_key: str = ""
+    # Comma-separated publisher keys; each has its own nonce sequence. Overrides PUBLISHER_PRIVATE_KEY.
+    publisher_private_keys: str = ""
     chain_id: int = 0
     chain_name: str = "initia-evm"
     chain_mode: str = "real"
+    # Serve verify/publish through the AsyncWeb3 client; background workers keep the blocking one.
+    chain_async_client: bool = False
+    chain_max_connections: int = 50
+    chain_rpc_timeout: float = 30.0
+    # Comma-separated RPC endpoints (CHAIN_RPC_URL when empty); writes only go to CHAIN_WRITE_RPC_URLS
+    # when that is set. eth_call is hedged to the next endpoint after RPC_HEDGE_AFTER seconds (0 disables).
+    chain_rpc_urls: str = ""
+    chain_write_rpc_urls: str = ""
+    rpc_hedge_after: float = 0.25
+    rpc_latency_alpha: float = 0.2
+    rpc_failure_threshold: int = 3
+    rpc_cooldown_seconds: float = 30.0
+    # EIP-1559 (maxFeePerGas / maxPriorityFeePerGas) transactions instead of legacy gasPrice ones.
+    chain_eip1559: bool = False
+    # Fee data is reused until a newer block is seen or this many seconds pass; gas limits per contract
+    # function are estimated once per FEE_GAS_LIMIT_TTL and padded by GAS_LIMIT_MULTIPLIER.
+    fee_cache_seconds: float = 2.0
+    fee_gas_limit_ttl: float = 3600.0
+    gas_limit_multiplier: float = 1.2
+    # Read the registry before publishing so already-anchored batches never cost a transaction.
+    publish_preflight: bool = True
+    tx_stuck_seconds: float = 120.0
+    tx_replacement_bump: float = 1.125
+    tx_max_replacements: int = 3
+    receipt_batch_size: int = 100
+    publish_confirmations: int = 1
+    publish_tracker_interval: float = 2.0
+    verify_cache_size: int = 100000
+    verify_batch_size: int = 500
+    bulk_verify_max_ids: int = 20000
+    verify_source: str = "rpc"
+    verify_index_fallback: bool = True
+    indexer_enabled: bool = False
+    indexer_poll_interval: float = 5.0
+    indexer_start_block: int = 0
+    indexer_batch_blocks: int = 2000
+    indexer_reorg_depth: int = 12
+    verify_cache_positive_ttl: float = 7 * 24 * 3600
+    verify_cache_negative_ttl: float = 5.0
+    anchor_max_batches: int = 10000
+    max_upload_bytes: int = 50 * 1024 * 1024
+    upload_chunk_size: int = 1024 * 1024
+    blob_store: str = "local"
+    blob_store_path: str = "./blobs"
+    blob_sweep_grace_seconds: float = 3600.0
+    s3_bucket: str = ""
+    s3_prefix: str = "documents"
+    s3_endpoint_url: str = ""
+    s3_region: str = ""
+    text_cache_size: int = 256
+    pdf_parse_workers: int = 2
+    pdf_parse_timeout: float = 120.0
+    pdf_parse_max_queue: int = 32
+    pdf_parse_memory_limit: int = 1024 * 1024 * 1024
+    pdf_pages_per_job: int = 25
+    pdf_max_pages: int = 0
+    pdf_max_chars: int = 2_000_000
+    extract_workers: int = 4
+    extract_poll_interval: float = 1.0
+    extract_lease_seconds: float = 300.0
+    extract_job_max_ids: int = 50000
+    llm_cache_enabled: bool = True
+    llm_cache_size: int = 1024
+    llm_cache_max_entries: int = 100000
+    llm_cache_ttl: float = 0.0
     llm_provider: str = "mock"
     llm_base_url: str = ""
     llm_api_key: str = ""
     llm_model: str = ""
+    llm_timeout: float = 60.0
+    llm_max_connections: int = 32
+    llm_max_retries: int = 4
+    llm_backoff_base: float = 0.5
+    llm_backoff_max: float = 30.0
+    llm_concurrency_initial: int = 4
+    llm_concurrency_min: int = 1
+    llm_concurrency_max: int = 32
+    llm_chunk_chars: int = 0
 
     model_config = SettingsConfigDict(env_file=".env", env_prefix="", case_sensitive=False)
 
@@ -25,6 +25,7 @@ def http_exception_handler(_: Request, exc: HTTPException) -> JSONResponse:
         401: "UNAUTHORIZED",
         404: "NOT_FOUND",
         409: "CONFLICT",
+        413: "PAYLOAD_TOO_LARGE",
         501: "NOT_IMPLEMENTED",
     }
     code = status_map.get(exc.status_code, "HTTP_ERROR")
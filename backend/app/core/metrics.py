@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+import inspect
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.cache import cache_stats
+
+# A small Prometheus text-format (0.0.4) implementation. Recording a sample is a dict lookup and a
+# lock, so the verify path pays a few microseconds per request rather than a client-library dependency.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> object: ...
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]: ...
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]) -> None:
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        # Collectors produce complete exposition lines at scrape time, for values owned elsewhere.
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(
+    Counter("http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+)
+HTTP_REQUEST_DURATION = REGISTRY.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"))
+)
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge("http_requests_in_flight", "HTTP requests currently being served."))
+DB_QUERY_DURATION = REGISTRY.register(
+    Histogram("db_query_duration_seconds", "Database statement execution time by statement type.", ("operation",))
+)
+STAGE_DURATION = REGISTRY.register(
+    Histogram("stage_duration_seconds", "Time spent in instrumented processing stages.", ("stage",))
+)
+STAGE_ERRORS = REGISTRY.register(Counter("stage_errors_total", "Stages that raised an exception.", ("stage",)))
+CHAIN_RPC_DURATION = REGISTRY.register(
+    Histogram("chain_rpc_duration_seconds", "Chain JSON-RPC latency by method.", ("method",))
+)
+CHAIN_RPC_ERRORS = REGISTRY.register(
+    Counter("chain_rpc_errors_total", "Chain JSON-RPC calls that failed or returned an error.", ("method",))
+)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_DURATION.labels(stage).observe(time.perf_counter() - started)
+
+
+def timed_stage(stage: str) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        # Coroutine functions get an async wrapper, so the timer covers the awaited work and callers that
+        # check inspect.iscoroutinefunction (call_chain) still await them.
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer(stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_rpc_provider(provider) -> None:
+    # Times every JSON-RPC request a web3 provider sends, labelled by RPC method (eth_call,
+    # eth_estimateGas, eth_getTransactionReceipt, ...); batch requests are labelled "batch".
+    make_request = provider.make_request
+    make_batch_request = getattr(provider, "make_batch_request", None)
+
+    def timed_request(method, params):
+        started = time.perf_counter()
+        try:
+            response = make_request(method, params)
+        except Exception:
+            CHAIN_RPC_ERRORS.labels(str(method)).inc()
+            raise
+        finally:
+            CHAIN_RPC_DURATION.labels(str(method)).observe(time.perf_counter() - started)
+        if isinstance(response, dict) and response.get("error"):
+            CHAIN_RPC_ERRORS.labels(str(method)).inc()
+        return response
+
+    provider.make_request = timed_request
+    if make_batch_request is not None:
+
+        def timed_batch_request(requests):
+            started = time.perf_counter()
+            try:
+                return make_batch_request(requests)
+            except Exception:
+                CHAIN_RPC_ERRORS.labels("batch").inc()
+                raise
+            finally:
+                CHAIN_RPC_DURATION.labels("batch").observe(time.perf_counter() - started)
+
+        provider.make_batch_request = timed_batch_request
+
+
+def instrument_async_rpc_provider(provider) -> None:
+    # Same as instrument_rpc_provider, for web3's AsyncHTTPProvider.
+    make_request = provider.make_request
+
+    async def timed_request(method, params):
+        started = time.perf_counter()
+        try:
+            response = await make_request(method, params)
+        except Exception:
+            CHAIN_RPC_ERRORS.labels(str(method)).inc()
+            raise
+        finally:
+            CHAIN_RPC_DURATION.labels(str(method)).observe(time.perf_counter() - started)
+        if isinstance(response, dict) and response.get("error"):
+            CHAIN_RPC_ERRORS.labels(str(method)).inc()
+        return response
+
+    provider.make_request = timed_request
+
+
+def _statement_operation(statement: str) -> str:
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    return operation if operation in {"SELECT", "INSERT", "UPDATE", "DELETE"} else "OTHER"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    DB_QUERY_DURATION.labels(_statement_operation(statement)).observe(time.perf_counter() - started)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_db_error(context) -> None:
+    stack = context.connection.info.get("query_started") if context.connection is not None else None
+    if stack:
+        stack.pop()
+
+
+def _cache_collector() -> Iterator[str]:
+    stats = cache_stats()
+    for name, kind, field, documentation in (
+        ("cache_hits_total", "counter", "hits", "Cache lookups that found an entry."),
+        ("cache_misses_total", "counter", "misses", "Cache lookups that found no entry."),
+        ("cache_evictions_total", "counter", "evictions", "Entries evicted to stay within the size limit."),
+        ("cache_entries", "gauge", "size", "Entries currently held."),
+    ):
+        yield f"# HELP {name} {documentation}"
+        yield f"# TYPE {name} {kind}"
+        for cache_name, cache in stats.items():
+            if field in cache:
+                yield f'{name}{{cache="{_escape(cache_name)}"}} {_format_value(cache[field])}'
+
+
+REGISTRY.add_collector(_cache_collector)
+
+
+class MetricsMiddleware:
+    # Records per-route latency, status counts and in-flight requests. Routes are labelled by their
+    # template (/batches/{batchId}/verify) so label cardinality stays bounded.
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def recording_send(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels()
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.labels(method, template).observe(elapsed)
+            HTTP_REQUESTS.labels(method, template, str(status_code)).inc()
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import sha256
+import json
+import re
+from typing import BinaryIO
+
+from app.core.config import settings
+from app.core.errors import error_response, raise_api_error
+
+# Multipart boundaries and part headers add a little on top of the file itself.
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+@dataclass
+class UploadDigest:
+    size: int
+    fingerprint: str
+
+
+def fingerprint_upload(source: BinaryIO) -> UploadDigest:
+    # Starlette has already spooled the upload, so it is hashed and size-checked in place and
+    # rewound for the blob store rather than copied to a second temporary file.
+    digest = sha256()
+    size = 0
+    while True:
+        chunk = source.read(settings.upload_chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > settings.max_upload_bytes:
+            raise_api_error(
+                413,
+                "PAYLOAD_TOO_LARGE",
+                f"Uploads are limited to {settings.max_upload_bytes} bytes",
+            )
+        digest.update(chunk)
+    source.seek(0)
+    return UploadDigest(size=size, fingerprint="0x" + digest.hexdigest())
+
+
+class UploadSizeLimitMiddleware:
+    # Rejects oversized uploads before the multipart body is parsed: up front from Content-Length,
+    # or as soon as a chunked body crosses the limit.
+    def __init__(self, app, path_pattern: str) -> None:
+        self.app = app
+        self.path_pattern = re.compile(path_pattern)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or not self.path_pattern.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.max_upload_bytes + _MULTIPART_OVERHEAD_BYTES
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await _send_too_large(send)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise RuntimeError("Upload exceeds size limit")
+            return message
+
+        started = False
+
+        async def guarded_send(message):
+            nonlocal started
+            if exceeded and message["type"] == "http.response.start" and not started:
+                started = True
+                await _send_too_large(send)
+                return
+            if exceeded and started:
+                return
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+            if not started:
+                await _send_too_large(send)
+
+
+async def _send_too_large(send) -> None:
+    body = json.dumps(
+        error_response("PAYLOAD_TOO_LARGE", f"Uploads are limited to {settings.max_upload_bytes} bytes")
+    ).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
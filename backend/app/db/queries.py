@@ -0,0 +1,31 @@
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.batch import Batch
+from app.models.extraction import Extraction
+
+
+async def aget_batch_with_extraction(
+    db: AsyncSession, batch_id: str
+) -> Tuple[Optional[Batch], Optional[Extraction]]:
+    result = await db.execute(
+        select(Batch, Extraction)
+        .outerjoin(Extraction, Extraction.batch_id == Batch.batch_id)
+        .where(Batch.batch_id == batch_id)
+    )
+    row = result.first()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def commit_backfill(db: Session) -> None:
+    # Read paths may fill in attestation columns on legacy extraction rows; keep them.
+    if db.dirty:
+        db.commit()
+
+
+async def acommit_backfill(db: AsyncSession) -> None:
+    if db.dirty:
+        await db.commit()
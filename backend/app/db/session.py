@@ -1,22 +1,60 @@
-from sqlalchemy import create_engine
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
 engine = None
 SessionLocal = None
+async_engine = None
+AsyncSessionLocal = None
+
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(database_url: str, override: Optional[str] = None) -> str:
+    # The request path uses async drivers; derive their URL from DATABASE_URL unless one is configured.
+    if override:
+        return override
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver is configured for '{url.get_backend_name()}'; set ASYNC_DATABASE_URL")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _enable_sqlite_wal(dbapi_connection, _connection_record) -> None:
+    # The sync and async engines each keep their own connections to the same file; in WAL mode
+    # readers do not wait for writers, and writers do not queue on each other's shared locks.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
 
 
 def init_engine() -> None:
     database_url = settings.database_url
     connect_args = {}
+    async_pool_args = {"pool_size": settings.db_async_pool_size, "max_overflow": settings.db_async_max_overflow}
     if database_url.startswith("sqlite"):
         connect_args = {"check_same_thread": False}
+        async_pool_args = {}
     new_engine = create_engine(database_url, connect_args=connect_args)
+    new_async_engine = create_async_engine(
+        async_database_url(database_url, settings.async_database_url), **async_pool_args
+    )
+    if database_url.startswith("sqlite") and ":memory:" not in database_url:
+        event.listen(new_engine, "connect", _enable_sqlite_wal)
+        event.listen(new_async_engine.sync_engine, "connect", _enable_sqlite_wal)
 
-    global engine, SessionLocal
+    global engine, SessionLocal, async_engine, AsyncSessionLocal
     engine = new_engine
     SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    async_engine = new_async_engine
+    # Objects stay readable after commit; lazy refreshes are not possible outside a greenlet.
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 
 init_engine()
@@ -1,10 +1,21 @@
+import gc
+
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.ai.jobs import get_extract_job_queue
+from app.ai.llm_client import get_llm_client
+from app.ai.parse_pool import get_parse_pool
 from app.api.router import api_router
+from app.chain.deps import get_chain_client, get_sync_chain_client
+from app.chain.indexer import get_published_event_indexer
+from app.chain.tracker import get_receipt_tracker
 from app.core.config import settings
 from app.core.errors import http_exception_handler, unhandled_exception_handler, validation_exception_handler
+from app.core.metrics import MetricsMiddleware
+from app.core.uploads import UploadSizeLimitMiddleware
+from app.db import session
 from app.db.init_db import init_db
 
 app = FastAPI(title="Supplement Supply Chain Verification Protocol API")
@@ -15,6 +26,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(UploadSizeLimitMiddleware, path_pattern=r"^/batches/[^/]+/documents$")
+app.add_middleware(MetricsMiddleware)
 app.include_router(api_router)
 
 app.add_exception_handler(Exception, unhandled_exception_handler)
@@ -24,5 +37,27 @@ app.add_exception_handler(HTTPException, http_exception_handler)
 
 @app.on_event("startup")
 def on_startup() -> None:
-    if settings.env != "prod":
+    # create_all is a dev convenience; migrations own the schema in deployed environments.
+    create_all = settings.db_create_all if settings.db_create_all is not None else settings.env != "prod"
+    if create_all:
         init_db()
+    if settings.indexer_enabled:
+        get_published_event_indexer().ensure_started(get_sync_chain_client())
+    get_extract_job_queue().ensure_started()
+    get_receipt_tracker().recover(get_sync_chain_client)
+    if settings.gc_freeze_on_startup:
+        # Full collections would otherwise walk every module-level object on each pass.
+        gc.collect()
+        gc.freeze()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    get_receipt_tracker().stop()
+    get_published_event_indexer().stop()
+    get_extract_job_queue().stop()
+    get_parse_pool().shutdown()
+    get_llm_client().close()
+    if settings.chain_async_client and get_chain_client.cache_info().currsize:
+        await get_chain_client().aclose()
+    await session.async_engine.dispose()
@@ -1,5 +1,27 @@
+from app.models.anchor import MerkleAnchor
 from app.models.batch import Batch, BatchStatus
 from app.models.document import Document
+from app.models.extract_job import ExtractJob, ExtractJobItem, ExtractJobItemStatus, ExtractJobStatus
+from app.models.extracted_text import ExtractedText
 from app.models.extraction import Extraction
+from app.models.llm_result import LLMResult
+from app.models.publish_job import PublishJob, PublishJobStatus
+from app.models.published_event import IndexerCheckpoint, PublishedEvent
 
-__all__ = ["Batch", "BatchStatus", "Document", "Extraction"]
+__all__ = [
+    "Batch",
+    "BatchStatus",
+    "Document",
+    "ExtractJob",
+    "ExtractJobItem",
+    "ExtractJobItemStatus",
+    "ExtractJobStatus",
+    "ExtractedText",
+    "Extraction",
+    "IndexerCheckpoint",
+    "LLMResult",
+    "MerkleAnchor",
+    "PublishJob",
+    "PublishJobStatus",
+    "PublishedEvent",
+]
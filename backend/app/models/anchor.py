@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class MerkleAnchor(Base):
+    __tablename__ = "merkle_anchors"
+
+    root: Mapped[str] = mapped_column(String(66), primary_key=True)
+    leaf_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    chain: Mapped[str] = mapped_column(String(64), nullable=False)
+    tx_hash: Mapped[str] = mapped_column(String(66), nullable=False)
+    block_number: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    publisher_address: Mapped[str | None] = mapped_column(String(42), nullable=True)
+    anchored_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
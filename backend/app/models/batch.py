@@ -1,7 +1,7 @@
 import enum
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Enum, String
+from sqlalchemy import JSON, Date, DateTime, Enum, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -13,10 +13,19 @@ class BatchStatus(str, enum.Enum):
     PUBLISHED = "PUBLISHED"
 
 
+def _default_batch_id_hash(context) -> str:
+    from app.chain.hashing import hash_batch_id
+
+    return "0x" + hash_batch_id(context.get_current_parameters()["batch_id"]).hex()
+
+
 class Batch(Base):
     __tablename__ = "batches"
 
     batch_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    batch_id_hash: Mapped[str | None] = mapped_column(
+        String(66), index=True, nullable=True, default=_default_batch_id_hash
+    )
     product_name: Mapped[str] = mapped_column(String(255), nullable=False)
     supplement_type: Mapped[str] = mapped_column(String(255), nullable=False)
     manufacturer: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -27,3 +36,5 @@ class Batch(Base):
     tx_hash: Mapped[str | None] = mapped_column(String(66), nullable=True)
     publisher_address: Mapped[str | None] = mapped_column(String(42), nullable=True)
     published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    anchor_root: Mapped[str | None] = mapped_column(String(66), index=True, nullable=True)
+    merkle_proof: Mapped[list | None] = mapped_column(JSON, nullable=True)
@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Optional
 
-from sqlalchemy import DateTime, LargeBinary, String
+from sqlalchemy import BigInteger, DateTime, LargeBinary, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -14,5 +15,11 @@ class Document(Base):
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     content_type: Mapped[str] = mapped_column(String(127), nullable=False)
     uploaded_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
-    fingerprint: Mapped[str] = mapped_column(String(66), nullable=False)
+    # Only set for rows uploaded before the blob store; new content lives in the store keyed by fingerprint.
+    data: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    fingerprint: Mapped[str] = mapped_column(String(66), index=True, nullable=False)
+    size_bytes: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+
+    @property
+    def storage_url(self) -> str:
+        return f"/documents/{self.document_id}/content"
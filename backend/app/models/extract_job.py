@@ -0,0 +1,58 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Enum, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ExtractJobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+
+
+class ExtractJobItemStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class ExtractJob(Base):
+    __tablename__ = "extract_jobs"
+
+    job_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    status: Mapped[ExtractJobStatus] = mapped_column(
+        Enum(ExtractJobStatus), index=True, nullable=False, default=ExtractJobStatus.QUEUED
+    )
+    total: Mapped[int] = mapped_column(Integer, nullable=False)
+    force_refresh: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class ExtractJobItem(Base):
+    __tablename__ = "extract_job_items"
+    # Claims look up the oldest queued item overall, or per manufacturer, without scanning the queue.
+    __table_args__ = (
+        Index("ix_extract_job_items_status_item", "status", "item_id"),
+        Index("ix_extract_job_items_status_manufacturer_item", "status", "manufacturer", "item_id"),
+    )
+
+    item_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column(String(36), index=True, nullable=False)
+    batch_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    manufacturer: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
+    status: Mapped[ExtractJobItemStatus] = mapped_column(
+        Enum(ExtractJobItemStatus), index=True, nullable=False, default=ExtractJobItemStatus.QUEUED
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Lease on a RUNNING item: the owning worker renews claimed_at until the item finishes.
+    worker_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
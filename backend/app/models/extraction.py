@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, JSON, String
+from sqlalchemy import DateTime, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -14,3 +14,8 @@ class Extraction(Base):
     model_info: Mapped[dict] = mapped_column(JSON, nullable=False)
     extracted_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     document_fingerprint: Mapped[str] = mapped_column(String(66), nullable=False)
+    # Canonical attestation JSON and its keccak hash, computed when the extraction is written so read
+    # paths never rebuild them. Rows written before these columns existed are filled in lazily.
+    canonical_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+    attestation_hash: Mapped[str | None] = mapped_column(String(66), nullable=True)
+    schema_version: Mapped[str | None] = mapped_column(String(16), nullable=True)
@@ -0,0 +1,33 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class PublishJobStatus(str, enum.Enum):
+    SUBMITTED = "SUBMITTED"
+    MINED = "MINED"
+    CONFIRMED = "CONFIRMED"
+    FAILED = "FAILED"
+
+
+ACTIVE_PUBLISH_JOB_STATUSES = (PublishJobStatus.SUBMITTED, PublishJobStatus.MINED)
+
+
+class PublishJob(Base):
+    __tablename__ = "publish_jobs"
+
+    job_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    batch_id: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    tx_hash: Mapped[str] = mapped_column(String(66), nullable=False)
+    status: Mapped[PublishJobStatus] = mapped_column(
+        Enum(PublishJobStatus), index=True, nullable=False, default=PublishJobStatus.SUBMITTED
+    )
+    block_number: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    confirmations: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class PublishedEvent(Base):
+    __tablename__ = "published_events"
+
+    batch_id_hash: Mapped[str] = mapped_column(String(66), primary_key=True)
+    attestation_hash: Mapped[str] = mapped_column(String(66), nullable=False)
+    publisher: Mapped[str] = mapped_column(String(42), nullable=False)
+    published_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    block_number: Mapped[int] = mapped_column(Integer, index=True, nullable=False)
+    block_hash: Mapped[str] = mapped_column(String(66), nullable=False)
+    tx_hash: Mapped[str] = mapped_column(String(66), nullable=False)
+    log_index: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class IndexerCheckpoint(Base):
+    __tablename__ = "indexer_checkpoints"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    block_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    block_hash: Mapped[str | None] = mapped_column(String(66), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -0,0 +1,9 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class AnchorCreate(BaseModel):
+    batch_ids: Optional[List[str]] = Field(default=None, alias="batchIds")
+
+    model_config = ConfigDict(populate_by_name=True)
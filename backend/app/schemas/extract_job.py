@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.extract_job import ExtractJobStatus
+
+
+class ExtractJobCreate(BaseModel):
+    batch_ids: List[str] = Field(..., alias="batchIds", min_length=1)
+    force_refresh: bool = Field(default=False, alias="forceRefresh")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ExtractJobFailure(BaseModel):
+    batch_id: str = Field(..., alias="batchId")
+    error: Optional[str] = None
+    attempts: int
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ExtractJobProgress(BaseModel):
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+    percent_complete: float = Field(..., alias="percentComplete")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ExtractJob(BaseModel):
+    job_id: str = Field(..., alias="jobId")
+    status: ExtractJobStatus
+    total: int
+    force_refresh: bool = Field(..., alias="forceRefresh")
+    progress: ExtractJobProgress
+    items_per_second: Optional[float] = Field(default=None, alias="itemsPerSecond")
+    failures: List[ExtractJobFailure] = Field(default_factory=list)
+    created_at: datetime = Field(..., alias="createdAt")
+    started_at: Optional[datetime] = Field(default=None, alias="startedAt")
+    finished_at: Optional[datetime] = Field(default=None, alias="finishedAt")
+
+    model_config = ConfigDict(populate_by_name=True)
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.publish_job import PublishJobStatus
+
+
+class PublishJob(BaseModel):
+    job_id: str = Field(..., alias="jobId")
+    batch_id: str = Field(..., alias="batchId")
+    tx_hash: str = Field(..., alias="txHash")
+    status: PublishJobStatus
+    block_number: Optional[int] = Field(default=None, alias="blockNumber")
+    confirmations: int
+    required_confirmations: int = Field(..., alias="requiredConfirmations")
+    error: Optional[str] = None
+    created_at: datetime = Field(..., alias="createdAt")
+    updated_at: datetime = Field(..., alias="updatedAt")
+
+    model_config = ConfigDict(populate_by_name=True)
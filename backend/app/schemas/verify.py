@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -8,7 +8,14 @@ class VerificationResult(BaseModel):
     batch_id: str = Field(..., alias="batchId")
     offchain_hash: str = Field(..., alias="offchainHash")
     onchain_hash: Optional[str] = Field(default=None, alias="onchainHash")
+    anchor_root: Optional[str] = Field(default=None, alias="anchorRoot")
     tx_hash: Optional[str] = Field(default=None, alias="txHash")
     mismatch_reason: Optional[str] = Field(default=None, alias="mismatchReason")
 
     model_config = ConfigDict(populate_by_name=True)
+
+
+class BulkVerifyRequest(BaseModel):
+    batch_ids: List[str] = Field(..., alias="batchIds", min_length=1)
+
+    model_config = ConfigDict(populate_by_name=True)
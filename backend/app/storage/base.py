@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+
+class BlobStore(ABC):
+    # Blobs are content-addressed: the key is the document fingerprint ("0x" + sha256 hex), so a
+    # second upload of the same PDF is a no-op.
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def put_file(self, key: str, source: BinaryIO) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def size(self, key: str) -> int: ...
+
+    @abstractmethod
+    def iter_blobs(self) -> Iterator[Tuple[str, float]]:
+        # (key, last-modified unix time) for every stored blob.
+        ...
+
+    @abstractmethod
+    def iter_range(self, key: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]: ...
+
+    @abstractmethod
+    @contextmanager
+    def open_buffer(self, key: str) -> Iterator[memoryview]: ...
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+
+def blob_name(key: str) -> str:
+    name = key[2:] if key.startswith("0x") else key
+    if len(name) < 4 or not all(char in "0123456789abcdef" for char in name):
+        raise ValueError(f"Invalid blob key '{key}'")
+    return name
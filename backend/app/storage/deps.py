@@ -0,0 +1,19 @@
+from functools import lru_cache
+
+from app.core.config import settings
+from app.storage.base import BlobStore
+from app.storage.local import LocalBlobStore
+
+
+@lru_cache(maxsize=1)
+def get_blob_store() -> BlobStore:
+    if settings.blob_store.lower() == "s3":
+        from app.storage.s3 import S3BlobStore
+
+        return S3BlobStore(
+            bucket=settings.s3_bucket,
+            prefix=settings.s3_prefix,
+            endpoint_url=settings.s3_endpoint_url,
+            region=settings.s3_region,
+        )
+    return LocalBlobStore(settings.blob_store_path)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import time
+from typing import Iterator, List
+
+from sqlalchemy.orm import Session
+
+from app.models.document import Document
+from app.storage.base import BlobStore
+from app.storage.deps import get_blob_store
+
+_SWEEP_BATCH_SIZE = 500
+
+
+@contextmanager
+def open_document_buffer(document: Document) -> Iterator[memoryview]:
+    if document.data is not None:
+        yield memoryview(document.data)
+        return
+    with get_blob_store().open_buffer(document.fingerprint) as buffer:
+        yield buffer
+
+
+def document_size(document: Document) -> int:
+    if document.data is not None:
+        return len(document.data)
+    if document.size_bytes is not None:
+        return document.size_bytes
+    return get_blob_store().size(document.fingerprint)
+
+
+def sweep_orphan_blobs(db: Session, blob_store: BlobStore, grace_seconds: float) -> int:
+    # Blobs are shared by fingerprint, so they are only deleted here, once no document references them and
+    # they are older than the grace period (which covers uploads still between writing and committing).
+    cutoff = time.time() - grace_seconds
+    deleted = 0
+    candidates: List[str] = []
+    for key, modified_at in blob_store.iter_blobs():
+        if modified_at < cutoff:
+            candidates.append(key)
+        if len(candidates) >= _SWEEP_BATCH_SIZE:
+            deleted += _delete_unreferenced(db, blob_store, candidates)
+            candidates = []
+    if candidates:
+        deleted += _delete_unreferenced(db, blob_store, candidates)
+    return deleted
+
+
+def _delete_unreferenced(db: Session, blob_store: BlobStore, keys: List[str]) -> int:
+    referenced = {
+        fingerprint for (fingerprint,) in db.query(Document.fingerprint).filter(Document.fingerprint.in_(keys))
+    }
+    orphans = [key for key in keys if key not in referenced]
+    for key in orphans:
+        blob_store.delete(key)
+    return len(orphans)
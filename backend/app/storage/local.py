@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import mmap
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from app.storage.base import BlobStore, blob_name
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        name = blob_name(key)
+        return self.root / name[:2] / name[2:4] / name
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def put_file(self, key: str, source: BinaryIO) -> None:
+        path = self._path(key)
+        if path.exists():
+            # Refresh the timestamp so the orphan sweep's grace period covers this upload too.
+            os.utime(path)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write next to the target and rename so readers never see a partial blob.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                shutil.copyfileobj(source, handle)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def size(self, key: str) -> int:
+        return self._path(key).stat().st_size
+
+    def iter_blobs(self) -> Iterator[Tuple[str, float]]:
+        for path in self.root.glob("??/??/*"):
+            if path.is_file() and not path.name.startswith(".upload-"):
+                yield "0x" + path.name, path.stat().st_mtime
+
+    def iter_range(self, key: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+        with self._path(key).open("rb") as handle:
+            handle.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = handle.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    @contextmanager
+    def open_buffer(self, key: str) -> Iterator[memoryview]:
+        with self._path(key).open("rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+                mapped.close()
+
+    def local_path(self, key: str) -> Optional[str]:
+        return str(self._path(key))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import mmap
+import tempfile
+from typing import Any, BinaryIO, Iterator, Tuple
+
+from app.storage.base import BlobStore, blob_name
+
+
+class S3BlobStore(BlobStore):
+    # Works against AWS S3 or any S3-compatible server (MinIO, LocalStack) via S3_ENDPOINT_URL.
+    def __init__(
+        self, bucket: str, prefix: str = "", endpoint_url: str = "", region: str = "", client: Any = None
+    ) -> None:
+        if not bucket:
+            raise RuntimeError("S3_BUCKET must be set")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        if client is None:
+            try:
+                import boto3  # type: ignore
+            except ImportError as exc:
+                raise RuntimeError("boto3 must be installed to use BLOB_STORE=s3") from exc
+            client = boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region or None)
+        self.client = client
+
+    def _object_key(self, key: str) -> str:
+        name = blob_name(key)
+        return f"{self.prefix}/{name}" if self.prefix else name
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except self.client.exceptions.ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def put_file(self, key: str, source: BinaryIO) -> None:
+        if self.exists(key):
+            return
+        self.client.upload_fileobj(source, self.bucket, self._object_key(key))
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def size(self, key: str) -> int:
+        head = self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        return head["ContentLength"]
+
+    def iter_blobs(self) -> Iterator[Tuple[str, float]]:
+        prefix = f"{self.prefix}/" if self.prefix else ""
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get("Contents", []):
+                yield "0x" + item["Key"][len(prefix) :], item["LastModified"].timestamp()
+
+    def iter_range(self, key: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+        response = self.client.get_object(
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Range=f"bytes={start}-{end}",
+        )
+        yield from response["Body"].iter_chunks(chunk_size)
+
+    @contextmanager
+    def open_buffer(self, key: str) -> Iterator[memoryview]:
+        # Objects are downloaded to a temporary file and mapped, so parsing still avoids one large bytes copy.
+        with tempfile.TemporaryFile() as handle:
+            self.client.download_fileobj(self.bucket, self._object_key(key), handle)
+            handle.flush()
+            if handle.tell() == 0:
+                yield memoryview(b"")
+                return
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+                mapped.close()
@@ -0,0 +1,393 @@
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import itertools
+import json
+import os
+from pathlib import Path
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import update
+
+from benchmarks.seed import SAMPLE_PDF, batch_id_for, parse_size, seed
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+API_KEY = "bench-key"
+SCENARIOS = ("verify", "attestation", "publish", "upload")
+
+# A request factory takes the request index and returns (method, path, request kwargs).
+RequestFactory = Callable[[int], tuple]
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(client, factory: RequestFactory, expected_status: int, requests: int, concurrency: int, warmup: int) -> Dict:
+    # Runs `warmup` unrecorded requests, then `requests` timed ones spread over `concurrency` threads.
+    def send(index: int) -> tuple:
+        method, path, kwargs = factory(index)
+        started = time.perf_counter()
+        response = client.request(method, path, **kwargs)
+        return time.perf_counter() - started, response.status_code
+
+    for index in range(warmup):
+        send(index)
+
+    counter = itertools.count(warmup)
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            index = next(counter)
+            if index >= warmup + requests:
+                return
+            elapsed, status_code = send(index)
+            with lock:
+                latencies.append(elapsed)
+                if status_code != expected_status:
+                    errors[str(status_code)] = errors.get(str(status_code), 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    wall = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50Ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99Ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "meanMs": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "rps": round(requests / wall, 1) if wall else 0.0,
+    }
+
+
+def scenario_factories(batch_count: int, publish_ids: Sequence[str], seed_value: int) -> Dict[str, tuple]:
+    rng = random.Random(seed_value)
+    lock = threading.Lock()
+    sample = SAMPLE_PDF.read_bytes()
+    headers = {"X-API-Key": API_KEY}
+
+    def random_batch_id() -> str:
+        with lock:
+            return batch_id_for(rng.randrange(batch_count))
+
+    def verify(_: int) -> tuple:
+        return "GET", f"/batches/{random_batch_id()}/verify", {}
+
+    def attestation(_: int) -> tuple:
+        return "GET", f"/batches/{random_batch_id()}/attestation", {"headers": headers}
+
+    def publish(index: int) -> tuple:
+        return "POST", f"/batches/{publish_ids[index % len(publish_ids)]}/publish", {"headers": headers}
+
+    def upload(index: int) -> tuple:
+        # A unique trailing comment gives every upload its own fingerprint, so each one writes a blob.
+        content = sample + f"\n%bench-{seed_value}-{index}\n".encode()
+        files = {"file": ("coa.pdf", content, "application/pdf")}
+        return "POST", f"/batches/{random_batch_id()}/documents", {"headers": headers, "files": files}
+
+    return {
+        "verify": (verify, 200),
+        "attestation": (attestation, 200),
+        "publish": (publish, 200),
+        "upload": (upload, 201),
+    }
+
+
+def reset_published(batch_ids: Sequence[str]) -> None:
+    # Publishing consumes READY batches; put them back so repeated runs against one database match.
+    from app.db import session
+    from app.models.batch import Batch, BatchStatus
+
+    with session.engine.begin() as connection:
+        connection.execute(
+            update(Batch)
+            .where(Batch.batch_id.in_(list(batch_ids)))
+            .values(status=BatchStatus.READY, tx_hash=None, publisher_address=None, published_at=None, chain=None)
+        )
+
+
+def chain_settings(rpc_url: Optional[str]) -> Dict[str, str]:
+    # Settings that point the app at a chain simulator, or at the in-memory mock when there is none.
+    if rpc_url is None:
+        return {"chain_mode": "mock"}
+    from benchmarks.simulator import DEFAULT_CONTRACT, DEV_PRIVATE_KEYS
+
+    return {
+        "chain_mode": "real",
+        "chain_rpc_url": rpc_url,
+        "chain_rpc_urls": rpc_url,
+        "chain_write_rpc_urls": "",
+        "contract_address": DEFAULT_CONTRACT,
+        "chain_id": "1337",
+        "publisher_private_keys": ",".join(DEV_PRIVATE_KEYS),
+    }
+
+
+def configure(database_url: str, blob_store_path: str, chain: Optional[Dict[str, str]] = None) -> None:
+    from app.chain.cache import get_attestation_cache
+    from app.chain.deps import get_chain_client, get_sync_chain_client
+    from app.chain.rpc_pool import get_rpc_pool
+    from app.core import config
+    from app.db import session
+    from app.storage.deps import get_blob_store
+
+    config.settings.database_url = database_url
+    config.settings.blob_store_path = blob_store_path
+    config.settings.admin_api_key = API_KEY
+    for name, value in (chain or chain_settings(None)).items():
+        setattr(config.settings, name, int(value) if name == "chain_id" else value)
+    config.settings.llm_provider = "mock"
+    config.settings.indexer_enabled = False
+    config.settings.publish_tracker_interval = 0
+    config.settings.extract_workers = 0
+    get_blob_store.cache_clear()
+    get_rpc_pool.cache_clear()
+    get_sync_chain_client.cache_clear()
+    get_chain_client.cache_clear()
+    get_attestation_cache().clear()
+    session.init_engine()
+
+
+@contextmanager
+def in_process_client() -> Iterator:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@contextmanager
+def uvicorn_client(
+    database_url: str, blob_store_path: str, workers: int, concurrency: int, chain: Dict[str, str]
+) -> Iterator:
+    import httpx
+
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "BLOB_STORE_PATH": blob_store_path,
+        "ADMIN_API_KEY": API_KEY,
+        **{name.upper(): value for name, value in chain.items()},
+        "LLM_PROVIDER": "mock",
+        "INDEXER_ENABLED": "false",
+        "PUBLISH_TRACKER_INTERVAL": "0",
+        "EXTRACT_WORKERS": "0",
+        "DB_CREATE_ALL": "true",
+    }
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30.0) as client:
+            _wait_for_health(client, process)
+            yield client
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_health(client, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+        try:
+            if client.get("/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("uvicorn did not become healthy")
+
+
+def run(
+    size: str,
+    mode: str = "inprocess",
+    scenarios: Sequence[str] = SCENARIOS,
+    requests: int = 1000,
+    concurrency: int = 8,
+    warmup: int = 50,
+    workers: int = 1,
+    database_url: Optional[str] = None,
+    blob_store_path: Optional[str] = None,
+    seed_value: int = 1,
+    chain: str = "mock",
+    block_time: float = 1.0,
+    rpc_latency: float = 0.0,
+) -> Dict:
+    batch_count = parse_size(size)
+    work_dir = Path(tempfile.gettempdir()) / "ssc-benchmarks"
+    database_url = database_url or f"sqlite:///{work_dir / f'bench-{size}.db'}"
+    blob_store_path = blob_store_path or str(work_dir / "blobs")
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    simulator = None
+    if chain == "sim":
+        # The real chain client against a local simulated node, with realistic block times and latency.
+        from benchmarks.simulator import ChainSimulator, SimulatorConfig, SimulatorServer
+
+        simulator = SimulatorServer(ChainSimulator(SimulatorConfig(block_time=block_time, latency=rpc_latency)))
+        simulator.start()
+    chain_config = chain_settings(simulator.url if simulator else None)
+    configure(database_url, blob_store_path, chain_config)
+    seed_started = time.perf_counter()
+    seeded = seed(batch_count)
+    seed_seconds = time.perf_counter() - seed_started
+
+    # Publish takes distinct batches from the end of the range, which the other scenarios rarely touch.
+    publish_count = min(batch_count, warmup + requests)
+    publish_ids = [batch_id_for(index) for index in range(batch_count - publish_count, batch_count)]
+    reset_published(publish_ids)
+    factories = scenario_factories(batch_count, publish_ids, seed_value)
+
+    if mode == "uvicorn":
+        client_context = uvicorn_client(database_url, blob_store_path, workers, concurrency, chain_config)
+    else:
+        client_context = in_process_client()
+
+    results: Dict[str, Dict] = {}
+    try:
+        with client_context as client:
+            for name in scenarios:
+                factory, expected_status = factories[name]
+                results[name] = measure(client, factory, expected_status, requests, concurrency, warmup)
+    finally:
+        if simulator:
+            simulator.stop()
+
+    return {
+        "meta": {
+            "size": size,
+            "batches": batch_count,
+            "mode": mode,
+            "workers": workers if mode == "uvicorn" else 1,
+            "chain": chain,
+            **({"blockTime": block_time, "rpcLatency": rpc_latency} if chain == "sim" else {}),
+            "requests": requests,
+            "concurrency": concurrency,
+            "warmup": warmup,
+            "database": database_url.split(":", 1)[0],
+            "seededBatches": seeded,
+            "seedSeconds": round(seed_seconds, 1),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": _git_commit(),
+            "recordedAt": datetime.now(timezone.utc).isoformat(),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    # Returns one line per regression: p99 above, or throughput below, the baseline by more than
+    # `tolerance` (a fraction). Scenarios missing from either side are ignored.
+    regressions = []
+    for name, current in result["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        if current["errors"]:
+            regressions.append(f"{name}: unexpected responses {current['errors']}")
+        if current["p99Ms"] > previous["p99Ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {current['p99Ms']}ms vs baseline {previous['p99Ms']}ms")
+        if current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {current['rps']} req/s vs baseline {previous['rps']} req/s")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return output.stdout.strip() or None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure latency and throughput of the API hot paths.")
+    parser.add_argument("--size", default="10k", help="10k, 100k, 1m or a batch count")
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="repeatable; defaults to all")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--chain", choices=("mock", "sim"), default="mock", help="sim runs a local simulated node")
+    parser.add_argument("--block-time", type=float, default=1.0, help="simulated seconds per block")
+    parser.add_argument("--rpc-latency", type=float, default=0.0, help="simulated seconds per RPC request")
+    parser.add_argument("--database-url", help="defaults to a SQLite file per size in the temp dir")
+    parser.add_argument("--blob-store-path")
+    parser.add_argument("--output", help="write the result JSON here")
+    parser.add_argument("--baseline", help="compare against this result JSON and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    result = run(
+        args.size,
+        mode=args.mode,
+        scenarios=args.scenario or SCENARIOS,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        warmup=args.warmup,
+        workers=args.workers,
+        database_url=args.database_url,
+        blob_store_path=args.blob_store_path,
+        chain=args.chain,
+        block_time=args.block_time,
+        rpc_latency=args.rpc_latency,
+    )
+    text = json.dumps(result, indent=2) + "\n"
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text, end="")
+
+    if args.baseline:
+        regressions = compare(result, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, timezone
+from hashlib import sha256
+import io
+from pathlib import Path
+import time
+from typing import Dict, List
+
+from sqlalchemy import func, insert, select
+
+from app.attestation.canonical import SCHEMA_VERSION
+from app.chain.hashing import build_attestation_json, hash_attestation, hash_batch_id, to_hex
+from app.core import config
+from app.db import session
+from app.db.init_db import init_db
+from app.models.batch import Batch, BatchStatus
+from app.models.document import Document
+from app.models.extraction import Extraction
+from app.schemas.extraction import ExtractionResult
+from app.storage.deps import get_blob_store
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+SAMPLE_PDF = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "sample.pdf"
+
+# A realistic extraction: a handful of analytes and contaminants, similar to a typical COA.
+EXTRACTED_FIELDS = {
+    "labName": "Benchmark Analytical Labs",
+    "reportDate": "2025-01-15",
+    "productOrSampleName": "Magnesium Glycinate 200mg",
+    "lotOrBatchInReport": None,
+    "potency": {"name": "Magnesium", "amount": "201.4", "unit": "mg"},
+    "analytes": [
+        {"name": "Magnesium", "result": "201.4", "unit": "mg", "limit": ">=180", "status": "PASS"},
+        {"name": "Glycine", "result": "812", "unit": "mg", "limit": ">=720", "status": "PASS"},
+    ],
+    "contaminants": [
+        {"name": "Lead", "result": "0.12", "unit": "ppm", "limit": "<=0.5", "status": "PASS"},
+        {"name": "Arsenic", "result": "0.05", "unit": "ppm", "limit": "<=1.0", "status": "PASS"},
+        {"name": "Cadmium", "result": "0.02", "unit": "ppm", "limit": "<=0.3", "status": "PASS"},
+        {"name": "Mercury", "result": "0.01", "unit": "ppm", "limit": "<=0.2", "status": "PASS"},
+    ],
+    "methods": ["ICP-MS", "HPLC"],
+    "notes": None,
+    "confidence": 0.92,
+}
+MODEL_INFO = {"modelName": "mock", "version": "0"}
+
+MANUFACTURERS = 50
+CHUNK_SIZE = 5_000
+
+
+def parse_size(value: str) -> int:
+    return SIZES.get(value.lower()) or int(value)
+
+
+def batch_id_for(index: int) -> str:
+    return f"BENCH-{index:07d}"
+
+
+def seed(count: int, ready_fraction: float = 1.0) -> int:
+    # Seeds `count` batches, each with an extraction (attestation precomputed, as run_extraction does)
+    # and one document row. All documents share one blob, like a COA reused across lots. Returns the
+    # number of rows added; an already seeded database is topped up rather than duplicated.
+    init_db()
+    db = session.SessionLocal()
+    try:
+        existing = db.scalar(select(func.count()).select_from(Batch))
+    finally:
+        db.close()
+    if existing >= count:
+        return 0
+
+    fingerprint = _store_sample_document()
+    size_bytes = SAMPLE_PDF.stat().st_size
+    ready_until = int(count * ready_fraction)
+    result = ExtractionResult.model_validate(EXTRACTED_FIELDS)
+    extracted_at = datetime.now(timezone.utc)
+
+    for start in range(existing, count, CHUNK_SIZE):
+        indexes = range(start, min(count, start + CHUNK_SIZE))
+        batches: List[Dict] = []
+        extractions: List[Dict] = []
+        documents: List[Dict] = []
+        for index in indexes:
+            batch_row = _batch_row(index, BatchStatus.READY if index < ready_until else BatchStatus.DRAFT)
+            canonical_json = build_attestation_json(Batch(**batch_row), result, fingerprint)
+            batches.append(batch_row)
+            extractions.append(
+                {
+                    "batch_id": batch_row["batch_id"],
+                    "extracted_fields": EXTRACTED_FIELDS,
+                    "model_info": MODEL_INFO,
+                    "extracted_at": extracted_at,
+                    "document_fingerprint": fingerprint,
+                    "canonical_json": canonical_json,
+                    "attestation_hash": to_hex(hash_attestation(canonical_json)),
+                    "schema_version": SCHEMA_VERSION,
+                }
+            )
+            documents.append(
+                {
+                    "document_id": f"00000000-0000-0000-0000-{index:012d}",
+                    "batch_id": batch_row["batch_id"],
+                    "filename": "coa.pdf",
+                    "content_type": "application/pdf",
+                    "uploaded_at": extracted_at,
+                    "fingerprint": fingerprint,
+                    "size_bytes": size_bytes,
+                }
+            )
+        with session.engine.begin() as connection:
+            connection.execute(insert(Batch), batches)
+            connection.execute(insert(Extraction), extractions)
+            connection.execute(insert(Document), documents)
+    return count - existing
+
+
+def _batch_row(index: int, status: BatchStatus) -> Dict:
+    batch_id = batch_id_for(index)
+    return {
+        "batch_id": batch_id,
+        "batch_id_hash": to_hex(hash_batch_id(batch_id)),
+        "product_name": "Magnesium Glycinate 200mg",
+        "supplement_type": "Mineral",
+        "manufacturer": f"Manufacturer {index % MANUFACTURERS:02d}",
+        "production_date": date(2025, 1, 1),
+        "expires_date": date(2027, 1, 1),
+        "status": status,
+    }
+
+
+def _store_sample_document() -> str:
+    data = SAMPLE_PDF.read_bytes()
+    fingerprint = "0x" + sha256(data).hexdigest()
+    get_blob_store().put_file(fingerprint, io.BytesIO(data))
+    return fingerprint
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a database with benchmark batches.")
+    parser.add_argument("--size", default="10k", help="10k, 100k, 1m or a batch count")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--blob-store-path", required=True)
+    args = parser.parse_args()
+
+    config.settings.database_url = args.database_url
+    config.settings.blob_store_path = args.blob_store_path
+    get_blob_store.cache_clear()
+    session.init_engine()
+    started = time.perf_counter()
+    added = seed(parse_size(args.size))
+    print(f"Seeded {added} batches in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,685 @@
+from __future__ import annotations
+
+# A local JSON-RPC node that runs BatchHashRegistry, for exercising the real chain clients offline:
+# signed raw transactions, a mempool with replacement rules, timed block production, receipts, logs
+# and view calls. Start it in-process with SimulatorServer or as a subprocess with
+# `python -m benchmarks.simulator --port 8545 --block-time 1`.
+
+import argparse
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.chain.hashing import hex_to_bytes, keccak_bytes, keccak_text, to_hex
+
+DEFAULT_CONTRACT = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+# Deterministic development keys; the simulator has no balances, so any key can publish.
+DEV_PRIVATE_KEYS = [to_hex(keccak_text(f"chain-simulator-key-{index}")) for index in range(8)]
+
+ZERO32 = b"\x00" * 32
+INTRINSIC_GAS = 21_000
+PUBLISH_GAS = 46_000
+PUBLISH_ROOT_GAS = 45_000
+REVERT_GAS = 23_500
+REPLACEMENT_BUMP = 1.10
+
+PUBLISHED_TOPIC = keccak_text("Published(bytes32,bytes32,address,uint256)")
+ROOT_PUBLISHED_TOPIC = keccak_text("RootPublished(bytes32,address,uint256)")
+
+
+def _selector(signature: str) -> bytes:
+    return keccak_text(signature)[:4]
+
+
+SELECTORS = {
+    _selector("publish(bytes32,bytes32)"): "publish",
+    _selector("publishRoot(bytes32)"): "publishRoot",
+    _selector("get(bytes32)"): "get",
+    _selector("getMany(bytes32[])"): "getMany",
+    _selector("getRoot(bytes32)"): "getRoot",
+    _selector("attestationHashByBatchId(bytes32)"): "get",
+    _selector("anchoredAtByRoot(bytes32)"): "getRoot",
+}
+
+
+class RpcError(Exception):
+    def __init__(self, message: str, code: int = -32000, data: Optional[str] = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class Reverted(Exception):
+    pass
+
+
+@dataclass
+class SimulatorConfig:
+    chain_id: int = 1337
+    contract_address: str = DEFAULT_CONTRACT
+    # Seconds between blocks; 0 mines each transaction as soon as it arrives.
+    block_time: float = 1.0
+    # Added to every RPC request, plus up to `latency_jitter` extra.
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # Fraction of requests that fail: "http" answers 503, "rpc" returns a JSON-RPC internal error.
+    error_rate: float = 0.0
+    error_kind: str = "http"
+    mempool_size: int = 5000
+    # Transactions per block; 0 is unlimited. Lower it to make transactions queue up.
+    max_block_txs: int = 0
+    base_fee: int = 10**9
+    priority_fee: int = 10**8
+    seed: Optional[int] = None
+
+
+@dataclass
+class SimTransaction:
+    hash: str
+    sender: str
+    nonce: int
+    to: Optional[str]
+    data: bytes
+    gas: int
+    max_fee: int
+    priority_fee: int
+    type: int
+    received_at: float = field(default_factory=time.monotonic)
+    block_number: Optional[int] = None
+    index: Optional[int] = None
+
+
+class ChainSimulator:
+    def __init__(self, config: Optional[SimulatorConfig] = None) -> None:
+        self.config = config or SimulatorConfig()
+        self.contract = self.config.contract_address.lower()
+        self._lock = threading.RLock()
+        self._random = random.Random(self.config.seed)
+        self._attestations: Dict[bytes, bytes] = {}
+        self._roots: Dict[bytes, int] = {}
+        self._nonces: Dict[str, int] = {}
+        # Pending transactions by sender, then nonce.
+        self._mempool: Dict[str, Dict[int, SimTransaction]] = {}
+        self._pending_count = 0
+        self._transactions: Dict[str, SimTransaction] = {}
+        self._receipts: Dict[str, dict] = {}
+        self._logs: List[dict] = []
+        self._blocks: List[dict] = []
+        self.requests: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._append_block([], 0)
+
+    # -- block production ---------------------------------------------------------------------
+
+    def ensure_started(self) -> None:
+        if self.config.block_time <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="chain-simulator", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.config.block_time):
+            self.mine()
+
+    def mine(self) -> dict:
+        # Includes the best-paying executable transactions (next nonce per sender) that meet the
+        # current base fee, up to `max_block_txs`. Only each sender's next transaction is in the heap;
+        # including it pushes the one after it.
+        with self._lock:
+            heads: List[Tuple[int, float, int, SimTransaction]] = []
+            order = itertools.count()
+
+            def push_next(sender: str) -> None:
+                tx = self._mempool.get(sender, {}).get(self._nonces.get(sender, 0))
+                if tx is not None and tx.max_fee >= self.config.base_fee:
+                    heapq.heappush(heads, (-self._tip(tx), tx.received_at, next(order), tx))
+
+            for sender in self._mempool:
+                push_next(sender)
+            included: List[SimTransaction] = []
+            limit = self.config.max_block_txs or self._pending_count
+            while heads and len(included) < limit:
+                tx = heapq.heappop(heads)[-1]
+                self._remove_pending(tx)
+                self._nonces[tx.sender] = tx.nonce + 1
+                included.append(tx)
+                push_next(tx.sender)
+            return self._append_block(included, int(time.time()))
+
+    def _remove_pending(self, tx: SimTransaction) -> None:
+        pending = self._mempool[tx.sender]
+        del pending[tx.nonce]
+        if not pending:
+            del self._mempool[tx.sender]
+        self._pending_count -= 1
+
+    def _append_block(self, transactions: List[SimTransaction], timestamp: int) -> dict:
+        number = len(self._blocks)
+        parent = self._blocks[-1]["hash"] if self._blocks else to_hex(ZERO32)
+        block_hash = to_hex(keccak_text(f"simulated-block:{number}:{parent}"))
+        timestamp = max(timestamp, self._blocks[-1]["timestamp"] if self._blocks else 0)
+        cumulative = 0
+        log_index = 0
+        for index, tx in enumerate(transactions):
+            tx.block_number, tx.index = number, index
+            gas_used, status, logs = self._execute(tx, block_hash, number, timestamp, index, log_index)
+            cumulative += gas_used
+            log_index += len(logs)
+            self._receipts[tx.hash] = {
+                "transactionHash": tx.hash,
+                "transactionIndex": hex(index),
+                "blockHash": block_hash,
+                "blockNumber": hex(number),
+                "from": tx.sender,
+                "to": tx.to,
+                "cumulativeGasUsed": hex(cumulative),
+                "gasUsed": hex(gas_used),
+                "effectiveGasPrice": hex(self.config.base_fee + self._tip(tx)),
+                "contractAddress": None,
+                "logs": logs,
+                "logsBloom": "0x" + "00" * 256,
+                "status": hex(status),
+                "type": hex(tx.type),
+            }
+        block = {
+            "number": number,
+            "hash": block_hash,
+            "parentHash": parent,
+            "timestamp": timestamp,
+            "transactions": [tx.hash for tx in transactions],
+            "gasUsed": cumulative,
+        }
+        self._blocks.append(block)
+        return block
+
+    def _tip(self, tx: SimTransaction) -> int:
+        return min(tx.priority_fee, tx.max_fee - self.config.base_fee)
+
+    def _execute(
+        self, tx: SimTransaction, block_hash: str, number: int, timestamp: int, index: int, log_index: int
+    ):
+        if (tx.to or "").lower() != self.contract:
+            return INTRINSIC_GAS, 1, []
+        try:
+            gas_needed, effect = self._plan(tx.data, tx.sender, timestamp)
+        except Reverted:
+            return min(REVERT_GAS, tx.gas), 0, []
+        if tx.gas < gas_needed:
+            return tx.gas, 0, []
+        topic, indexed, data = effect()
+        log = {
+            "address": self.config.contract_address,
+            "topics": [to_hex(topic), to_hex(indexed)],
+            "data": to_hex(data),
+            "blockNumber": hex(number),
+            "blockHash": block_hash,
+            "transactionHash": tx.hash,
+            "transactionIndex": hex(index),
+            "logIndex": hex(log_index),
+            "removed": False,
+        }
+        self._logs.append(log)
+        return gas_needed, 1, [log]
+
+    def _plan(self, data: bytes, sender: str, timestamp: int) -> Tuple[int, Callable[[], tuple]]:
+        # Checks a contract write the way BatchHashRegistry does; returns its gas and a callable that
+        # applies it and returns (event topic, indexed argument, event data).
+        from eth_abi import decode, encode
+
+        name = SELECTORS.get(data[:4])
+        if name == "publish":
+            batch_id_hash, attestation_hash = decode(["bytes32", "bytes32"], data[4:])
+            if batch_id_hash == ZERO32:
+                raise Reverted("BATCH_ID_REQUIRED")
+            if attestation_hash == ZERO32:
+                raise Reverted("ATTESTATION_REQUIRED")
+            if batch_id_hash in self._attestations:
+                raise Reverted("ALREADY_PUBLISHED")
+
+            def apply():
+                self._attestations[batch_id_hash] = attestation_hash
+                payload = encode(["bytes32", "address", "uint256"], [attestation_hash, sender, timestamp])
+                return PUBLISHED_TOPIC, batch_id_hash, payload
+
+            return PUBLISH_GAS, apply
+        if name == "publishRoot":
+            (root,) = decode(["bytes32"], data[4:])
+            if root == ZERO32:
+                raise Reverted("ROOT_REQUIRED")
+            if root in self._roots:
+                raise Reverted("ALREADY_PUBLISHED")
+
+            def apply_root():
+                self._roots[root] = timestamp
+                return ROOT_PUBLISHED_TOPIC, root, encode(["address", "uint256"], [sender, timestamp])
+
+            return PUBLISH_ROOT_GAS, apply_root
+        raise Reverted("")
+
+    # -- JSON-RPC -------------------------------------------------------------------------------
+
+    def handle(self, method: str, params: List[Any]) -> Any:
+        with self._lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            handler = getattr(self, "rpc_" + method, None)
+            if handler is None:
+                raise RpcError(f"the method {method} does not exist/is not available", code=-32601)
+            return handler(*params)
+
+    def rpc_eth_chainId(self) -> str:
+        return hex(self.config.chain_id)
+
+    def rpc_net_version(self) -> str:
+        return str(self.config.chain_id)
+
+    def rpc_web3_clientVersion(self) -> str:
+        return "chain-simulator/1.0"
+
+    def rpc_eth_syncing(self) -> bool:
+        return False
+
+    def rpc_eth_blockNumber(self) -> str:
+        return hex(self.head)
+
+    def rpc_eth_gasPrice(self) -> str:
+        return hex(self.config.base_fee + self.config.priority_fee)
+
+    def rpc_eth_maxPriorityFeePerGas(self) -> str:
+        return hex(self.config.priority_fee)
+
+    def rpc_eth_getBlockByNumber(self, tag: str, full: bool = False) -> Optional[dict]:
+        number = self._block_number(tag)
+        return self._format_block(self._blocks[number]) if number <= self.head else None
+
+    def rpc_eth_getBlockByHash(self, block_hash: str, full: bool = False) -> Optional[dict]:
+        for block in self._blocks:
+            if block["hash"] == block_hash:
+                return self._format_block(block)
+        return None
+
+    def rpc_eth_getTransactionCount(self, address: str, tag: str = "latest") -> str:
+        sender = address.lower()
+        nonce = self._nonces.get(sender, 0)
+        if tag == "pending":
+            pending = self._mempool.get(sender, {})
+            while nonce in pending:
+                nonce += 1
+        return hex(nonce)
+
+    def rpc_eth_call(self, call: dict, tag: str = "latest") -> str:
+        from eth_abi import decode, encode
+
+        if (call.get("to") or "").lower() != self.contract:
+            return "0x"
+        data = hex_to_bytes(call.get("data") or call.get("input") or "0x")
+        name = SELECTORS.get(data[:4])
+        if name == "get":
+            (batch_id_hash,) = decode(["bytes32"], data[4:])
+            return to_hex(self._attestations.get(batch_id_hash, ZERO32))
+        if name == "getMany":
+            (hashes,) = decode(["bytes32[]"], data[4:])
+            return to_hex(encode(["bytes32[]"], [[self._attestations.get(value, ZERO32) for value in hashes]]))
+        if name == "getRoot":
+            (root,) = decode(["bytes32"], data[4:])
+            return to_hex(encode(["uint256"], [self._roots.get(root, 0)]))
+        if name in ("publish", "publishRoot"):
+            self._dry_run(call, data)
+            return "0x"
+        raise _revert("")
+
+    def rpc_eth_estimateGas(self, call: dict, tag: str = "latest") -> str:
+        if (call.get("to") or "").lower() != self.contract:
+            return hex(INTRINSIC_GAS)
+        return hex(self._dry_run(call, hex_to_bytes(call.get("data") or call.get("input") or "0x")))
+
+    def _dry_run(self, call: dict, data: bytes) -> int:
+        try:
+            gas, _apply = self._plan(data, (call.get("from") or "0x" + "00" * 20).lower(), int(time.time()))
+        except Reverted as exc:
+            raise _revert(str(exc))
+        return gas
+
+    def rpc_eth_sendRawTransaction(self, raw_hex: str) -> str:
+        tx = self._decode(hex_to_bytes(raw_hex))
+        pending = self._mempool.get(tx.sender, {})
+        known = self._transactions.get(tx.hash)
+        if known is not None and (known.block_number is not None or tx.nonce in pending):
+            raise RpcError("already known")
+        if tx.nonce < self._nonces.get(tx.sender, 0):
+            raise RpcError(f"nonce too low: next nonce {self._nonces.get(tx.sender, 0)}, tx nonce {tx.nonce}")
+        if tx.gas < INTRINSIC_GAS:
+            raise RpcError("intrinsic gas too low")
+        if tx.max_fee < self.config.base_fee:
+            raise RpcError("transaction underpriced")
+        current = pending.get(tx.nonce)
+        if current is not None:
+            if tx.max_fee < current.max_fee * REPLACEMENT_BUMP or tx.priority_fee < current.priority_fee * REPLACEMENT_BUMP:
+                raise RpcError("replacement transaction underpriced")
+        elif self._pending_count >= self.config.mempool_size:
+            raise RpcError("txpool is full")
+        else:
+            self._pending_count += 1
+        self._mempool.setdefault(tx.sender, {})[tx.nonce] = tx
+        self._transactions[tx.hash] = tx
+        if self.config.block_time <= 0:
+            self.mine()
+        return tx.hash
+
+    def rpc_eth_getTransactionReceipt(self, tx_hash: str) -> Optional[dict]:
+        return self._receipts.get(tx_hash)
+
+    def rpc_eth_getTransactionByHash(self, tx_hash: str) -> Optional[dict]:
+        tx = self._transactions.get(tx_hash)
+        if tx is None:
+            return None
+        mined = tx.block_number is not None
+        return {
+            "hash": tx.hash,
+            "from": tx.sender,
+            "to": tx.to,
+            "nonce": hex(tx.nonce),
+            "gas": hex(tx.gas),
+            "gasPrice": hex(tx.max_fee),
+            "input": to_hex(tx.data),
+            "value": "0x0",
+            "type": hex(tx.type),
+            "blockNumber": hex(tx.block_number) if mined else None,
+            "blockHash": self._blocks[tx.block_number]["hash"] if mined else None,
+            "transactionIndex": hex(tx.index) if mined else None,
+        }
+
+    def rpc_eth_getLogs(self, query: dict) -> List[dict]:
+        from_block = self._block_number(query.get("fromBlock", "latest"))
+        to_block = self._block_number(query.get("toBlock", "latest"))
+        addresses = query.get("address")
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {address.lower() for address in addresses} if addresses else None
+        topics = query.get("topics") or []
+        matched = []
+        for log in self._logs:
+            if not from_block <= int(log["blockNumber"], 16) <= to_block:
+                continue
+            if addresses is not None and log["address"].lower() not in addresses:
+                continue
+            if all(_topic_matches(wanted, log["topics"], position) for position, wanted in enumerate(topics)):
+                matched.append(log)
+        return matched
+
+    # -- helpers --------------------------------------------------------------------------------
+
+    @property
+    def head(self) -> int:
+        return len(self._blocks) - 1
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._pending_count
+
+    def attestation(self, batch_id_hash: bytes) -> Optional[bytes]:
+        with self._lock:
+            return self._attestations.get(batch_id_hash)
+
+    def set_base_fee(self, base_fee: int) -> None:
+        # Raising the base fee above a pending transaction's fee cap keeps it in the mempool.
+        with self._lock:
+            self.config.base_fee = base_fee
+
+    def _block_number(self, tag: Any) -> int:
+        if isinstance(tag, int):
+            return tag
+        if tag in ("latest", "pending", "safe", "finalized"):
+            return self.head
+        if tag == "earliest":
+            return 0
+        return int(tag, 16)
+
+    def _format_block(self, block: dict) -> dict:
+        return {
+            "number": hex(block["number"]),
+            "hash": block["hash"],
+            "parentHash": block["parentHash"],
+            "timestamp": hex(block["timestamp"]),
+            "transactions": block["transactions"],
+            "gasUsed": hex(block["gasUsed"]),
+            "gasLimit": hex(30_000_000),
+            "baseFeePerGas": hex(self.config.base_fee),
+            "miner": "0x" + "00" * 20,
+            "difficulty": "0x0",
+            "totalDifficulty": "0x0",
+            "extraData": "0x",
+            "size": "0x0",
+            "nonce": "0x" + "00" * 8,
+            "sha3Uncles": "0x" + "00" * 32,
+            "logsBloom": "0x" + "00" * 256,
+            "transactionsRoot": "0x" + "00" * 32,
+            "stateRoot": "0x" + "00" * 32,
+            "receiptsRoot": "0x" + "00" * 32,
+            "mixHash": "0x" + "00" * 32,
+            "uncles": [],
+        }
+
+    def _decode(self, raw: bytes) -> SimTransaction:
+        import rlp
+        from eth_account import Account
+
+        try:
+            sender = Account.recover_transaction(raw).lower()
+            # Legacy transactions are a bare RLP list; typed ones (EIP-2718) are a type byte and a list.
+            if raw[0] >= 0xC0:
+                nonce, gas_price, gas, to, _value, data, v, _r, _s = rlp.decode(raw)
+                v = _to_int(v)
+                chain_id = (v - 35) // 2 if v >= 35 else None
+                tx_type, max_fee, priority_fee = 0, _to_int(gas_price), _to_int(gas_price)
+            elif raw[0] == 1:
+                chain_id, nonce, gas_price, gas, to, _value, data = rlp.decode(raw[1:])[:7]
+                chain_id, tx_type, max_fee, priority_fee = _to_int(chain_id), 1, _to_int(gas_price), _to_int(gas_price)
+            elif raw[0] == 2:
+                chain_id, nonce, priority_fee, max_fee, gas, to, _value, data = rlp.decode(raw[1:])[:8]
+                chain_id, tx_type, max_fee, priority_fee = _to_int(chain_id), 2, _to_int(max_fee), _to_int(priority_fee)
+            else:
+                raise ValueError(f"unsupported transaction type {raw[0]}")
+        except Exception as exc:
+            raise RpcError(f"invalid transaction: {exc}", code=-32602)
+        fields = {
+            "nonce": _to_int(nonce),
+            "to": to,
+            "data": data,
+            "gas": _to_int(gas),
+            "max_fee": max_fee,
+            "priority_fee": priority_fee,
+            "type": tx_type,
+        }
+        if chain_id != self.config.chain_id:
+            raise RpcError(f"invalid chain id {chain_id}")
+        to = fields.pop("to")
+        return SimTransaction(
+            hash=to_hex(keccak_bytes(raw)),
+            sender=sender,
+            to=to_hex(to).lower() if isinstance(to, (bytes, bytearray)) and to else to,
+            **fields,
+        )
+
+    def maybe_fail(self) -> Optional[str]:
+        # The error kind to inject for this request, if any.
+        with self._lock:
+            if self.config.error_rate and self._random.random() < self.config.error_rate:
+                return self.config.error_kind
+            return None
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.config.latency + self._random.random() * self.config.latency_jitter
+
+
+def _to_int(value: bytes) -> int:
+    return int.from_bytes(value, "big")
+
+
+def _topic_matches(wanted: Any, topics: List[str], position: int) -> bool:
+    if wanted is None:
+        return True
+    if position >= len(topics):
+        return False
+    options = wanted if isinstance(wanted, list) else [wanted]
+    return topics[position].lower() in {option.lower() for option in options}
+
+
+def _revert(reason: str) -> RpcError:
+    from eth_abi import encode
+
+    data = to_hex(_selector("Error(string)") + encode(["string"], [reason]))
+    return RpcError(f"execution reverted: {reason}" if reason else "execution reverted", code=3, data=data)
+
+
+class SimulatorServer:
+    # Serves a ChainSimulator over HTTP. Several servers may share one simulator to act as nodes of
+    # the same chain (for RPC pool tests), each with its own latency and error settings.
+    def __init__(
+        self,
+        simulator: Optional[ChainSimulator] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Optional[float] = None,
+        error_rate: Optional[float] = None,
+    ) -> None:
+        self.simulator = simulator or ChainSimulator()
+        self.latency = latency
+        self.error_rate = error_rate
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SimulatorServer":
+        self.simulator.ensure_started()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="chain-simulator-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self.simulator.stop()
+
+    def __enter__(self) -> "SimulatorServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _failure(self) -> Optional[str]:
+        if self.error_rate is None:
+            return self.simulator.maybe_fail()
+        if self.error_rate and random.random() < self.error_rate:
+            return self.simulator.config.error_kind
+        return None
+
+    def _delay(self) -> float:
+        return self.simulator.delay() if self.latency is None else self.latency
+
+    def respond(self, payload: Any) -> Tuple[int, Any]:
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        failure = self._failure()
+        if failure == "http":
+            return 503, None
+        if isinstance(payload, list):
+            return 200, [self._call(request, failure) for request in payload]
+        return 200, self._call(payload, failure)
+
+    def _call(self, request: dict, failure: Optional[str]) -> dict:
+        response: Dict[str, Any] = {"jsonrpc": "2.0", "id": request.get("id")}
+        if failure == "rpc":
+            response["error"] = {"code": -32603, "message": "internal error (injected)"}
+            return response
+        try:
+            response["result"] = self.simulator.handle(request["method"], request.get("params") or [])
+        except RpcError as exc:
+            response["error"] = {"code": exc.code, "message": str(exc)}
+            if exc.data is not None:
+                response["error"]["data"] = exc.data
+        return response
+
+
+def _handler_for(server: SimulatorServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+            status_code, body = server.respond(payload)
+            content = json.dumps(body).encode() if body is not None else b"service unavailable"
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local BatchHashRegistry JSON-RPC chain simulator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--chain-id", type=int, default=1337)
+    parser.add_argument("--contract-address", default=DEFAULT_CONTRACT)
+    parser.add_argument("--block-time", type=float, default=1.0, help="seconds; 0 mines every transaction")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-kind", choices=("http", "rpc"), default="http")
+    parser.add_argument("--mempool-size", type=int, default=5000)
+    parser.add_argument("--max-block-txs", type=int, default=0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    config = SimulatorConfig(
+        chain_id=args.chain_id,
+        contract_address=args.contract_address,
+        block_time=args.block_time,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        error_kind=args.error_kind,
+        mempool_size=args.mempool_size,
+        max_block_txs=args.max_block_txs,
+        seed=args.seed,
+    )
+    server = SimulatorServer(ChainSimulator(config), host=args.host, port=args.port).start()
+    print(f"Chain simulator listening on {server.url} (chain id {config.chain_id})", flush=True)
+    print(f"Contract address: {config.contract_address}", flush=True)
+    for key in DEV_PRIVATE_KEYS:
+        print(f"Publisher key: {key}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.ai.result_cache import get_result_cache
+from app.ai.text_cache import get_text_cache
+from app.chain.cache import get_attestation_cache
+from app.chain.rpc_pool import get_rpc_pool
 from app.core import config
 from app.db.init_db import init_db
 from app.db.session import init_engine
 from app.main import app
+from app.storage.deps import get_blob_store
+from tests.rpc_stub import CONTRACT, PRIVATE_KEY, StubRpc, serve_stub
 
 
 @pytest.fixture()
@@ -13,8 +19,30 @@ def client(tmp_path):
     config.settings.admin_api_key = "test-key"
     config.settings.env = "test"
     config.settings.llm_provider = "mock"
+    config.settings.publish_tracker_interval = 0
+    config.settings.extract_workers = 0
+    config.settings.blob_store_path = str(tmp_path / "blobs")
+    get_blob_store.cache_clear()
     init_engine()
     init_db()
+    get_attestation_cache().clear()
+    get_text_cache().clear()
+    get_result_cache().clear()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides = {}
+
+
+@pytest.fixture()
+def rpc_server(monkeypatch):
+    # A stub JSON-RPC node the real chain clients are pointed at; yields the StubRpc.
+    stub = StubRpc()
+    server = serve_stub(stub)
+    monkeypatch.setattr(config.settings, "chain_rpc_url", server.url)
+    monkeypatch.setattr(config.settings, "contract_address", CONTRACT)
+    monkeypatch.setattr(config.settings, "chain_id", 1337)
+    monkeypatch.setattr(config.settings, "publisher_private_key", PRIVATE_KEY)
+    get_rpc_pool.cache_clear()
+    yield stub
+    get_rpc_pool.cache_clear()
+    server.shutdown()
@@ -0,0 +1,87 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+
+from eth_abi import decode, encode
+
+from app.chain.hashing import hex_to_bytes, keccak_text, to_hex
+
+PRIVATE_KEY = "0x59c6995e998f97a5a0044966f0945389dc9e86dae88c7a8412f4603b6b78690d"
+CONTRACT = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+GET_MANY_SELECTOR = keccak_text("getMany(bytes32[])")[:4]
+
+
+class StubRpc:
+    # Answers the handful of eth_* methods the client uses; eth_call returns `stored` for every hash.
+    def __init__(self):
+        self.stored = b"\x00" * 32
+        self.calls = []
+
+    def handle(self, method, params):
+        self.calls.append(method)
+        if method == "eth_chainId":
+            return hex(1337)
+        if method == "eth_call":
+            data = hex_to_bytes(params[0].get("data") or params[0].get("input"))
+            if data[:4] == GET_MANY_SELECTOR:
+                (requested,) = decode(["bytes32[]"], data[4:])
+                return "0x" + encode(["bytes32[]"], [[self.stored] * len(requested)]).hex()
+            return "0x" + self.stored.hex()
+        if method == "eth_getCode":
+            return "0x6080"
+        if method == "eth_getTransactionCount":
+            return hex(7)
+        if method == "eth_gasPrice":
+            return hex(10**9)
+        if method == "eth_maxPriorityFeePerGas":
+            return hex(2 * 10**9)
+        if method == "eth_getBlockByNumber":
+            return {"number": hex(12), "hash": "0x" + "11" * 32, "baseFeePerGas": hex(10**9), "transactions": []}
+        if method == "eth_estimateGas":
+            return hex(50_000)
+        if method == "eth_sendRawTransaction":
+            return to_hex(keccak_text(params[0]))
+        if method == "eth_getTransactionReceipt":
+            return {
+                "transactionHash": params[0],
+                "blockNumber": hex(12),
+                "blockHash": "0x" + "11" * 32,
+                "transactionIndex": "0x0",
+                "status": "0x1",
+                "logs": [],
+                "cumulativeGasUsed": hex(50_000),
+                "gasUsed": hex(50_000),
+                "from": "0x" + "00" * 20,
+                "to": CONTRACT,
+                "contractAddress": None,
+                "logsBloom": "0x" + "00" * 256,
+                "type": "0x0",
+                "effectiveGasPrice": hex(10**9),
+            }
+        raise ValueError(f"unsupported method {method}")
+
+
+def serve_stub(stub):
+    # Serves `stub` as a JSON-RPC endpoint on a free local port; call `shutdown()` on the result.
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            try:
+                body = {"jsonrpc": "2.0", "id": request["id"], "result": stub.handle(request["method"], request["params"])}
+            except ValueError as exc:
+                body = {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": str(exc)}}
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    return server
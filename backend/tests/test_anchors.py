@@ -0,0 +1,107 @@
+from datetime import date, datetime, timezone
+
+from web3 import Web3
+
+from app.chain.client import ChainReceipt, MockBatchHashRegistryClient
+from app.chain.deps import get_chain_client
+from app.chain.merkle import build_merkle_tree, verify_merkle_proof
+from app.db import session
+from app.models.batch import Batch, BatchStatus
+from app.models.extraction import Extraction
+from app.schemas.extraction import ExtractionResult, ModelInfo
+
+
+def _create_ready_batches(prefix: str, count: int) -> list[str]:
+    db = session.SessionLocal()
+    extraction = ExtractionResult(confidence=0.1)
+    batch_ids = []
+    for index in range(count):
+        batch_id = f"{prefix}-{index:04d}"
+        db.add(
+            Batch(
+                batch_id=batch_id,
+                product_name="Vitamin A 10,000 IU",
+                supplement_type="Vitamin A",
+                manufacturer="PureSupplements Inc.",
+                production_date=date(2025, 1, 15),
+                expires_date=None,
+                status=BatchStatus.READY,
+            )
+        )
+        db.add(
+            Extraction(
+                batch_id=batch_id,
+                extracted_fields=extraction.model_dump(by_alias=True),
+                model_info=ModelInfo(model_name="mock", version="0").model_dump(by_alias=True),
+                extracted_at=datetime(2025, 1, 16, tzinfo=timezone.utc),
+                document_fingerprint="0x" + "00" * 32,
+            )
+        )
+        batch_ids.append(batch_id)
+    db.commit()
+    db.close()
+    return batch_ids
+
+
+def test_merkle_proofs_verify_for_every_leaf():
+    for size in range(1, 10):
+        leaves = [Web3.keccak(text=f"leaf-{index}") for index in range(size)]
+        tree = build_merkle_tree(leaves)
+        for index, leaf in enumerate(leaves):
+            assert verify_merkle_proof(leaf, tree.proof(index), tree.root)
+        assert not verify_merkle_proof(Web3.keccak(text="other"), tree.proof(0), tree.root)
+
+
+def test_anchor_publishes_root_and_verify_checks_inclusion(client):
+    batch_ids = _create_ready_batches("VA-2025-ANCHOR", 5)
+    chain_client = MockBatchHashRegistryClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    headers = {"X-API-Key": "test-key"}
+
+    response = client.post("/anchors", json={"batchIds": batch_ids}, headers=headers)
+    assert response.status_code == 201
+    data = response.json()
+    assert data["batchCount"] == 5
+    assert chain_client.get_root(Web3.to_bytes(hexstr=data["root"]))
+
+    for batch_id in batch_ids:
+        assert client.get(f"/batches/{batch_id}", headers=headers).json()["status"] == "PUBLISHED"
+        verify = client.get(f"/batches/{batch_id}/verify").json()
+        assert verify["verified"] is True
+        assert verify["anchorRoot"] == data["root"]
+
+    second = client.post("/anchors", json={"batchIds": batch_ids}, headers=headers)
+    assert second.status_code == 400
+    assert second.json()["error"]["code"] == "NO_READY_BATCHES"
+
+
+def test_verify_fails_when_merkle_proof_is_tampered(client):
+    batch_ids = _create_ready_batches("VA-2025-ANCHOR-T", 3)
+    chain_client = MockBatchHashRegistryClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    client.post("/anchors", headers={"X-API-Key": "test-key"})
+
+    db = session.SessionLocal()
+    batch = db.get(Batch, batch_ids[0])
+    batch.merkle_proof = [Web3.to_hex(Web3.keccak(text="forged"))]
+    db.commit()
+    db.close()
+
+    verify = client.get(f"/batches/{batch_ids[0]}/verify").json()
+    assert verify["verified"] is False
+    assert verify["mismatchReason"].startswith("Merkle proof mismatch")
+
+
+def test_reverted_anchor_leaves_batches_ready(client):
+    batch_ids = _create_ready_batches("VA-2025-ANCHOR-R", 2)
+    chain_client = MockBatchHashRegistryClient()
+    chain_client.get_receipt = lambda tx_hash: ChainReceipt(tx_hash=tx_hash, block_number=1, success=False)
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    headers = {"X-API-Key": "test-key"}
+
+    response = client.post("/anchors", json={"batchIds": batch_ids}, headers=headers)
+
+    assert response.status_code == 502
+    assert response.json()["error"]["code"] == "ANCHOR_REVERTED"
+    for batch_id in batch_ids:
+        assert client.get(f"/batches/{batch_id}", headers=headers).json()["status"] == "READY"
@@ -0,0 +1,77 @@
+import asyncio
+
+from app.chain.async_client import AsyncBatchHashRegistryClient, AsyncMockBatchHashRegistryClient
+from app.chain.client import BatchHashRegistryClient
+from app.chain.deps import get_chain_client, get_sync_chain_client
+from app.chain.hashing import hash_attestation, hash_batch_id
+from app.core import config
+from tests.test_verify import _create_ready_batch
+
+
+def test_async_client_reads_and_publishes(rpc_server):
+    client = AsyncBatchHashRegistryClient(BatchHashRegistryClient())
+
+    async def scenario():
+        try:
+            missing = await client.get(b"\x01" * 32)
+            rpc_server.stored = b"\xab" * 32
+            found = await client.get_many([b"\x01" * 32, b"\x02" * 32])
+            first = await client.publish(b"\x01" * 32, b"\x02" * 32)
+            second = await client.publish(b"\x03" * 32, b"\x04" * 32)
+            receipt = await client.get_receipt(first)
+            return missing, found, first, second, receipt
+        finally:
+            await client.aclose()
+
+    missing, found, first, second, receipt = asyncio.run(scenario())
+
+    assert missing is None
+    assert found == [b"\xab" * 32, b"\xab" * 32]
+    assert first != second
+    assert receipt.tx_hash == first
+    assert receipt.block_number == 12
+    # The starting nonce is fetched once; the second publish is numbered locally.
+    assert rpc_server.calls.count("eth_getTransactionCount") == 1
+    assert client.sync._get_publishers().primary.nonces.reserve() == 9
+
+
+def test_routes_use_async_chain_client(client, monkeypatch):
+    monkeypatch.setattr(config.settings, "chain_async_client", True)
+    monkeypatch.setattr(config.settings, "chain_mode", "mock")
+    get_sync_chain_client.cache_clear()
+    get_chain_client.cache_clear()
+    try:
+        chain_client = get_chain_client()
+        assert isinstance(chain_client, AsyncMockBatchHashRegistryClient)
+
+        batch_id, canonical_json = _create_ready_batch("VA-2025-ASYNC-CHAIN")
+        headers = {"X-API-Key": "test-key"}
+        publish = client.post(f"/batches/{batch_id}/publish", headers=headers)
+        assert publish.status_code == 200
+
+        verify = client.get(f"/batches/{batch_id}/verify")
+        assert verify.status_code == 200
+        assert verify.json()["verified"] is True
+        assert chain_client.sync.get(hash_batch_id(batch_id)) == hash_attestation(canonical_json)
+    finally:
+        get_sync_chain_client.cache_clear()
+        get_chain_client.cache_clear()
+
+
+def test_sync_publish_route_with_the_async_rpc_client(client, rpc_server, monkeypatch):
+    monkeypatch.setattr(config.settings, "chain_async_client", True)
+    monkeypatch.setattr(config.settings, "chain_mode", "rpc")
+    get_sync_chain_client.cache_clear()
+    get_chain_client.cache_clear()
+    try:
+        assert isinstance(get_chain_client(), AsyncBatchHashRegistryClient)
+        batch_id, _canonical_json = _create_ready_batch("VA-2025-ASYNC-RPC")
+        headers = {"X-API-Key": "test-key"}
+
+        response = client.post(f"/batches/{batch_id}/publish", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["blockNumber"] == 12
+        assert client.get(f"/batches/{batch_id}", headers=headers).json()["status"] == "PUBLISHED"
+    finally:
+        get_sync_chain_client.cache_clear()
+        get_chain_client.cache_clear()
@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+
+from app.api.routes import verify as verify_routes
+from app.chain.client import MockBatchHashRegistryClient
+from app.chain.deps import get_chain_client
+from app.chain.hashing import hash_attestation, hash_batch_id
+from app.db.session import async_database_url
+from tests.test_verify import _create_ready_batch
+
+
+def test_async_database_url_maps_sync_drivers():
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert (
+        async_database_url("postgresql+psycopg2://user:secret@db:5432/app")
+        == "postgresql+asyncpg://user:secret@db:5432/app"
+    )
+    assert async_database_url("sqlite:///./app.db", "sqlite+aiosqlite:///other.db") == "sqlite+aiosqlite:///other.db"
+
+
+def test_concurrent_verifies_share_the_event_loop(client, monkeypatch):
+    chain_client = MockBatchHashRegistryClient()
+    in_flight = []
+    overlap = []
+    load = verify_routes.aget_batch_with_extraction
+
+    async def tracked_load(db, batch_id):
+        # Yields to the loop mid-request, so other verifies only interleave if the handler is async.
+        in_flight.append(batch_id)
+        overlap.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        try:
+            return await load(db, batch_id)
+        finally:
+            in_flight.remove(batch_id)
+
+    monkeypatch.setattr(verify_routes, "aget_batch_with_extraction", tracked_load)
+    batch_ids = []
+    for index in range(5):
+        batch_id, canonical_json = _create_ready_batch(f"VA-2025-ASYNC-{index}")
+        chain_client.publish(hash_batch_id(batch_id), hash_attestation(canonical_json))
+        batch_ids.append(batch_id)
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+
+    async def verify_all():
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            requests = [async_client.get(f"/batches/{batch_id}/verify") for batch_id in batch_ids * 20]
+            return await asyncio.gather(*requests)
+
+    responses = asyncio.run(verify_all())
+    assert {response.status_code for response in responses} == {200}
+    assert all(response.json()["verified"] for response in responses)
+    assert max(overlap) > 1
@@ -0,0 +1,56 @@
+from app.chain.cache import AttestationCache
+
+
+class CountingChainClient:
+    def __init__(self, onchain_hash: bytes | None):
+        self.onchain_hash = onchain_hash
+        self.calls = 0
+
+    def get(self, batch_id_hash: bytes):
+        self.calls += 1
+        return self.onchain_hash
+
+
+def test_positive_results_are_cached():
+    cache = AttestationCache(maxsize=10, positive_ttl=60, negative_ttl=60)
+    chain_client = CountingChainClient(b"\x01" * 32)
+
+    for _ in range(3):
+        assert cache.get_attestation(chain_client, b"\xaa" * 32) == b"\x01" * 32
+    assert chain_client.calls == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_negative_results_expire_on_new_block_and_invalidate():
+    cache = AttestationCache(maxsize=10, positive_ttl=60, negative_ttl=60)
+    chain_client = CountingChainClient(None)
+    key = b"\xbb" * 32
+
+    assert cache.get_attestation(chain_client, key) is None
+    assert cache.get_attestation(chain_client, key) is None
+    assert chain_client.calls == 1
+
+    cache.note_block(5)
+    assert cache.get_attestation(chain_client, key) is None
+    assert chain_client.calls == 2
+
+    chain_client.onchain_hash = b"\x02" * 32
+    cache.invalidate(key)
+    assert cache.get_attestation(chain_client, key) == b"\x02" * 32
+    assert chain_client.calls == 3
+
+
+def test_cache_is_bounded():
+    cache = AttestationCache(maxsize=2, positive_ttl=60, negative_ttl=0)
+    chain_client = CountingChainClient(b"\x01" * 32)
+    for index in range(3):
+        cache.get_attestation(chain_client, bytes([index]) * 32)
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+
+
+def test_cache_stats_endpoint(client):
+    response = client.get("/cache/stats", headers={"X-API-Key": "test-key"})
+    assert response.status_code == 200
+    assert "attestations" in response.json()
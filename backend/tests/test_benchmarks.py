@@ -0,0 +1,75 @@
+import pytest
+
+from app.chain.deps import get_chain_client, get_sync_chain_client
+from app.chain.rpc_pool import get_rpc_pool
+from app.core import config
+from app.db import session
+from app.storage.deps import get_blob_store
+from benchmarks.run import compare, run
+
+
+@pytest.fixture()
+def benchmark_settings():
+    # benchmarks.run.configure() rewrites settings and re-initialises the global engine; both are put back.
+    saved = config.settings.model_copy()
+    yield
+    for name in type(config.settings).model_fields:
+        setattr(config.settings, name, getattr(saved, name))
+    get_rpc_pool.cache_clear()
+    get_sync_chain_client.cache_clear()
+    get_chain_client.cache_clear()
+    get_blob_store.cache_clear()
+    session.init_engine()
+
+
+@pytest.mark.benchmark
+def test_benchmark_run_reports_every_scenario(tmp_path, benchmark_settings):
+    result = run(
+        "200",
+        requests=20,
+        concurrency=4,
+        warmup=2,
+        database_url=f"sqlite:///{tmp_path}/bench.db",
+        blob_store_path=str(tmp_path / "blobs"),
+    )
+
+    assert result["meta"]["batches"] == 200
+    assert result["meta"]["seededBatches"] == 200
+    assert set(result["scenarios"]) == {"verify", "attestation", "publish", "upload"}
+    for scenario in result["scenarios"].values():
+        assert scenario["errors"] == {}
+        assert scenario["requests"] == 20
+        assert 0 < scenario["p50Ms"] <= scenario["p99Ms"]
+        assert scenario["rps"] > 0
+
+    assert compare(result, result, tolerance=0.0) == []
+
+
+def test_compare_flags_latency_and_throughput_regressions():
+    baseline = {"scenarios": {"verify": {"p99Ms": 10.0, "rps": 1000.0, "errors": {}}}}
+    slower = {"scenarios": {"verify": {"p99Ms": 14.0, "rps": 700.0, "errors": {}}}}
+    within = {"scenarios": {"verify": {"p99Ms": 12.0, "rps": 800.0, "errors": {}}}}
+
+    assert len(compare(slower, baseline, tolerance=0.25)) == 2
+    assert compare(within, baseline, tolerance=0.25) == []
+
+
+@pytest.mark.benchmark
+def test_benchmark_against_the_chain_simulator(tmp_path, benchmark_settings):
+    result = run(
+        "50",
+        scenarios=("publish", "verify"),
+        requests=10,
+        concurrency=4,
+        warmup=2,
+        database_url=f"sqlite:///{tmp_path}/bench.db",
+        blob_store_path=str(tmp_path / "blobs"),
+        chain="sim",
+        block_time=0.05,
+    )
+
+    assert result["meta"]["chain"] == "sim"
+    assert result["meta"]["blockTime"] == 0.05
+    for scenario in result["scenarios"].values():
+        assert scenario["errors"] == {}
+        assert scenario["requests"] == 10
@@ -0,0 +1,231 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from eth_abi import encode
+from eth_account import Account
+import pytest
+
+from app.chain.async_client import AsyncBatchHashRegistryClient
+from app.chain.client import BatchHashRegistryClient
+from app.chain.deps import get_chain_client
+from app.chain.hashing import hash_batch_id, keccak_text, to_hex
+from app.chain.indexer import PublishedEventIndexer
+from app.chain.rpc_pool import get_rpc_pool
+from app.core import config
+from app.db import session
+from app.models.published_event import PublishedEvent
+from benchmarks.simulator import DEV_PRIVATE_KEYS, ChainSimulator, SimulatorConfig, SimulatorServer
+from tests.test_verify import _create_ready_batch
+
+HEADERS = {"X-API-Key": "test-key"}
+
+
+@pytest.fixture()
+def chain(monkeypatch):
+    # Starts simulated nodes on demand and points the chain clients at them: chain(**config).
+    servers = []
+
+    def start(nodes=1, node_error_rates=(), **options):
+        simulator = ChainSimulator(SimulatorConfig(**options))
+        for index in range(nodes):
+            error_rate = node_error_rates[index] if index < len(node_error_rates) else None
+            servers.append(SimulatorServer(simulator, error_rate=error_rate).start())
+        monkeypatch.setattr(config.settings, "chain_rpc_urls", ",".join(server.url for server in servers))
+        monkeypatch.setattr(config.settings, "contract_address", simulator.config.contract_address)
+        monkeypatch.setattr(config.settings, "chain_id", simulator.config.chain_id)
+        monkeypatch.setattr(config.settings, "publisher_private_key", DEV_PRIVATE_KEYS[0])
+        get_rpc_pool.cache_clear()
+        return simulator
+
+    yield start
+    get_rpc_pool.cache_clear()
+    for server in servers:
+        server.stop()
+
+
+def test_publish_is_mined_and_readable(chain):
+    simulator = chain(block_time=0)
+    client = BatchHashRegistryClient()
+
+    receipt = client.get_receipt(client.publish(b"\x01" * 32, b"\x02" * 32))
+
+    assert receipt.success
+    assert receipt.block_number == simulator.head == 1
+    assert client.get(b"\x01" * 32) == b"\x02" * 32
+    assert client.get_many([b"\x01" * 32, b"\x03" * 32]) == [b"\x02" * 32, None]
+    # The gas limit is cached, so a duplicate is only caught on chain: it is mined and reverts.
+    assert client.get_receipt(client.publish(b"\x01" * 32, b"\x04" * 32)).success is False
+    assert client.get(b"\x01" * 32) == b"\x02" * 32
+
+    root_receipt = client.get_receipt(client.publish_root(b"\x05" * 32))
+    assert root_receipt.success
+    assert client.get_root(b"\x05" * 32) == simulator._blocks[root_receipt.block_number]["timestamp"]
+
+
+def test_estimate_surfaces_contract_reverts(chain):
+    chain(block_time=0)
+    client = BatchHashRegistryClient()
+
+    with pytest.raises(Exception, match="BATCH_ID_REQUIRED"):
+        client.publish(b"\x00" * 32, b"\x02" * 32)
+
+
+def test_concurrent_publishes_share_blocks(chain, monkeypatch):
+    monkeypatch.setattr(config.settings, "publisher_private_keys", ",".join(DEV_PRIVATE_KEYS[:2]))
+    simulator = chain(block_time=0.05, max_block_txs=5)
+    client = BatchHashRegistryClient()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tx_hashes = list(executor.map(lambda index: client.publish(bytes([index + 1]) * 32, b"\x02" * 32), range(20)))
+        receipts = list(executor.map(client.get_receipt, tx_hashes))
+
+    assert all(receipt.success for receipt in receipts)
+    blocks = {receipt.block_number for receipt in receipts}
+    assert len(blocks) >= 4
+    assert all(len(simulator._blocks[number]["transactions"]) <= 5 for number in blocks)
+    assert client.get_many([bytes([index + 1]) * 32 for index in range(20)]) == [b"\x02" * 32] * 20
+    assert sorted(simulator._nonces.values()) == [10, 10]
+
+
+def _signed_publish(simulator, key, nonce, batch_byte, **fees):
+    arguments = encode(["bytes32", "bytes32"], [bytes([batch_byte]) * 32, b"\x02" * 32])
+    data = keccak_text("publish(bytes32,bytes32)")[:4] + arguments
+    transaction = {
+        "chainId": simulator.config.chain_id,
+        "nonce": nonce,
+        "to": simulator.config.contract_address,
+        "data": data,
+        "gas": 100_000,
+        "value": 0,
+        **fees,
+    }
+    return to_hex(Account.sign_transaction(transaction, key).raw_transaction)
+
+
+def test_blocks_take_the_best_paying_next_nonce_per_sender():
+    simulator = ChainSimulator(SimulatorConfig(block_time=3600, max_block_txs=2))
+    gwei = 10**9
+
+    def dynamic(max_fee, tip):
+        return {"type": 2, "maxFeePerGas": max_fee * gwei, "maxPriorityFeePerGas": tip * gwei}
+
+    sent = [
+        _signed_publish(simulator, DEV_PRIVATE_KEYS[0], 0, 1, **dynamic(2, 1)),
+        _signed_publish(simulator, DEV_PRIVATE_KEYS[0], 1, 2, **dynamic(5, 3)),
+        _signed_publish(simulator, DEV_PRIVATE_KEYS[1], 0, 3, **dynamic(4, 2)),
+        # An EIP-2930 transaction pays its whole gas price over the base fee as the tip.
+        _signed_publish(simulator, DEV_PRIVATE_KEYS[2], 0, 4, type=1, gasPrice=gwei + gwei // 2, accessList=[]),
+    ]
+    first, second, third, fourth = [simulator.rpc_eth_sendRawTransaction(raw) for raw in sent]
+    assert simulator.pending_count == 4
+
+    # Sender 0's higher tip waits behind its own nonce 0, so it only becomes a candidate once that is in.
+    assert simulator.mine()["transactions"] == [third, first]
+    assert simulator.mine()["transactions"] == [second, fourth]
+    assert simulator.pending_count == 0
+
+    logs = simulator.rpc_eth_getLogs({"fromBlock": "0x1", "toBlock": "latest"})
+    positions = [(log["blockNumber"], log["logIndex"]) for log in logs]
+    assert positions == [("0x1", "0x0"), ("0x1", "0x1"), ("0x2", "0x0"), ("0x2", "0x1")]
+
+
+def test_stuck_transaction_is_replaced_with_higher_fees(chain):
+    simulator = chain(block_time=3600)
+    client = BatchHashRegistryClient()
+    tx_hash = client.publish(b"\x01" * 32, b"\x02" * 32)
+
+    # Fees spike past the pending transaction's price, so it would never be included.
+    simulator.set_base_fee(5 * 10**9)
+    simulator.mine()
+    assert simulator.pending_count == 1
+
+    replaced = client.replace_stuck_transactions(older_than_seconds=0)
+    assert len(replaced) == 1 and replaced[0] != tx_hash
+    simulator.mine()
+
+    receipt = client.get_receipt(tx_hash)
+    assert receipt.success
+    assert receipt.tx_hash == replaced[0]
+    assert simulator.pending_count == 0
+
+
+def test_reads_fail_over_from_an_erroring_node(chain, monkeypatch):
+    monkeypatch.setattr(config.settings, "rpc_failure_threshold", 1)
+    chain(block_time=0, nodes=2, node_error_rates=(1.0, 0.0))
+    client = BatchHashRegistryClient()
+
+    receipt = client.get_receipt(client.publish(b"\x01" * 32, b"\x02" * 32))
+
+    assert receipt.success
+    assert client.get(b"\x01" * 32) == b"\x02" * 32
+    failing, healthy = get_rpc_pool().endpoints
+    assert failing.errors >= 1 and not failing.healthy()
+    assert healthy.errors == 0
+
+
+def test_async_client_publishes_and_reads(chain):
+    chain(block_time=0.02)
+    client = AsyncBatchHashRegistryClient(BatchHashRegistryClient())
+
+    async def scenario():
+        try:
+            tx_hashes = await asyncio.gather(*(client.publish(bytes([i + 1]) * 32, b"\x02" * 32) for i in range(5)))
+            receipts = await asyncio.gather(*(client.get_receipt(tx_hash) for tx_hash in tx_hashes))
+            return receipts, await client.get_many([bytes([i + 1]) * 32 for i in range(5)])
+        finally:
+            await client.aclose()
+
+    receipts, stored = asyncio.run(scenario())
+    assert all(receipt.success for receipt in receipts)
+    assert stored == [b"\x02" * 32] * 5
+
+
+def test_publish_index_and_verify_through_the_api(client, chain):
+    simulator = chain(block_time=0)
+    chain_client = BatchHashRegistryClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    batch_id, _canonical_json = _create_ready_batch("VA-2025-SIM-1")
+
+    response = client.post(f"/batches/{batch_id}/publish", headers=HEADERS)
+    assert response.status_code == 200
+    assert simulator.attestation(hash_batch_id(batch_id)) is not None
+
+    verified = client.get(f"/batches/{batch_id}/verify", headers=HEADERS).json()
+    assert verified["verified"] is True
+    assert verified["txHash"] == response.json()["txHash"]
+
+    assert PublishedEventIndexer().poll_once(chain_client) == 1
+    db = session.SessionLocal()
+    event = db.query(PublishedEvent).one()
+    db.close()
+    assert event.tx_hash == response.json()["txHash"]
+    assert event.publisher.lower() == chain_client.publisher_address.lower()
+
+
+def test_nonce_taken_elsewhere_is_released_and_retried(chain):
+    simulator = chain(block_time=0)
+    client, other = BatchHashRegistryClient(), BatchHashRegistryClient()
+    client.get_receipt(client.publish(b"\x01" * 32, b"\x02" * 32))
+    # Another process publishes with the same key, so our next local nonce is already used.
+    other.get_receipt(other.publish(b"\x03" * 32, b"\x04" * 32))
+
+    assert client.get_receipt(client.publish(b"\x05" * 32, b"\x06" * 32)).success
+    nonces = client._get_publishers().primary.nonces
+    assert nonces.reserve() == 3
+    assert simulator.rpc_eth_getTransactionCount(client.publisher_address) == hex(3)
+
+
+def test_receipt_wait_replaces_only_its_own_transaction(chain, monkeypatch):
+    simulator = chain(block_time=3600)
+    client = BatchHashRegistryClient()
+    waited = client.publish(b"\x01" * 32, b"\x02" * 32)
+    other = client.publish(b"\x03" * 32, b"\x04" * 32)
+    simulator.set_base_fee(5 * 10**9)
+    monkeypatch.setattr(config.settings, "tx_stuck_seconds", 0)
+
+    replaced = client.replace_if_stuck(waited)
+
+    nonces = client._get_publishers().primary.nonces
+    assert len(replaced) == 1
+    assert nonces.resolve(waited) == replaced[0]
+    assert nonces.resolve(other) == other
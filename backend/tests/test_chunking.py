@@ -0,0 +1,76 @@
+import json
+
+import httpx
+
+from app.ai import llm
+from app.ai.chunking import merge_extractions, split_into_chunks
+from app.ai.llm_client import LLMClient
+from app.ai.pdf_text import PAGE_BREAK
+from app.core import config
+from app.schemas.extraction import ExtractionResult
+
+
+def test_chunks_follow_page_and_section_boundaries():
+    pages = ["Certificate of Analysis Lab: Eurofins", "Potency Vitamin A 10000 IU", "Heavy Metals Lead 0.1 ppm"]
+    chunks = split_into_chunks(PAGE_BREAK.join(pages), max_chars=70)
+    assert chunks == [f"{pages[0]} {pages[1]}", pages[2]]
+
+    long_page = "Test Results " + "Vitamin A 10000 IU PASS. " * 4 + "Heavy Metals " + "Lead 0.1 ppm PASS. " * 4
+    chunks = split_into_chunks(long_page, max_chars=110)
+    assert all(len(chunk) <= 110 for chunk in chunks)
+    assert any(chunk.startswith("Heavy Metals") for chunk in chunks)
+    assert " ".join(chunks).split() == long_page.split()
+
+
+def test_merge_dedupes_and_weights_confidence():
+    first = ExtractionResult.model_validate(
+        {
+            "labName": "Eurofins",
+            "analytes": [{"name": "Vitamin A", "unit": "IU", "status": "UNKNOWN"}],
+            "methods": ["HPLC"],
+            "confidence": 0.9,
+        }
+    )
+    second = ExtractionResult.model_validate(
+        {
+            "labName": "Other Lab",
+            "analytes": [
+                {"name": "vitamin  A", "unit": "iu", "result": "10000", "status": "PASS"},
+                {"name": "Vitamin D", "unit": "IU", "status": "PASS"},
+            ],
+            "contaminants": [{"name": "Lead", "unit": "ppm", "status": "PASS"}],
+            "methods": ["hplc", "ICP-MS"],
+            "confidence": 0.5,
+        }
+    )
+    merged = merge_extractions([(first, 300), (second, 100)])
+    assert merged.lab_name == "Eurofins"
+    assert [(analyte.name, analyte.status.value) for analyte in merged.analytes] == [
+        ("vitamin  A", "PASS"),
+        ("Vitamin D", "PASS"),
+    ]
+    assert merged.methods == ["HPLC", "ICP-MS"]
+    assert merged.contaminants[0].name == "Lead"
+    assert merged.confidence == 0.8
+
+
+def test_long_text_is_extracted_in_concurrent_chunks(monkeypatch):
+    def handler(request):
+        user_text = json.loads(request.content)["messages"][1]["content"]
+        name = "Lead" if "Lead" in user_text else "Vitamin A"
+        content = {"analytes": [{"name": name, "status": "PASS"}], "confidence": 0.6}
+        return httpx.Response(200, json={"choices": [{"message": {"content": json.dumps(content)}}]})
+
+    client = LLMClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm, "get_llm_client", lambda: client)
+    monkeypatch.setattr(config.settings, "llm_provider", "openai")
+    monkeypatch.setattr(config.settings, "llm_base_url", "https://llm.test/v1")
+    monkeypatch.setattr(config.settings, "llm_api_key", "key")
+    monkeypatch.setattr(config.settings, "llm_model", "gpt-test")
+    monkeypatch.setattr(config.settings, "llm_chunk_chars", 40)
+    try:
+        result = llm.extract_lab_report(PAGE_BREAK.join(["Potency Vitamin A 10000 IU", "Heavy Metals Lead 0.1 ppm"]))
+    finally:
+        client.close()
+    assert [analyte.name for analyte in result.analytes] == ["Vitamin A", "Lead"]
+    assert client.stats()["requests"] == 2
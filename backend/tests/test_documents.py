@@ -0,0 +1,241 @@
+from datetime import datetime, timezone
+import hashlib
+import io
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.api.routes.documents import _content_disposition
+from app.core import config
+from app.core.uploads import fingerprint_upload
+from app.storage.s3 import S3BlobStore
+
+
+def _create_batch(client, batch_id: str) -> None:
+    payload = {
+        "batchId": batch_id,
+        "productName": "Vitamin A 10,000 IU",
+        "supplementType": "Vitamin A",
+        "manufacturer": "PureSupplements Inc.",
+        "productionDate": "2025-01-15",
+    }
+    assert client.post("/batches", json=payload, headers={"X-API-Key": "test-key"}).status_code == 201
+
+
+def test_upload_streams_in_chunks(client, monkeypatch):
+    monkeypatch.setattr(config.settings, "upload_chunk_size", 1024)
+    _create_batch(client, "VA-2025-DOC-1")
+    pdf_bytes = (Path(__file__).parent / "fixtures" / "sample.pdf").read_bytes()
+
+    response = client.post(
+        "/batches/VA-2025-DOC-1/documents",
+        files={"file": ("sample.pdf", pdf_bytes, "application/pdf")},
+        headers={"X-API-Key": "test-key"},
+    )
+    assert response.status_code == 201
+    assert response.json()["batchId"] == "VA-2025-DOC-1"
+
+
+def test_upload_is_fingerprinted_in_place_and_rewound(monkeypatch):
+    monkeypatch.setattr(config.settings, "upload_chunk_size", 3)
+    source = io.BytesIO(b"%PDF-1.4 sample")
+
+    upload = fingerprint_upload(source)
+
+    assert upload.size == len(b"%PDF-1.4 sample")
+    assert upload.fingerprint == "0x" + hashlib.sha256(b"%PDF-1.4 sample").hexdigest()
+    # The same file object goes on to the blob store, so it has to be back at the start.
+    assert source.read() == b"%PDF-1.4 sample"
+
+
+def test_upload_rejects_oversized_file(client, monkeypatch):
+    monkeypatch.setattr(config.settings, "max_upload_bytes", 128)
+    _create_batch(client, "VA-2025-DOC-2")
+
+    response = client.post(
+        "/batches/VA-2025-DOC-2/documents",
+        files={"file": ("big.pdf", b"%PDF" + b"0" * 200_000, "application/pdf")},
+        headers={"X-API-Key": "test-key"},
+    )
+    assert response.status_code == 413
+    assert response.json()["error"]["code"] == "PAYLOAD_TOO_LARGE"
+
+
+def test_upload_rejects_file_over_limit_within_multipart_allowance(client, monkeypatch):
+    monkeypatch.setattr(config.settings, "max_upload_bytes", 128)
+    _create_batch(client, "VA-2025-DOC-3")
+
+    response = client.post(
+        "/batches/VA-2025-DOC-3/documents",
+        files={"file": ("big.pdf", b"%PDF" + b"0" * 1024, "application/pdf")},
+        headers={"X-API-Key": "test-key"},
+    )
+    assert response.status_code == 413
+    assert response.json()["error"]["code"] == "PAYLOAD_TOO_LARGE"
+
+
+def test_identical_uploads_share_one_blob(client, tmp_path):
+    _create_batch(client, "VA-2025-DOC-4")
+    pdf_bytes = (Path(__file__).parent / "fixtures" / "sample.pdf").read_bytes()
+
+    for _ in range(2):
+        response = client.post(
+            "/batches/VA-2025-DOC-4/documents",
+            files={"file": ("sample.pdf", pdf_bytes, "application/pdf")},
+            headers={"X-API-Key": "test-key"},
+        )
+        assert response.status_code == 201
+        assert response.json()["storageUrl"].startswith("/documents/")
+
+    blobs = [path for path in (tmp_path / "blobs").rglob("*") if path.is_file()]
+    assert len(blobs) == 1
+    assert blobs[0].read_bytes() == pdf_bytes
+
+
+def test_download_supports_etag_and_ranges(client):
+    _create_batch(client, "VA-2025-DOC-5")
+    pdf_bytes = (Path(__file__).parent / "fixtures" / "sample.pdf").read_bytes()
+    headers = {"X-API-Key": "test-key"}
+    upload = client.post(
+        "/batches/VA-2025-DOC-5/documents",
+        files={"file": ("sample.pdf", pdf_bytes, "application/pdf")},
+        headers=headers,
+    )
+    url = upload.json()["storageUrl"]
+
+    full = client.get(url, headers=headers)
+    assert full.status_code == 200
+    assert full.content == pdf_bytes
+    etag = full.headers["etag"]
+
+    cached = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+
+    partial = client.get(url, headers={**headers, "Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == pdf_bytes[10:20]
+    assert partial.headers["content-range"] == f"bytes 10-19/{len(pdf_bytes)}"
+
+    suffix = client.get(url, headers={**headers, "Range": "bytes=-5"})
+    assert suffix.content == pdf_bytes[-5:]
+
+    beyond = client.get(url, headers={**headers, "Range": f"bytes={len(pdf_bytes)}-"})
+    assert beyond.status_code == 416
+
+
+def test_download_headers_handle_wildcards_and_unsafe_filenames(client):
+    _create_batch(client, "VA-2025-DOC-6")
+    headers = {"X-API-Key": "test-key"}
+    upload = client.post(
+        "/batches/VA-2025-DOC-6/documents",
+        files={"file": ("résumé final.pdf", b"%PDF-1.4 test", "application/pdf")},
+        headers=headers,
+    )
+    url = upload.json()["storageUrl"]
+
+    full = client.get(url, headers=headers)
+    assert full.headers["content-disposition"] == (
+        "inline; filename=\"r_sum_ final.pdf\"; filename*=UTF-8''r%C3%A9sum%C3%A9%20final.pdf"
+    )
+    assert _content_disposition('a"b\r\n.pdf') == "inline; filename=\"a_b__.pdf\"; filename*=UTF-8''a%22b%0D%0A.pdf"
+    assert client.get(url, headers={**headers, "If-None-Match": "*"}).status_code == 304
+    weak = "W/" + full.headers["etag"]
+    assert client.get(url, headers={**headers, "If-None-Match": f'"other", {weak}'}).status_code == 304
+    assert client.get(url, headers={**headers, "If-None-Match": '"other"'}).status_code == 200
+
+
+def test_failed_commit_leaves_the_blob_for_the_orphan_sweep(client, tmp_path, monkeypatch):
+    _create_batch(client, "VA-2025-DOC-7")
+    headers = {"X-API-Key": "test-key"}
+    kept = client.post(
+        "/batches/VA-2025-DOC-7/documents",
+        files={"file": ("kept.pdf", b"%PDF-1.4 kept", "application/pdf")},
+        headers=headers,
+    )
+    assert kept.status_code == 201
+
+    def fail(self):
+        raise RuntimeError("database unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Session, "commit", fail)
+        with pytest.raises(RuntimeError):
+            client.post(
+                "/batches/VA-2025-DOC-7/documents",
+                files={"file": ("sample.pdf", b"%PDF-1.4 orphan", "application/pdf")},
+                headers=headers,
+            )
+
+    blobs = [path for path in (tmp_path / "blobs").rglob("*") if path.is_file()]
+    assert len(blobs) == 2
+    # Within the grace period an upload may still be about to reference the blob.
+    assert client.post("/blobs/sweep", headers=headers).json() == {"deleted": 0}
+
+    monkeypatch.setattr(config.settings, "blob_sweep_grace_seconds", 0)
+    for path in blobs:
+        os.utime(path, (0, 0))
+    assert client.post("/blobs/sweep", headers=headers).json() == {"deleted": 1}
+    remaining = [path for path in (tmp_path / "blobs").rglob("*") if path.is_file()]
+    assert [path.name for path in remaining] == [hashlib.sha256(b"%PDF-1.4 kept").hexdigest()]
+    assert client.get(kept.json()["storageUrl"], headers=headers).content == b"%PDF-1.4 kept"
+
+
+class FakeS3Client:
+    class exceptions:
+        class ClientError(Exception):
+            def __init__(self, code):
+                super().__init__(code)
+                self.response = {"Error": {"Code": code}}
+
+    def __init__(self):
+        self.objects = {}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise self.exceptions.ClientError("404")
+        return {"ContentLength": len(self.objects[Key])}
+
+    def upload_fileobj(self, source, bucket, key):
+        self.objects[key] = source.read()
+
+    def download_fileobj(self, bucket, key, handle):
+        handle.write(self.objects[key])
+
+    def get_object(self, Bucket, Key, Range):
+        start, end = (int(value) for value in Range.split("=")[1].split("-"))
+        data = self.objects[Key][start : end + 1]
+        return {"Body": SimpleNamespace(iter_chunks=lambda size: (data[i : i + size] for i in range(0, len(data), size)))}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def get_paginator(self, operation):
+        modified = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        contents = [{"Key": key, "LastModified": modified} for key in self.objects]
+
+        def paginate(Bucket, Prefix):
+            return [{"Contents": [item for item in contents if item["Key"].startswith(Prefix)]}]
+
+        return SimpleNamespace(paginate=paginate)
+
+
+def test_s3_blob_store_round_trip():
+    s3 = FakeS3Client()
+    store = S3BlobStore("documents", prefix="/blobs/", client=s3)
+    key = "0x" + "ab" * 32
+
+    assert not store.exists(key)
+    store.put_file(key, io.BytesIO(b"0123456789"))
+    store.put_file(key, io.BytesIO(b"ignored"))
+    assert list(s3.objects) == ["blobs/" + "ab" * 32]
+    assert store.size(key) == 10
+    assert b"".join(store.iter_range(key, 2, 7, chunk_size=4)) == b"234567"
+    with store.open_buffer(key) as view:
+        assert bytes(view) == b"0123456789"
+    assert [blob_key for blob_key, _modified in store.iter_blobs()] == [key]
+
+    store.delete(key)
+    assert not store.exists(key)
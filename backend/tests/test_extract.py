@@ -1,5 +1,19 @@
+from datetime import date
+import json
 from pathlib import Path
 
+from sqlalchemy import event
+
+from app.ai import result_cache
+from app.ai.text_cache import get_text_cache
+from app.chain.hashing import build_attestation_json, hash_attestation
+from app.core import config
+from app.db import session
+from app.models.batch import Batch
+from app.models.extraction import Extraction
+from app.models.llm_result import LLMResult
+from app.schemas.extraction import ExtractionResult
+
 
 def test_extract_marks_batch_ready_and_stores_extraction(client):
     payload = {
@@ -52,3 +66,166 @@ def test_attestation_hash_stable(client):
     assert first.status_code == 200
     assert second.status_code == 200
     assert first.json()["canonicalJsonHash"] == second.json()["canonicalJsonHash"]
+
+
+def test_extracted_text_is_reused_across_batches(client):
+    headers = {"X-API-Key": "test-key"}
+    pdf_bytes = (Path(__file__).parent / "fixtures" / "sample.pdf").read_bytes()
+    for batch_id in ("VA-2025-EXTRACT-3", "VA-2025-EXTRACT-4"):
+        payload = {
+            "batchId": batch_id,
+            "productName": "Vitamin A 10,000 IU",
+            "supplementType": "Vitamin A",
+            "manufacturer": "PureSupplements Inc.",
+            "productionDate": "2025-01-15",
+        }
+        client.post("/batches", json=payload, headers=headers)
+        files = {"file": ("sample.pdf", pdf_bytes, "application/pdf")}
+        client.post(f"/batches/{batch_id}/documents", files=files, headers=headers)
+        # Bypass the LLM result cache so the text cache is exercised on the second batch.
+        response = client.post(f"/batches/{batch_id}/extract?forceRefresh=true", headers=headers)
+        assert response.status_code == 200
+
+    cache = get_text_cache()
+    assert cache.parses == 1
+    assert cache.stats()["hits"] == 1
+
+    # Dropping the in-memory layer falls back to the persisted text rather than re-parsing.
+    cache.clear()
+    assert client.post("/batches/VA-2025-EXTRACT-3/extract?forceRefresh=true", headers=headers).status_code == 200
+    assert cache.parses == 0
+    assert cache.db_hits == 1
+
+    stats = client.get("/cache/stats", headers=headers).json()
+    assert stats["extractedText"]["dbHits"] == 1
+
+
+def test_llm_results_are_memoized_per_document_and_model(client, monkeypatch):
+    calls = []
+    original = result_cache.extract_lab_report
+
+    def counting_extract(text):
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr(result_cache, "extract_lab_report", counting_extract)
+    headers = {"X-API-Key": "test-key"}
+    payload = {
+        "batchId": "VA-2025-EXTRACT-5",
+        "productName": "Vitamin A 10,000 IU",
+        "supplementType": "Vitamin A",
+        "manufacturer": "PureSupplements Inc.",
+        "productionDate": "2025-01-15",
+    }
+    client.post("/batches", json=payload, headers=headers)
+    pdf_bytes = (Path(__file__).parent / "fixtures" / "sample.pdf").read_bytes()
+    files = {"file": ("sample.pdf", pdf_bytes, "application/pdf")}
+    client.post("/batches/VA-2025-EXTRACT-5/documents", files=files, headers=headers)
+
+    first = client.post("/batches/VA-2025-EXTRACT-5/extract", headers=headers)
+    second = client.post("/batches/VA-2025-EXTRACT-5/extract", headers=headers)
+    assert first.json()["extractedFields"] == second.json()["extractedFields"]
+    assert len(calls) == 1
+
+    assert client.post("/batches/VA-2025-EXTRACT-5/extract?forceRefresh=true", headers=headers).status_code == 200
+    assert len(calls) == 2
+
+    monkeypatch.setattr(config.settings, "llm_model", "other-model")
+    client.post("/batches/VA-2025-EXTRACT-5/extract", headers=headers)
+    assert len(calls) == 3
+
+    stats = client.get("/cache/stats", headers=headers).json()["llmResults"]
+    assert stats["hits"] == 1
+    assert stats["llmCalls"] == 3
+    assert stats["forcedRefreshes"] == 1
+
+
+def test_llm_result_table_is_trimmed_by_last_use(client):
+    cache = result_cache.ExtractionResultCache(maxsize=10, max_entries=2, ttl_seconds=0)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(session.engine, "before_cursor_execute", record)
+    db = session.SessionLocal()
+    try:
+        for fingerprint in ("0x01", "0x02", "0x03", "0x04"):
+            cache.get_or_extract(db, fingerprint, lambda: "text")
+            db.commit()
+        remaining = {row.fingerprint for row in db.query(LLMResult).all()}
+    finally:
+        db.close()
+        event.remove(session.engine, "before_cursor_execute", record)
+    assert remaining == {"0x03", "0x04"}
+    assert cache.stats()["dbEvictions"] == 2
+    # The table is counted once; later inserts update the running count.
+    assert sum("count(" in statement.lower() for statement in statements) == 1
+
+
+def test_attestation_is_persisted_and_backfilled(client):
+    headers = {"X-API-Key": "test-key"}
+    payload = {
+        "batchId": "VA-2025-EXTRACT-6",
+        "productName": "Vitamin A 10,000 IU",
+        "supplementType": "Vitamin A",
+        "manufacturer": "PureSupplements Inc.",
+        "productionDate": "2025-01-15",
+    }
+    client.post("/batches", json=payload, headers=headers)
+    pdf_bytes = (Path(__file__).parent / "fixtures" / "sample.pdf").read_bytes()
+    files = {"file": ("sample.pdf", pdf_bytes, "application/pdf")}
+    client.post("/batches/VA-2025-EXTRACT-6/documents", files=files, headers=headers)
+    client.post("/batches/VA-2025-EXTRACT-6/extract", headers=headers)
+
+    db = session.SessionLocal()
+    try:
+        batch = db.get(Batch, "VA-2025-EXTRACT-6")
+        extraction = db.get(Extraction, "VA-2025-EXTRACT-6")
+        rebuilt = build_attestation_json(
+            batch, ExtractionResult.model_validate(extraction.extracted_fields), extraction.document_fingerprint
+        )
+        assert extraction.canonical_json == rebuilt
+        assert extraction.attestation_hash == "0x" + hash_attestation(rebuilt).hex()
+        assert extraction.schema_version == "1.0"
+
+        # Simulate a row written before the attestation columns existed.
+        extraction.canonical_json = extraction.attestation_hash = extraction.schema_version = None
+        db.commit()
+    finally:
+        db.close()
+
+    attestation = client.get("/batches/VA-2025-EXTRACT-6/attestation", headers=headers).json()
+    assert attestation["canonicalJson"] == json.loads(rebuilt)
+    assert attestation["canonicalJsonHash"] == "0x" + hash_attestation(rebuilt).hex()
+
+    db = session.SessionLocal()
+    try:
+        assert db.get(Extraction, "VA-2025-EXTRACT-6").canonical_json == rebuilt
+    finally:
+        db.close()
+
+
+def test_extraction_with_a_report_date_is_attested(client, monkeypatch):
+    monkeypatch.setattr(
+        result_cache,
+        "extract_lab_report",
+        lambda text: ExtractionResult(lab_name="Eurofins", report_date=date(2025, 1, 20), confidence=0.9),
+    )
+    headers = {"X-API-Key": "test-key"}
+    payload = {
+        "batchId": "VA-2025-EXTRACT-7",
+        "productName": "Vitamin A 10,000 IU",
+        "supplementType": "Vitamin A",
+        "manufacturer": "PureSupplements Inc.",
+        "productionDate": "2025-01-15",
+    }
+    client.post("/batches", json=payload, headers=headers)
+    pdf_bytes = (Path(__file__).parent / "fixtures" / "sample.pdf").read_bytes()
+    files = {"file": ("sample.pdf", pdf_bytes, "application/pdf")}
+    client.post("/batches/VA-2025-EXTRACT-7/documents", files=files, headers=headers)
+
+    response = client.post("/batches/VA-2025-EXTRACT-7/extract", headers=headers)
+    assert response.status_code == 200
+    attestation = client.get("/batches/VA-2025-EXTRACT-7/attestation", headers=headers).json()
+    assert attestation["canonicalJson"]["extractedFields"]["reportDate"] == "2025-01-20"
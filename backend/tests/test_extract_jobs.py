@@ -0,0 +1,112 @@
+from pathlib import Path
+
+from app.ai.jobs import ExtractJobQueue, get_extract_job_queue
+from app.core import config
+from app.db import session
+from app.models.extract_job import ExtractJobItem, ExtractJobItemStatus
+
+HEADERS = {"X-API-Key": "test-key"}
+
+
+def _create_batch_with_document(client, batch_id: str, manufacturer: str) -> None:
+    payload = {
+        "batchId": batch_id,
+        "productName": "Vitamin A 10,000 IU",
+        "supplementType": "Vitamin A",
+        "manufacturer": manufacturer,
+        "productionDate": "2025-01-15",
+    }
+    assert client.post("/batches", json=payload, headers=HEADERS).status_code == 201
+    pdf_bytes = (Path(__file__).parent / "fixtures" / "sample.pdf").read_bytes()
+    files = {"file": ("sample.pdf", pdf_bytes, "application/pdf")}
+    assert client.post(f"/batches/{batch_id}/documents", files=files, headers=HEADERS).status_code == 201
+
+
+def test_extract_job_runs_all_batches_and_reports_failures(client):
+    _create_batch_with_document(client, "VA-2025-JOB-1", "PureSupplements Inc.")
+    _create_batch_with_document(client, "VA-2025-JOB-2", "PureSupplements Inc.")
+    _create_batch_with_document(client, "VA-2025-JOB-3", "Acme Nutrition")
+
+    response = client.post(
+        "/extract-jobs",
+        json={"batchIds": ["VA-2025-JOB-1", "VA-2025-JOB-2", "VA-2025-JOB-3", "VA-2025-MISSING", "VA-2025-JOB-1"]},
+        headers=HEADERS,
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert response.headers["location"] == f"/extract-jobs/{job['jobId']}"
+    assert job["total"] == 4
+    assert job["progress"]["queued"] == 3
+    assert job["progress"]["failed"] == 1
+
+    queue = get_extract_job_queue()
+    while queue.process_next():
+        pass
+
+    job = client.get(f"/extract-jobs/{job['jobId']}", headers=HEADERS).json()
+    assert job["status"] == "COMPLETED"
+    assert job["progress"] == {"queued": 0, "running": 0, "succeeded": 3, "failed": 1, "percentComplete": 100.0}
+    assert job["failures"][0]["batchId"] == "VA-2025-MISSING"
+    assert job["itemsPerSecond"] is not None
+    assert client.get("/batches/VA-2025-JOB-3", headers=HEADERS).json()["status"] == "READY"
+
+
+def test_claims_are_fair_across_manufacturers_and_recoverable(client, monkeypatch):
+    for index in range(3):
+        _create_batch_with_document(client, f"VA-2025-BIG-{index}", "BigCo")
+    _create_batch_with_document(client, "VA-2025-SMALL-0", "SmallCo")
+    client.post(
+        "/extract-jobs",
+        json={"batchIds": ["VA-2025-BIG-0", "VA-2025-BIG-1", "VA-2025-BIG-2"]},
+        headers=HEADERS,
+    )
+    client.post("/extract-jobs", json={"batchIds": ["VA-2025-SMALL-0"]}, headers=HEADERS)
+
+    queue = get_extract_job_queue()
+    db = session.SessionLocal()
+    try:
+        first = queue._claim(db)
+        second = queue._claim(db)
+        assert (first.batch_id, second.batch_id) == ("VA-2025-BIG-0", "VA-2025-SMALL-0")
+    finally:
+        db.close()
+
+    # Items held under a live lease are left alone; once the lease lapses they are re-queued.
+    assert queue.recover() == 0
+    assert queue.renew() == 2
+    monkeypatch.setattr(config.settings, "extract_lease_seconds", 0)
+    assert queue.recover() == 2
+    db = session.SessionLocal()
+    try:
+        running = db.query(ExtractJobItem).filter(ExtractJobItem.status == ExtractJobItemStatus.RUNNING).count()
+    finally:
+        db.close()
+    assert running == 0
+
+
+def test_unknown_extract_job_returns_404(client):
+    response = client.get("/extract-jobs/does-not-exist", headers=HEADERS)
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "JOB_NOT_FOUND"
+
+
+def test_item_requeued_from_a_lapsed_lease_keeps_the_new_owners_result(client, monkeypatch):
+    _create_batch_with_document(client, "VA-2025-LEASE-1", "PureSupplements Inc.")
+    job = client.post("/extract-jobs", json={"batchIds": ["VA-2025-LEASE-1"]}, headers=HEADERS).json()
+
+    stalled, other = ExtractJobQueue(), ExtractJobQueue()
+    db = session.SessionLocal()
+    try:
+        item = stalled._claim(db)
+        monkeypatch.setattr(config.settings, "extract_lease_seconds", 0)
+        assert other.recover() == 1
+        assert other.process_next()
+        # The stalled worker finishing late does not overwrite the item's state.
+        stalled._execute(db, item)
+        item = db.get(ExtractJobItem, item.item_id)
+        assert item.status == ExtractJobItemStatus.SUCCEEDED
+        assert item.worker_id == other.worker_id
+        assert item.attempts == 2
+    finally:
+        db.close()
+    assert client.get(f"/extract-jobs/{job['jobId']}", headers=HEADERS).json()["status"] == "COMPLETED"
@@ -0,0 +1,187 @@
+from datetime import datetime, timezone
+
+from app.chain.client import BatchHashRegistryClient, ChainReceipt, MockBatchHashRegistryClient
+from app.chain.deps import get_chain_client
+from app.chain.fees import bumped_fees
+from app.chain.hashing import hash_attestation, hash_batch_id, hex_to_bytes, to_hex
+from app.core import config
+from app.db import session
+from app.models.published_event import PublishedEvent
+from tests.test_verify import _create_ready_batch
+
+HEADERS = {"X-API-Key": "test-key"}
+
+
+def test_repeat_publish_costs_one_rpc(rpc_server):
+    client = BatchHashRegistryClient()
+
+    client.publish(b"\x01" * 32, b"\x02" * 32)
+    first = list(rpc_server.calls)
+    client.publish(b"\x03" * 32, b"\x04" * 32)
+    second = rpc_server.calls[len(first) :]
+
+    assert sorted(first) == [
+        "eth_chainId",
+        "eth_estimateGas",
+        "eth_gasPrice",
+        "eth_getTransactionCount",
+        "eth_sendRawTransaction",
+    ]
+    assert second == ["eth_sendRawTransaction"]
+    assert client.fees.stats()["hits"] >= 2
+
+
+def test_newer_block_refreshes_fees_but_not_gas_limit(rpc_server):
+    client = BatchHashRegistryClient()
+
+    tx_hash = client.publish(b"\x01" * 32, b"\x02" * 32)
+    client.get_receipt(tx_hash)
+    rpc_server.calls.clear()
+    client.publish(b"\x03" * 32, b"\x04" * 32)
+
+    assert rpc_server.calls == ["eth_gasPrice", "eth_sendRawTransaction"]
+
+
+def test_eip1559_fees(rpc_server, monkeypatch):
+    monkeypatch.setattr(config.settings, "chain_eip1559", True)
+    client = BatchHashRegistryClient()
+    sent = []
+    client._broadcast = lambda tx, publisher: sent.append(tx) or "0x" + "aa" * 32
+
+    client.publish(b"\x01" * 32, b"\x02" * 32)
+
+    assert sent[0]["maxPriorityFeePerGas"] == 2 * 10**9
+    assert sent[0]["maxFeePerGas"] == 2 * 10**9 + 2 * 10**9
+    assert sent[0]["gas"] == 60_000
+    assert "gasPrice" not in sent[0]
+    assert client.fees.stats()["headBlock"] == 12
+
+
+def test_bumped_fees_raise_every_fee_field(monkeypatch):
+    monkeypatch.setattr(config.settings, "tx_replacement_bump", 1.125)
+
+    assert bumped_fees({"gasPrice": 100}, {"gasPrice": 50}) == {"gasPrice": 113}
+    assert bumped_fees({"gasPrice": 100}, {"gasPrice": 500}) == {"gasPrice": 500}
+    assert bumped_fees(
+        {"maxFeePerGas": 1000, "maxPriorityFeePerGas": 100},
+        {"maxFeePerGas": 900, "maxPriorityFeePerGas": 200},
+    ) == {"maxFeePerGas": 1126, "maxPriorityFeePerGas": 200}
+
+
+class CountingChainClient(MockBatchHashRegistryClient):
+    def __init__(self):
+        super().__init__()
+        self.sent = 0
+
+    def publish(self, batch_id_hash, attestation_hash):
+        self.sent += 1
+        return super().publish(batch_id_hash, attestation_hash)
+
+
+def test_preflight_skips_batches_already_anchored(client):
+    chain_client = CountingChainClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    batch_id, canonical_json = _create_ready_batch("VA-2025-PREFLIGHT-1")
+    MockBatchHashRegistryClient.publish(chain_client, hash_batch_id(batch_id), hash_attestation(canonical_json))
+
+    # The indexed event names the original transaction, and the batch is backfilled from it.
+    db = session.SessionLocal()
+    db.add(
+        PublishedEvent(
+            batch_id_hash=to_hex(hash_batch_id(batch_id)),
+            attestation_hash=to_hex(hash_attestation(canonical_json)),
+            publisher=chain_client.publisher_address,
+            published_at=datetime(2025, 2, 1, tzinfo=timezone.utc),
+            block_number=1,
+            block_hash="0x" + "11" * 32,
+            tx_hash="0x" + "22" * 32,
+            log_index=0,
+        )
+    )
+    db.commit()
+    db.close()
+
+    response = client.post(f"/batches/{batch_id}/publish", headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json()["txHash"] == "0x" + "22" * 32
+    attestation = client.get(f"/batches/{batch_id}/attestation", headers=HEADERS).json()
+    assert attestation["published"] is True
+    assert attestation["txHash"] == "0x" + "22" * 32
+    assert chain_client.sent == 0
+
+
+def test_unindexed_publish_is_backfilled_from_chain_logs(client):
+    chain_client = CountingChainClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    batch_id, canonical_json = _create_ready_batch("VA-2025-PREFLIGHT-3")
+    tx_hash = MockBatchHashRegistryClient.publish(chain_client, hash_batch_id(batch_id), hash_attestation(canonical_json))
+
+    response = client.post(f"/batches/{batch_id}/publish", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["txHash"] == tx_hash
+    assert response.json()["blockNumber"] == 1
+    assert client.get(f"/batches/{batch_id}", headers=HEADERS).json()["status"] == "PUBLISHED"
+    assert chain_client.sent == 0
+
+
+def test_publish_without_a_findable_log_is_still_marked_published(client):
+    chain_client = CountingChainClient()
+    chain_client.find_published_event = lambda batch_id_hash: None
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    batch_id, canonical_json = _create_ready_batch("VA-2025-PREFLIGHT-4")
+    MockBatchHashRegistryClient.publish(chain_client, hash_batch_id(batch_id), hash_attestation(canonical_json))
+
+    response = client.post(f"/batches/{batch_id}/publish", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["txHash"] is None
+    attestation = client.get(f"/batches/{batch_id}/attestation", headers=HEADERS).json()
+    assert attestation["published"] is True
+    assert attestation["txHash"] is None
+
+
+def test_reverted_publish_keeps_the_batch_ready(client):
+    chain_client = MockBatchHashRegistryClient()
+    chain_client.get_receipt = lambda tx_hash: ChainReceipt(tx_hash=tx_hash, block_number=1, success=False)
+    chain_client.get = lambda batch_id_hash: None
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    batch_id, _canonical_json = _create_ready_batch("VA-2025-REVERT-1")
+
+    response = client.post(f"/batches/{batch_id}/publish", headers=HEADERS)
+
+    assert response.status_code == 502
+    assert response.json()["error"]["code"] == "PUBLISH_REVERTED"
+    attestation = client.get(f"/batches/{batch_id}/attestation", headers=HEADERS).json()
+    assert attestation["published"] is False
+    assert attestation["txHash"] is None
+
+
+def test_publish_that_reverts_as_a_duplicate_is_resolved_from_the_chain(client, monkeypatch):
+    monkeypatch.setattr(config.settings, "publish_preflight", False)
+    chain_client = MockBatchHashRegistryClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    batch_id, canonical_json = _create_ready_batch("VA-2025-REVERT-2")
+    original = chain_client.publish(hash_batch_id(batch_id), hash_attestation(canonical_json))
+    # Without preflight or a per-transaction estimate, the duplicate is mined and reverts.
+    chain_client.get_receipt = lambda tx_hash: ChainReceipt(tx_hash="0x" + "33" * 32, block_number=2, success=False)
+
+    response = client.post(f"/batches/{batch_id}/publish", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["txHash"] == original
+    assert client.get(f"/batches/{batch_id}", headers=HEADERS).json()["status"] == "PUBLISHED"
+
+
+def test_preflight_rejects_a_different_anchored_hash(client):
+    chain_client = CountingChainClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    batch_id, _canonical_json = _create_ready_batch("VA-2025-PREFLIGHT-2")
+    other = hash_attestation("something else")
+    MockBatchHashRegistryClient.publish(chain_client, hash_batch_id(batch_id), other)
+
+    response = client.post(f"/batches/{batch_id}/publish", headers=HEADERS)
+
+    assert response.status_code == 409
+    assert hex_to_bytes(response.json()["error"]["details"]["onchainHash"]) == other
+    assert chain_client.sent == 0
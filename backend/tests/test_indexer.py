@@ -0,0 +1,123 @@
+from datetime import date, datetime, timezone
+
+from web3 import Web3
+
+from app.chain.client import MockBatchHashRegistryClient
+from app.chain.deps import get_chain_client
+from app.chain.hashing import build_attestation_json, hash_attestation, hash_batch_id
+from app.chain.indexer import CHECKPOINT_NAME, get_published_event_indexer
+from app.core import config
+from app.db import session
+from app.models.batch import Batch, BatchStatus
+from app.models.extraction import Extraction
+from app.models.published_event import IndexerCheckpoint, PublishedEvent
+from app.schemas.extraction import ExtractionResult, ModelInfo
+
+
+class NoRpcChainClient(MockBatchHashRegistryClient):
+    def get(self, batch_id_hash: bytes):
+        raise AssertionError("verify should be answered from the index")
+
+
+class ReorgingChainClient(MockBatchHashRegistryClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fork = 0
+
+    def get_block_hash(self, block_number: int):
+        block_hash = super().get_block_hash(block_number)
+        if block_hash is None or self.fork == 0:
+            return block_hash
+        return Web3.to_hex(Web3.keccak(text=f"fork-{self.fork}:{block_number}"))
+
+
+def _create_ready_batch(batch_id: str) -> bytes:
+    db = session.SessionLocal()
+    batch = Batch(
+        batch_id=batch_id,
+        product_name="Vitamin A 10,000 IU",
+        supplement_type="Vitamin A",
+        manufacturer="PureSupplements Inc.",
+        production_date=date(2025, 1, 15),
+        status=BatchStatus.READY,
+    )
+    extraction = ExtractionResult(confidence=0.1)
+    db.add(batch)
+    db.add(
+        Extraction(
+            batch_id=batch_id,
+            extracted_fields=extraction.model_dump(by_alias=True),
+            model_info=ModelInfo(model_name="mock", version="0").model_dump(by_alias=True),
+            extracted_at=datetime(2025, 1, 16, tzinfo=timezone.utc),
+            document_fingerprint="0x" + "00" * 32,
+        )
+    )
+    db.commit()
+    attestation_hash = hash_attestation(build_attestation_json(batch, extraction, "0x" + "00" * 32))
+    db.close()
+    return attestation_hash
+
+
+def test_indexer_recovers_external_publish_and_serves_verify(client, monkeypatch):
+    monkeypatch.setattr(config.settings, "verify_source", "index")
+    monkeypatch.setattr(config.settings, "verify_index_fallback", False)
+    attestation_hash = _create_ready_batch("VA-2025-INDEX-1")
+
+    chain_client = NoRpcChainClient()
+    chain_client.publish(hash_batch_id("VA-2025-INDEX-1"), attestation_hash)
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+
+    assert get_published_event_indexer().poll_once(chain_client) == 1
+
+    batch = client.get("/batches/VA-2025-INDEX-1", headers={"X-API-Key": "test-key"}).json()
+    assert batch["status"] == "PUBLISHED"
+    attestation = client.get("/batches/VA-2025-INDEX-1/attestation", headers={"X-API-Key": "test-key"}).json()
+    assert attestation["publisherAddress"] == chain_client.publisher_address
+    assert attestation["txHash"]
+
+    verify = client.get("/batches/VA-2025-INDEX-1/verify").json()
+    assert verify["verified"] is True
+
+
+def test_indexer_rolls_back_on_reorg(client, monkeypatch):
+    monkeypatch.setattr(config.settings, "indexer_reorg_depth", 5)
+    attestation_hash = _create_ready_batch("VA-2025-INDEX-2")
+    chain_client = ReorgingChainClient()
+    chain_client.publish(hash_batch_id("VA-2025-INDEX-2"), attestation_hash)
+    chain_client.mine_blocks(3)
+
+    indexer = get_published_event_indexer()
+    assert indexer.poll_once(chain_client) == 1
+
+    chain_client.fork = 1
+    assert indexer.poll_once(chain_client) == 1
+
+    db = session.SessionLocal()
+    checkpoint = db.get(IndexerCheckpoint, CHECKPOINT_NAME)
+    assert checkpoint.block_number == chain_client.get_block_number()
+    assert checkpoint.block_hash == chain_client.get_block_hash(checkpoint.block_number)
+    assert db.query(PublishedEvent).count() == 1
+    db.close()
+
+
+def test_reorg_that_drops_a_publish_returns_the_batch_to_ready(client, monkeypatch):
+    monkeypatch.setattr(config.settings, "indexer_reorg_depth", 5)
+    attestation_hash = _create_ready_batch("VA-2025-INDEX-3")
+    chain_client = ReorgingChainClient()
+    chain_client.publish(hash_batch_id("VA-2025-INDEX-3"), attestation_hash)
+    chain_client.mine_blocks(3)
+    headers = {"X-API-Key": "test-key"}
+
+    indexer = get_published_event_indexer()
+    assert indexer.poll_once(chain_client) == 1
+    assert client.get("/batches/VA-2025-INDEX-3", headers=headers).json()["status"] == "PUBLISHED"
+
+    # The new branch does not contain the publish.
+    chain_client.fork = 1
+    chain_client._events.clear()
+    assert indexer.poll_once(chain_client) == 0
+
+    assert client.get("/batches/VA-2025-INDEX-3", headers=headers).json()["status"] == "READY"
+    attestation = client.get("/batches/VA-2025-INDEX-3/attestation", headers=headers).json()
+    assert attestation["txHash"] is None
+    assert attestation["publisherAddress"] is None
@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.ai import llm
+from app.ai.concurrency import AdaptiveConcurrencyLimiter
+from app.ai.llm_client import LLMClient
+from app.core import config
+
+COMPLETION = {
+    "choices": [
+        {"message": {"content": json.dumps({"labName": "Eurofins", "confidence": 0.9, "analytes": []})}}
+    ]
+}
+
+
+@pytest.fixture()
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(config.settings, "llm_backoff_base", 0.01)
+    monkeypatch.setattr(config.settings, "llm_backoff_max", 1.0)
+
+
+def test_retries_rate_limits_and_honours_retry_after(fast_retries):
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0.05"}),
+        httpx.Response(503),
+        httpx.Response(200, json=COMPLETION),
+    ]
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return responses.pop(0)
+
+    client = LLMClient(transport=httpx.MockTransport(handler))
+    try:
+        response = client.post_json("https://llm.test/chat/completions", {"model": "m"}, {})
+    finally:
+        client.close()
+    assert response.status_code == 200
+    assert len(seen) == 3
+    assert client.stats()["retries"] == 2
+    assert client.limiter.throttled == 1
+
+
+def test_gives_up_when_retry_after_is_too_long(fast_retries):
+    client = LLMClient(transport=httpx.MockTransport(lambda request: httpx.Response(429, headers={"Retry-After": "3600"})))
+    try:
+        response = client.post_json("https://llm.test/chat/completions", {}, {})
+    finally:
+        client.close()
+    assert response.status_code == 429
+    assert client.stats()["retries"] == 0
+
+
+def test_limiter_is_additive_increase_multiplicative_decrease():
+    limiter = AdaptiveConcurrencyLimiter(initial=8, minimum=1, maximum=10)
+    limiter.on_throttled()
+    assert limiter.stats()["limit"] == 4
+    for _ in range(8):
+        limiter.on_success()
+    assert limiter.stats()["limit"] == 5
+
+    async def run_many():
+        active = []
+        peak = 0
+
+        async def task():
+            nonlocal peak
+            async with limiter.slot():
+                active.append(1)
+                peak = max(peak, len(active))
+                await asyncio.sleep(0.01)
+                active.pop()
+
+        await asyncio.gather(*(task() for _ in range(20)))
+        return peak
+
+    assert asyncio.run(run_many()) <= 10
+
+
+def test_extract_lab_report_uses_shared_client(monkeypatch, fast_retries):
+    client = LLMClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=COMPLETION))
+    )
+    monkeypatch.setattr(llm, "get_llm_client", lambda: client)
+    monkeypatch.setattr(config.settings, "llm_provider", "openai")
+    monkeypatch.setattr(config.settings, "llm_base_url", "https://llm.test/v1")
+    monkeypatch.setattr(config.settings, "llm_api_key", "key")
+    monkeypatch.setattr(config.settings, "llm_model", "gpt-test")
+    try:
+        first = llm.extract_lab_report("text")
+        second = llm.extract_lab_report("more text")
+    finally:
+        client.close()
+    assert first.lab_name == "Eurofins"
+    assert second.confidence == 0.9
+    assert client.stats()["requests"] == 2
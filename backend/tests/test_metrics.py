@@ -0,0 +1,134 @@
+import asyncio
+import inspect
+import re
+
+import pytest
+
+from app.core.metrics import (
+    CHAIN_RPC_DURATION,
+    CHAIN_RPC_ERRORS,
+    Histogram,
+    STAGE_DURATION,
+    STAGE_ERRORS,
+    _Metric,
+    instrument_rpc_provider,
+    stage_timer,
+    timed_stage,
+)
+
+
+def _sample(text: str, name: str, labels: str) -> float:
+    match = re.search(rf"^{re.escape(name + labels)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_metrics_endpoint_reports_routes_db_and_caches(client):
+    headers = {"X-API-Key": "test-key"}
+    payload = {
+        "batchId": "MET-2025-0001",
+        "productName": "Vitamin D3",
+        "supplementType": "Vitamin D",
+        "manufacturer": "PureSupplements Inc.",
+        "productionDate": "2025-01-15",
+    }
+    before = client.get("/metrics").text
+    assert client.post("/batches", json=payload, headers=headers).status_code == 201
+    assert client.get("/batches/MET-2025-0001", headers=headers).status_code == 200
+    assert client.get("/batches/MISSING", headers=headers).status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    route_ok = '{method="GET",route="/batches/{batchId}",status="200"}'
+    route_missing = '{method="GET",route="/batches/{batchId}",status="404"}'
+    assert _sample(text, "http_requests_total", route_ok) == _sample(before, "http_requests_total", route_ok) + 1
+    assert _sample(text, "http_requests_total", route_missing) == _sample(before, "http_requests_total", route_missing) + 1
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/batches/{batchId}",le="+Inf"}' in text
+    assert _sample(text, "db_query_duration_seconds_count", '{operation="SELECT"}') > _sample(
+        before, "db_query_duration_seconds_count", '{operation="SELECT"}'
+    )
+    assert _sample(text, "db_query_duration_seconds_count", '{operation="INSERT"}') >= 1
+    assert "http_requests_in_flight 1" in text
+    assert 'cache_hits_total{cache="attestations"}' in text
+    assert 'cache_entries{cache="extractedText"}' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_latency_seconds", "Test histogram.", ("stage",), buckets=(0.1, 1.0))
+    child = histogram.labels("parse")
+    for value in (0.05, 0.5, 0.5, 3.0):
+        child.observe(value)
+
+    lines = list(histogram.samples())
+    assert lines == [
+        'test_latency_seconds_bucket{stage="parse",le="0.1"} 1',
+        'test_latency_seconds_bucket{stage="parse",le="1"} 3',
+        'test_latency_seconds_bucket{stage="parse",le="+Inf"} 4',
+        'test_latency_seconds_sum{stage="parse"} 4.05',
+        'test_latency_seconds_count{stage="parse"} 4',
+    ]
+
+
+def test_metric_subclasses_must_implement_children_and_samples():
+    class Incomplete(_Metric):
+        kind = "counter"
+
+    with pytest.raises(TypeError):
+        Incomplete("test_incomplete_total", "Missing methods.")
+
+
+def test_stage_timer_counts_errors():
+    durations = STAGE_DURATION.labels("test_stage")
+    errors = STAGE_ERRORS.labels("test_stage")
+    count_before, errors_before = sum(durations.counts), errors.value
+
+    with stage_timer("test_stage"):
+        pass
+    with pytest.raises(ValueError):
+        with stage_timer("test_stage"):
+            raise ValueError("boom")
+
+    assert sum(durations.counts) == count_before + 2
+    assert errors.value == errors_before + 1
+
+
+def test_timed_stage_awaits_coroutine_functions():
+    durations = STAGE_DURATION.labels("test_async_stage")
+    count_before, sum_before = sum(durations.counts), durations.sum
+
+    @timed_stage("test_async_stage")
+    async def wait():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    assert inspect.iscoroutinefunction(wait)
+    assert asyncio.run(wait()) == "done"
+    assert sum(durations.counts) == count_before + 1
+    assert durations.sum - sum_before >= 0.05
+
+
+def test_instrumented_provider_times_each_rpc_method():
+    class StubProvider:
+        def make_request(self, method, params):
+            if method == "eth_estimateGas":
+                return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "execution reverted"}}
+            return {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
+
+        def make_batch_request(self, requests):
+            return [{"jsonrpc": "2.0", "id": 1, "result": None} for _ in requests]
+
+    provider = StubProvider()
+    instrument_rpc_provider(provider)
+    calls_before = sum(CHAIN_RPC_DURATION.labels("eth_call").counts)
+    errors_before = CHAIN_RPC_ERRORS.labels("eth_estimateGas").value
+    batch_before = sum(CHAIN_RPC_DURATION.labels("batch").counts)
+
+    assert provider.make_request("eth_call", [])["result"] == "0x1"
+    provider.make_request("eth_estimateGas", [])
+    provider.make_batch_request([("eth_getTransactionReceipt", ["0x01"])])
+
+    assert sum(CHAIN_RPC_DURATION.labels("eth_call").counts) == calls_before + 1
+    assert CHAIN_RPC_ERRORS.labels("eth_estimateGas").value == errors_before + 1
+    assert sum(CHAIN_RPC_DURATION.labels("batch").counts) == batch_before + 1
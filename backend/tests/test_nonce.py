@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.chain.nonce import NonceManager
+
+
+class FakeChain:
+    def __init__(self, mined: int = 0, pending: int | None = None):
+        self.mined = mined
+        self.pending = mined if pending is None else pending
+        self.calls = 0
+
+    def fetch(self, block: str) -> int:
+        self.calls += 1
+        return self.pending if block == "pending" else self.mined
+
+
+def test_reserve_hands_out_unique_nonces_concurrently():
+    chain = FakeChain(mined=7)
+    nonces = NonceManager(chain.fetch)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        reserved = list(pool.map(lambda _: nonces.reserve(), range(200)))
+
+    assert sorted(reserved) == list(range(7, 207))
+    assert chain.calls == 1
+
+
+def test_release_reuses_unbroadcast_nonce():
+    nonces = NonceManager(FakeChain(mined=3).fetch)
+    first = nonces.reserve()
+    nonces.release(first)
+    assert nonces.reserve() == first
+
+
+def test_resync_moves_past_nonce_used_elsewhere():
+    chain = FakeChain(mined=0)
+    nonces = NonceManager(chain.fetch)
+    assert nonces.reserve() == 0
+
+    chain.mined = chain.pending = 5
+    assert nonces.resync() == []
+    assert nonces.reserve() == 5
+
+
+def test_resync_reports_dropped_transactions_and_confirm_clears_lower_nonces():
+    chain = FakeChain(mined=0)
+    nonces = NonceManager(chain.fetch)
+    for nonce in range(3):
+        assert nonces.reserve() == nonce
+        nonces.track(nonce, f"0x{nonce}", {"nonce": nonce})
+
+    chain.mined, chain.pending = 1, 1
+    dropped = nonces.resync()
+    assert [pending.nonce for pending in dropped] == [1, 2]
+    assert nonces.in_flight == 2
+    assert nonces.reserve() == 3
+
+    nonces.replace(2, "0x2b", {"nonce": 2})
+    assert nonces.resolve("0x2") == "0x2b"
+    nonces.confirm("0x2b")
+    assert nonces.in_flight == 0
+
+
+def test_release_below_the_head_is_reused_instead_of_refetching():
+    chain = FakeChain(mined=0)
+    nonces = NonceManager(chain.fetch)
+    first, second = nonces.reserve(), nonces.reserve()
+    nonces.track(second, "0x1", {"nonce": second})
+
+    # The node's pending count knows nothing of `first`; refetching it would hand out a duplicate.
+    nonces.release(first)
+    assert nonces.reserve() == first
+    assert nonces.reserve() == 2
+    assert chain.calls == 1
+
+
+def test_resync_rewinds_and_fills_nonces_nobody_holds():
+    chain = FakeChain(mined=0)
+    nonces = NonceManager(chain.fetch)
+    assert [nonces.reserve() for _ in range(4)] == [0, 1, 2, 3]
+    nonces.track(3, "0x3", {"nonce": 3})
+    nonces.release(1)
+    nonces.release(2)
+
+    # Nonce 0 is still being sent and 3 is tracked; 1 and 2 were lost and are refilled first.
+    assert [pending.nonce for pending in nonces.resync()] == [3]
+    assert [nonces.reserve() for _ in range(3)] == [1, 2, 4]
+
+    for nonce in (0, 1, 2, 4):
+        nonces.release(nonce)
+    nonces.confirm("0x3")
+    # With nothing held or tracked, the sequence rewinds to the chain's pending count.
+    assert nonces.resync() == []
+    assert nonces.reserve() == 0
@@ -0,0 +1,158 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+import time
+
+import fitz
+import pytest
+from fastapi import HTTPException
+
+from app.ai import pdf_text, pdf_worker
+from app.ai.parse_pool import PdfParsePool
+from app.core import config
+
+SAMPLE_PDF = Path(__file__).parent / "fixtures" / "sample.pdf"
+
+
+@pytest.fixture()
+def pool(monkeypatch):
+    monkeypatch.setattr(config.settings, "pdf_parse_workers", 1)
+    parse_pool = PdfParsePool()
+    yield parse_pool
+    parse_pool.shutdown()
+
+
+def test_parses_in_a_separate_process(pool):
+    text = pool.parse_path(str(SAMPLE_PDF))
+    assert text == pool.parse_bytes(SAMPLE_PDF.read_bytes())
+    assert pool.run(pdf_worker.worker_pid) != os.getpid()
+    assert pool.stats()["completed"] == 3
+
+
+def test_timeout_recreates_the_pool(pool, monkeypatch):
+    monkeypatch.setattr(config.settings, "pdf_parse_timeout", 0.5)
+    with pytest.raises(HTTPException) as exc_info:
+        pool.run(time.sleep, 10)
+    assert exc_info.value.status_code == 504
+    assert pool.stats()["restarts"] == 1
+
+    monkeypatch.setattr(config.settings, "pdf_parse_timeout", 60)
+    assert pool.parse_path(str(SAMPLE_PDF))
+
+
+def test_time_spent_queued_does_not_count_towards_the_timeout(pool, monkeypatch):
+    monkeypatch.setattr(config.settings, "pdf_parse_timeout", 1.5)
+    pool.run(pdf_worker.worker_pid)
+    # One worker: the second sleep waits a second in the queue, then runs well within its own deadline.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(pool.run, time.sleep, 1.0) for _ in range(2)]
+        assert [future.result() for future in futures] == [None, None]
+    assert pool.stats()["timeouts"] == 0
+
+
+def test_timeout_only_replaces_the_worker_that_hung(monkeypatch):
+    monkeypatch.setattr(config.settings, "pdf_parse_workers", 2)
+    monkeypatch.setattr(config.settings, "pdf_parse_timeout", 2.0)
+    parse_pool = PdfParsePool()
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hung = executor.submit(parse_pool.run, time.sleep, 30)
+            time.sleep(1.0)
+            # Still running on the other worker when the hung one is killed.
+            in_flight = executor.submit(parse_pool.run, time.sleep, 1.5)
+            with pytest.raises(HTTPException) as exc_info:
+                hung.result()
+            assert exc_info.value.status_code == 504
+            assert in_flight.result() is None
+        assert parse_pool.stats()["restarts"] == 1
+    finally:
+        parse_pool.shutdown()
+
+
+def test_crashed_worker_is_isolated(pool):
+    with pytest.raises(HTTPException) as exc_info:
+        pool.run(os._exit, 1)
+    assert exc_info.value.status_code == 422
+    assert pool.stats()["restarts"] == 1
+    assert pool.parse_path(str(SAMPLE_PDF))
+
+
+def test_invalid_pdf_is_reported(pool):
+    with pytest.raises(HTTPException) as exc_info:
+        pool.parse_bytes(b"not a pdf")
+    assert exc_info.value.detail["error"]["code"] == "PDF_PARSE_FAILED"
+
+
+def _write_report(path: Path, pages: int) -> Path:
+    doc = fitz.open()
+    for index in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Panel {index} analyte   result\n   PASS")
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_page_ranges_are_parsed_in_parallel(monkeypatch, tmp_path):
+    monkeypatch.setattr(config.settings, "pdf_parse_workers", 2)
+    monkeypatch.setattr(config.settings, "pdf_pages_per_job", 2)
+    report = _write_report(tmp_path / "report.pdf", 7)
+    doc = fitz.open(str(report))
+    whole_document = " ".join("".join(page.get_text("text") for page in doc).split())
+    doc.close()
+
+    parse_pool = PdfParsePool()
+    try:
+        text = parse_pool.parse_path(str(report))
+        assert text.count(pdf_text.PAGE_BREAK) == 6
+        assert pdf_text.flatten_pages(text) == whole_document
+        # One page-count job plus four range jobs.
+        assert parse_pool.stats()["completed"] == 5
+
+        monkeypatch.setattr(config.settings, "pdf_max_pages", 3)
+        assert parse_pool.parse_path(str(report)).count("Panel") == 3
+        monkeypatch.setattr(config.settings, "pdf_max_chars", 20)
+        assert len(parse_pool.parse_path(str(report))) == 20
+    finally:
+        parse_pool.shutdown()
+
+
+def test_unreadable_pages_fall_back_to_pdfminer(monkeypatch, tmp_path):
+    report = _write_report(tmp_path / "report.pdf", 3)
+    open_fitz = pdf_text._open_fitz
+
+    class FlakyDocument:
+        def __init__(self, doc):
+            self._doc = doc
+            self.page_count = doc.page_count
+
+        def load_page(self, index):
+            if index in (1, 2):
+                raise RuntimeError("cannot render page")
+            return self._doc.load_page(index)
+
+        def close(self):
+            self._doc.close()
+
+    opened = []
+    pdfminer_pages = pdf_text._PdfminerPages
+
+    def open_pdfminer(source):
+        opened.append(source)
+        return pdfminer_pages(source)
+
+    monkeypatch.setattr(pdf_text, "_open_fitz", lambda source: FlakyDocument(open_fitz(source)))
+    monkeypatch.setattr(pdf_text, "_PdfminerPages", open_pdfminer)
+    pages = list(pdf_text.iter_page_texts(str(report)))
+    assert len(pages) == 3
+    assert pages[1].startswith("Panel 1")
+    assert pages[2].startswith("Panel 2")
+    # Both unreadable pages come from a single pdfminer pass over the document.
+    assert len(opened) == 1
+
+
+def test_joined_text_stops_at_the_character_cap():
+    pages = iter(["a" * 10, "b" * 10, "c" * 10])
+    assert pdf_text.join_page_texts(pages, max_chars=15) == "a" * 10 + pdf_text.PAGE_BREAK + "b" * 4
+    # Pages past the cap are never read.
+    assert next(pages) == "c" * 10
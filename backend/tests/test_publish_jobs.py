@@ -0,0 +1,127 @@
+from datetime import date, datetime, timezone
+import time
+
+from app.chain.client import ChainReceipt, MockBatchHashRegistryClient
+from app.chain.deps import get_chain_client
+from app.chain.tracker import ReceiptTracker, get_receipt_tracker
+from app.core import config
+from app.db import session
+from app.models.batch import Batch, BatchStatus
+from app.models.extraction import Extraction
+from app.schemas.extraction import ExtractionResult, ModelInfo
+
+
+def _create_ready_batch(batch_id: str) -> None:
+    db = session.SessionLocal()
+    db.add(
+        Batch(
+            batch_id=batch_id,
+            product_name="Vitamin A 10,000 IU",
+            supplement_type="Vitamin A",
+            manufacturer="PureSupplements Inc.",
+            production_date=date(2025, 1, 15),
+            status=BatchStatus.READY,
+        )
+    )
+    db.add(
+        Extraction(
+            batch_id=batch_id,
+            extracted_fields=ExtractionResult(confidence=0.1).model_dump(by_alias=True),
+            model_info=ModelInfo(model_name="mock", version="0").model_dump(by_alias=True),
+            extracted_at=datetime(2025, 1, 16, tzinfo=timezone.utc),
+            document_fingerprint="0x" + "00" * 32,
+        )
+    )
+    db.commit()
+    db.close()
+
+
+def test_async_publish_returns_job_and_tracker_confirms(client, monkeypatch):
+    monkeypatch.setattr(config.settings, "publish_confirmations", 3)
+    _create_ready_batch("VA-2025-ASYNC-1")
+    chain_client = MockBatchHashRegistryClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    headers = {"X-API-Key": "test-key"}
+
+    response = client.post("/batches/VA-2025-ASYNC-1/publish?mode=async", headers=headers)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "SUBMITTED"
+    assert response.headers["location"] == f"/publish-jobs/{job['jobId']}"
+
+    again = client.post("/batches/VA-2025-ASYNC-1/publish?mode=async", headers=headers)
+    assert again.status_code == 202
+    assert again.json()["jobId"] == job["jobId"]
+
+    tracker = get_receipt_tracker()
+    assert tracker.poll_once(chain_client) == 1
+    mined = client.get(f"/publish-jobs/{job['jobId']}", headers=headers).json()
+    assert mined["status"] == "MINED"
+    assert mined["confirmations"] == 1
+    assert client.get("/batches/VA-2025-ASYNC-1", headers=headers).json()["status"] == "READY"
+
+    chain_client.mine_blocks(2)
+    tracker.poll_once(chain_client)
+    confirmed = client.get(f"/publish-jobs/{job['jobId']}", headers=headers).json()
+    assert confirmed["status"] == "CONFIRMED"
+    assert confirmed["blockNumber"] == mined["blockNumber"]
+    assert confirmed["requiredConfirmations"] == 3
+    assert client.get("/batches/VA-2025-ASYNC-1", headers=headers).json()["status"] == "PUBLISHED"
+
+
+def test_reverted_transaction_fails_the_job_and_leaves_the_batch_ready(client):
+    _create_ready_batch("VA-2025-ASYNC-2")
+    chain_client = MockBatchHashRegistryClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    headers = {"X-API-Key": "test-key"}
+
+    job = client.post("/batches/VA-2025-ASYNC-2/publish?mode=async", headers=headers).json()
+    chain_client._receipts[job["txHash"]] = ChainReceipt(tx_hash=job["txHash"], block_number=1, success=False)
+    get_receipt_tracker().poll_once(chain_client)
+
+    failed = client.get(f"/publish-jobs/{job['jobId']}", headers=headers).json()
+    assert failed["status"] == "FAILED"
+    assert client.get("/batches/VA-2025-ASYNC-2", headers=headers).json()["status"] == "READY"
+    attestation = client.get("/batches/VA-2025-ASYNC-2/attestation", headers=headers).json()
+    assert attestation["txHash"] is None
+    assert attestation["publisherAddress"] is None
+
+
+def test_tracker_resumes_jobs_left_by_a_previous_process(client, monkeypatch):
+    _create_ready_batch("VA-2025-ASYNC-3")
+    chain_client = MockBatchHashRegistryClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    headers = {"X-API-Key": "test-key"}
+    job = client.post("/batches/VA-2025-ASYNC-3/publish?mode=async", headers=headers).json()
+
+    # A fresh process: nothing has started the tracker, so startup recovery must.
+    monkeypatch.setattr(config.settings, "publish_tracker_interval", 0.02)
+    tracker = ReceiptTracker()
+    try:
+        assert tracker.recover(lambda: chain_client) == 1
+        deadline = time.monotonic() + 5
+        while client.get(f"/publish-jobs/{job['jobId']}", headers=headers).json()["status"] != "CONFIRMED":
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+    finally:
+        tracker.stop()
+    assert client.get("/batches/VA-2025-ASYNC-3", headers=headers).json()["status"] == "PUBLISHED"
+    assert ReceiptTracker().recover(lambda: chain_client) == 0
+
+
+def test_get_publish_job_not_found(client):
+    response = client.get("/publish-jobs/missing", headers={"X-API-Key": "test-key"})
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "JOB_NOT_FOUND"
+
+
+def test_sync_publish_waits_for_receipt(client):
+    _create_ready_batch("VA-2025-SYNC-1")
+    chain_client = MockBatchHashRegistryClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    headers = {"X-API-Key": "test-key"}
+
+    response = client.post("/batches/VA-2025-SYNC-1/publish", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["blockNumber"] == chain_client.get_block_number()
+    assert client.get("/batches/VA-2025-SYNC-1", headers=headers).json()["status"] == "PUBLISHED"
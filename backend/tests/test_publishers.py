@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+from app.chain.client import BatchHashRegistryClient
+from app.chain.deps import get_chain_client
+from app.chain.nonce import NonceManager
+from app.chain.publishers import Publisher, PublisherPool
+from app.core import config
+from tests.rpc_stub import PRIVATE_KEY
+from tests.test_verify import _create_ready_batch
+
+SECOND_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+
+def _pool(count):
+    return PublisherPool(
+        [Publisher(SimpleNamespace(address=f"0x{index:040x}"), NonceManager(lambda block: 0)) for index in range(count)]
+    )
+
+
+def test_lease_prefers_least_loaded_and_rotates_idle_keys():
+    pool = _pool(3)
+    busy = pool.publishers[0]
+    busy.nonces.track(busy.nonces.reserve(), "0xaa", {})
+
+    picked = []
+    for _ in range(4):
+        with pool.lease() as publisher:
+            picked.append(publisher.address)
+    assert busy.address not in picked
+    assert set(picked) == {pool.publishers[1].address, pool.publishers[2].address}
+
+    # Nested leases count as load before anything is tracked.
+    with pool.lease() as first, pool.lease() as second:
+        assert first is not second
+
+
+def test_keys_with_stuck_transactions_go_last(monkeypatch):
+    monkeypatch.setattr(config.settings, "tx_stuck_seconds", 60)
+    pool = _pool(2)
+    busy, stuck = pool.publishers
+    for index in range(3):
+        busy.nonces.track(busy.nonces.reserve(), f"0xc{index}", {})
+    stuck.nonces.track(stuck.nonces.reserve(), "0xbb", {})
+    stuck.nonces.pending()[0].sent_at -= 120
+
+    with pool.lease() as publisher:
+        assert publisher is busy
+    stats = {entry["address"]: entry for entry in pool.stats()}
+    assert stats[stuck.address]["healthy"] is False
+    assert stats[stuck.address]["stuck"] == 1
+    assert stats[stuck.address]["oldestPendingSeconds"] >= 120
+    assert stats[busy.address]["healthy"] is True
+    assert stats[busy.address]["inFlight"] == 3
+    assert pool.for_tx("0xbb") is stuck
+
+
+def test_publishes_spread_over_keys_with_separate_nonces(rpc_server, monkeypatch):
+    monkeypatch.setattr(config.settings, "publisher_private_keys", f"{PRIVATE_KEY},{SECOND_KEY}")
+    client = BatchHashRegistryClient()
+
+    tx_hashes = [client.publish(bytes([index + 1]) * 32, b"\x02" * 32) for index in range(4)]
+
+    senders = [client.publisher_for(tx_hash) for tx_hash in tx_hashes]
+    assert len(set(senders)) == 2
+    # Each key fetched its starting nonce once and numbered its own transactions from there.
+    assert rpc_server.calls.count("eth_getTransactionCount") == 2
+    assert [entry["inFlight"] for entry in client.publisher_stats()] == [2, 2]
+    client.get_receipt(tx_hashes[0])
+    assert sorted(entry["inFlight"] for entry in client.publisher_stats()) == [1, 2]
+
+
+def test_publish_records_the_key_that_sent_it(client, rpc_server, monkeypatch):
+    monkeypatch.setattr(config.settings, "publisher_private_keys", f"{PRIVATE_KEY},{SECOND_KEY}")
+    chain_client = BatchHashRegistryClient()
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    headers = {"X-API-Key": "test-key"}
+
+    addresses = []
+    for batch_id in ("VA-2025-KEYS-1", "VA-2025-KEYS-2"):
+        _create_ready_batch(batch_id)
+        assert client.post(f"/batches/{batch_id}/publish", headers=headers).status_code == 200
+        attestation = client.get(f"/batches/{batch_id}/attestation", headers=headers).json()
+        addresses.append(attestation["publisherAddress"])
+
+    assert set(addresses) == {entry["address"] for entry in chain_client.publisher_stats()}
+    response = client.get("/chain/publishers", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()["publishers"]) == 2
@@ -0,0 +1,41 @@
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Generous enough for a cold CI runner; importing web3 alone used to take longer than this.
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", "3.0"))
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    assert client.get("/health").status_code == 200
+elapsed = time.perf_counter() - started
+heavy = ["web3", "eth_account", "fitz", "pymupdf", "pdfminer", "boto3"]
+print(json.dumps({"seconds": elapsed, "loaded": [name for name in heavy if name in sys.modules]}))
+"""
+
+
+def _probe(tmp_path) -> dict:
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_path}/startup.db",
+        "DB_CREATE_ALL": "true",
+        "EXTRACT_WORKERS": "0",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_app_starts_without_heavy_dependencies(tmp_path):
+    result = _probe(tmp_path)
+    assert result["loaded"] == []
+    assert result["seconds"] < STARTUP_BUDGET_SECONDS
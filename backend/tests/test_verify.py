@@ -1,11 +1,17 @@
+import asyncio
+import json
 from datetime import date, datetime, timezone
 
+from app.chain.async_client import AsyncBatchHashRegistryClient
+from app.chain.client import BatchHashRegistryClient, MockBatchHashRegistryClient
 from app.chain.deps import get_chain_client
-from app.chain.hashing import build_attestation_json, hash_attestation
+from app.chain.hashing import build_attestation_json, hash_attestation, hash_batch_id, hex_to_bytes
+from app.core import config
 from app.db import session
 from app.models.batch import Batch, BatchStatus
 from app.models.extraction import Extraction
 from app.schemas.extraction import ExtractionResult, ModelInfo
+from tests.rpc_stub import GET_MANY_SELECTOR
 
 
 class StubChainClient:
@@ -82,3 +88,82 @@ def test_verify_false_when_hashes_mismatch(client):
     data = response.json()
     assert data["verified"] is False
     assert data["mismatchReason"]
+
+
+def test_bulk_verify_streams_results_in_request_order(client):
+    chain_client = MockBatchHashRegistryClient()
+    published_id, canonical_json = _create_ready_batch("VA-2025-BULK-1")
+    unpublished_id, _canonical_json = _create_ready_batch("VA-2025-BULK-2")
+    chain_client.publish(hash_batch_id(published_id), hash_attestation(canonical_json))
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+
+    response = client.post(
+        "/batches/verify",
+        json={"batchIds": [unpublished_id, "VA-2025-MISSING", published_id, unpublished_id]},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [line["batchId"] for line in lines] == [unpublished_id, "VA-2025-MISSING", published_id]
+    assert lines[0]["verified"] is False
+    assert lines[1]["error"]["code"] == "BATCH_NOT_FOUND"
+    assert lines[2]["verified"] is True
+
+
+class FailingChainClient(MockBatchHashRegistryClient):
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+
+    def get(self, batch_id_hash):
+        self.fail_after -= 1
+        if self.fail_after < 0:
+            raise ConnectionError("node unavailable")
+        return super().get(batch_id_hash)
+
+
+def test_bulk_verify_reports_a_mid_stream_failure(client, monkeypatch):
+    monkeypatch.setattr(config.settings, "verify_batch_size", 1)
+    chain_client = FailingChainClient(fail_after=1)
+    client.app.dependency_overrides[get_chain_client] = lambda: chain_client
+    batch_ids = [_create_ready_batch(f"VA-2025-BULK-FAIL-{index}")[0] for index in range(3)]
+
+    response = client.post("/batches/verify", json={"batchIds": batch_ids})
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["batchId"] == batch_ids[0]
+    assert lines[1]["error"]["code"] == "VERIFY_FAILED"
+    assert lines[1]["error"]["details"]["unverifiedBatchIds"] == batch_ids[1:]
+    assert len(lines) == 2
+
+
+def test_get_many_falls_back_to_single_reads(rpc_server, monkeypatch):
+    rpc_server.stored = b"\xab" * 32
+    handle = rpc_server.handle
+
+    def without_get_many(method, params):
+        if method == "eth_call" and hex_to_bytes(params[0]["data"])[:4] == GET_MANY_SELECTOR:
+            # A registry deployed before getMany: no such function, so the call returns no data.
+            rpc_server.calls.append("getMany")
+            return "0x"
+        return handle(method, params)
+
+    monkeypatch.setattr(rpc_server, "handle", without_get_many)
+    sync = BatchHashRegistryClient()
+    assert sync.get_many([b"\x01" * 32, b"\x02" * 32]) == [b"\xab" * 32] * 2
+    assert sync.get_many([b"\x03" * 32]) == [b"\xab" * 32]
+    # getMany is only tried once per client; later lookups go straight to get.
+    assert rpc_server.calls.count("getMany") == 1
+
+    async_client = AsyncBatchHashRegistryClient(BatchHashRegistryClient())
+
+    async def scenario():
+        try:
+            return await async_client.get_many([b"\x01" * 32, b"\x02" * 32])
+        finally:
+            await async_client.aclose()
+
+    assert asyncio.run(scenario()) == [b"\xab" * 32] * 2
+    assert rpc_server.calls.count("getMany") == 2
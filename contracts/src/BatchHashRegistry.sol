@@ -3,8 +3,10 @@ pragma solidity ^0.8.24;
 
 contract BatchHashRegistry {
     mapping(bytes32 => bytes32) public attestationHashByBatchId;
+    mapping(bytes32 => uint256) public anchoredAtByRoot;
 
     event Published(bytes32 indexed batchIdHash, bytes32 attestationHash, address publisher, uint256 timestamp);
+    event RootPublished(bytes32 indexed root, address publisher, uint256 timestamp);
 
     function publish(bytes32 batchIdHash, bytes32 attestationHash) external {
         require(batchIdHash != bytes32(0), "BATCH_ID_REQUIRED");
@@ -15,7 +17,38 @@ contract BatchHashRegistry {
         emit Published(batchIdHash, attestationHash, msg.sender, block.timestamp);
     }
 
+    function publishRoot(bytes32 root) external {
+        require(root != bytes32(0), "ROOT_REQUIRED");
+        require(anchoredAtByRoot[root] == 0, "ALREADY_PUBLISHED");
+
+        anchoredAtByRoot[root] = block.timestamp;
+        emit RootPublished(root, msg.sender, block.timestamp);
+    }
+
     function get(bytes32 batchIdHash) external view returns (bytes32) {
         return attestationHashByBatchId[batchIdHash];
     }
+
+    function getMany(bytes32[] calldata batchIdHashes) external view returns (bytes32[] memory hashes) {
+        hashes = new bytes32[](batchIdHashes.length);
+        for (uint256 i = 0; i < batchIdHashes.length; i++) {
+            hashes[i] = attestationHashByBatchId[batchIdHashes[i]];
+        }
+    }
+
+    function getRoot(bytes32 root) external view returns (uint256) {
+        return anchoredAtByRoot[root];
+    }
+
+    function verifyInclusion(bytes32 root, bytes32 leaf, bytes32[] calldata proof) external view returns (bool) {
+        if (anchoredAtByRoot[root] == 0) {
+            return false;
+        }
+        bytes32 node = leaf;
+        for (uint256 i = 0; i < proof.length; i++) {
+            bytes32 sibling = proof[i];
+            node = node < sibling ? keccak256(abi.encodePacked(node, sibling)) : keccak256(abi.encodePacked(sibling, node));
+        }
+        return node == root;
+    }
 }
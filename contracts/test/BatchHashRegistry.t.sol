@@ -42,6 +42,52 @@ contract BatchHashRegistryTest {
         _assertEq(fetched, attestationHash, "get matches");
     }
 
+    function testGetManyReturnsStoredAndEmptyHashes() public {
+        bytes32 batchIdHash = keccak256("VA-2025-0004");
+        bytes32 attestationHash = keccak256("attestation-4");
+        registry.publish(batchIdHash, attestationHash);
+
+        bytes32[] memory ids = new bytes32[](2);
+        ids[0] = batchIdHash;
+        ids[1] = keccak256("VA-2025-MISSING");
+        bytes32[] memory hashes = registry.getMany(ids);
+
+        _assertEq(hashes[0], attestationHash, "stored hash");
+        _assertEq(hashes[1], bytes32(0), "missing hash");
+    }
+
+    function testPublishRootAndVerifyInclusion() public {
+        bytes32 leafA = keccak256("attestation-a");
+        bytes32 leafB = keccak256("attestation-b");
+        bytes32 root = leafA < leafB
+            ? keccak256(abi.encodePacked(leafA, leafB))
+            : keccak256(abi.encodePacked(leafB, leafA));
+
+        registry.publishRoot(root);
+        require(registry.getRoot(root) != 0, "root anchored");
+
+        bytes32[] memory proof = new bytes32[](1);
+        proof[0] = leafB;
+        require(registry.verifyInclusion(root, leafA, proof), "leaf included");
+
+        proof[0] = keccak256("attestation-c");
+        require(!registry.verifyInclusion(root, leafA, proof), "bad proof rejected");
+    }
+
+    function testCannotPublishSameRootTwice() public {
+        bytes32 root = keccak256("root-1");
+
+        registry.publishRoot(root);
+
+        try registry.publishRoot(root) {
+            revert("expected revert");
+        } catch Error(string memory reason) {
+            _assertStringEq(reason, "ALREADY_PUBLISHED", "revert reason");
+        } catch {
+            revert("unexpected revert type");
+        }
+    }
+
     function _assertEq(bytes32 actual, bytes32 expected, string memory message) internal pure {
         require(actual == expected, message);
     }